@@ -135,12 +135,63 @@ AUTHENTICATION_BACKENDS = [
 
 LANGUAGE_CODE = 'en-us'
 
-TIME_ZONE = 'MST'
+TIME_ZONE = 'America/Denver'
 
 USE_I18N = True
 
 USE_TZ = True
 
+# Events
+# When True, occurrences of recurring series are computed on read and only
+# individually edited occurrences are stored as Event rows.
+EVENTS_VIRTUAL_OCCURRENCES = os.getenv('EVENTS_VIRTUAL_OCCURRENCES') == 'True'
+EVENTS_HORIZON_DAYS = int(os.getenv('EVENTS_HORIZON_DAYS', 90))
+EVENTS_DETAIL_CACHE_TIMEOUT = int(os.getenv('EVENTS_DETAIL_CACHE_TIMEOUT', 60 * 60))
+# Month calendar day buckets; dropped on any event, series or category change
+EVENTS_CALENDAR_CACHE_TIMEOUT = int(os.getenv('EVENTS_CALENDAR_CACHE_TIMEOUT', 60 * 60))
+# Days of past events kept in the iCalendar feeds
+EVENTS_FEED_PAST_DAYS = int(os.getenv('EVENTS_FEED_PAST_DAYS', 30))
+# Delta sync (/events/api/v1/changes/): rows younger than the settle delay wait
+# for the next poll; deletions are remembered for EVENTS_TOMBSTONE_DAYS
+EVENTS_CHANGES_SETTLE_SECONDS = int(os.getenv('EVENTS_CHANGES_SETTLE_SECONDS', 30))
+EVENTS_TOMBSTONE_DAYS = int(os.getenv('EVENTS_TOMBSTONE_DAYS', 90))
+
+# Cache shared by every worker process: the page cache, cache versions and
+# calendar buckets must agree across them (see extras.checks). Set CACHE_URL to
+# a redis:// URL (needs the redis package) when running on several hosts;
+# otherwise the processes on this host share a file-based cache.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', os.path.join(BASE_DIR, '.cache')),
+        }
+    }
+
+# Anonymous full-page cache (extras.page_cache)
+PAGE_CACHE_TIMEOUT = int(os.getenv('PAGE_CACHE_TIMEOUT', 5 * 60))
+PAGE_CACHE_STALE_TIMEOUT = int(os.getenv('PAGE_CACHE_STALE_TIMEOUT', 60 * 60))
+
+# CDN purge by surrogate key (extras.purge). Set PURGE_CLIENT to
+# 'extras.purge.HTTPPurgeClient' and PURGE_URL to the CDN's purge-by-tag endpoint.
+PURGE_CLIENT = os.getenv('PURGE_CLIENT', 'extras.purge.NullPurgeClient')
+PURGE_URL = os.getenv('PURGE_URL', '')
+PURGE_TOKEN = os.getenv('PURGE_TOKEN', '')
+PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', 30))
+PURGE_DEBOUNCE_SECONDS = float(os.getenv('PURGE_DEBOUNCE_SECONDS', 2))
+# Longest keys may wait while writes keep restarting the debounce
+PURGE_MAX_WAIT_SECONDS = float(os.getenv('PURGE_MAX_WAIT_SECONDS', 30))
+# Seconds the CDN may keep anonymous pages (Surrogate-Control); 0 leaves it unset
+EDGE_CACHE_TIMEOUT = int(os.getenv('EDGE_CACHE_TIMEOUT', 0))
+
 MESSAGE_TAGS = {
     messages.ERROR: 'danger'
 }
@@ -154,6 +205,18 @@ STATICFILES_DIRS = (
 )
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# Output of `manage.py export_static_site`; serve it ahead of Django (nginx try_files).
+# Only bare paths are exported, so requests with a query string ($args: the event
+# list's ?cursor= pages, ?q= searches) must still go to Django, e.g.
+#   location / {
+#       error_page 418 = @django;
+#       if ($args) { return 418; }
+#       try_files $uri/index.html @django;
+#   }
+STATIC_EXPORT_ROOT = os.getenv('STATIC_EXPORT_ROOT', os.path.join(BASE_DIR, 'static_export'))
+# Deploy identifier (e.g. the release's git SHA); a new value re-renders every exported page
+STATIC_VERSION = os.getenv('STATIC_VERSION', '')
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
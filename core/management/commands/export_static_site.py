@@ -0,0 +1,191 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.template import engines
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+
+from events.models import Event
+from extras.models import SiteSettings
+from extras.page_cache import is_cacheable_response
+
+MANIFEST_NAME = ".export-manifest.json"
+
+# Public pages exported on every run; event detail pages are added per event
+PAGE_NAMES = ("home", "about", "programs", "support", "event_list")
+
+EXPORTED = "exported"
+REMOVED = "removed"
+FAILED = "failed"
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the public pages through the normal views into static files "
+        "(<path>/index.html and index.html.gz) for nginx or WhiteNoise to serve. "
+        "Later runs only re-render pages whose watermark moved: the rows they show, "
+        "or the deploy (templates, collected static files, STATIC_VERSION). "
+        "Only the first page of paginated lists is exported; ?cursor= pages are left "
+        "to Django (see STATIC_EXPORT_ROOT in settings)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.STATIC_EXPORT_ROOT, help="Export directory.")
+        parser.add_argument("--workers", type=int, default=4, help="Pages rendered in parallel.")
+        parser.add_argument("--full", action="store_true", help="Re-render every page.")
+        parser.add_argument("--host", default=settings.ALLOWED_HOSTS[0], help="Host the pages are rendered for.")
+
+    def handle(self, *args, **options):
+        self.output = Path(options["output"]).resolve()
+        self.host = options["host"]
+        self.local = threading.local()
+        self.factory = RequestFactory(HTTP_HOST=self.host)
+        if "*" in self.host:
+            raise CommandError("--host must be a concrete host name.")
+
+        started = time.perf_counter()
+        manifest = {} if options["full"] else self.read_manifest()
+
+        site_updated = SiteSettings.load().updated_at
+        deploy = deploy_fingerprint()
+        watermarks = {path: self.watermark(path, site_updated, deploy) for path in self.get_paths()}
+        stale = [path for path, mark in watermarks.items() if manifest.get(path) != mark]
+        gone = [path for path in manifest if path not in watermarks]
+
+        # Render the views themselves, never a copy from the full-page cache
+        with override_settings(PAGE_CACHE_TIMEOUT=0):
+            with ThreadPoolExecutor(max_workers=max(1, options["workers"])) as pool:
+                results = dict(zip(stale, pool.map(self.export_page, stale)))
+
+        for path in gone:
+            self.remove_page(path)
+            manifest.pop(path)
+        for path, result in results.items():
+            if result == EXPORTED:
+                manifest[path] = watermarks[path]
+            elif result == REMOVED:
+                manifest.pop(path, None)
+            else:
+                self.stderr.write(f"Could not export {path}: {result}")
+        self.write_manifest(manifest)
+
+        exported = sum(result == EXPORTED for result in results.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {exported} of {len(watermarks)} pages ({len(watermarks) - len(stale)} unchanged, "
+            f"{len(gone)} removed) to {self.output} in {time.perf_counter() - started:.2f}s."
+        ))
+
+    def get_paths(self):
+        paths = [reverse(name) for name in PAGE_NAMES]
+        slugs = Event.objects.public_upcoming().values_list("slug", flat=True)
+        paths.extend(reverse("event_detail", args=[slug]) for slug in slugs)
+        return paths
+
+    def watermark(self, path, site_updated, deploy):
+        """
+        Hash of what the page at `path` is rendered from: the deploy
+        fingerprint, the site settings' updated_at and the view's own ETag
+        validators (see ConditionalGetMixin), which are built from the
+        updated_at of the rows the page shows.
+        """
+        match = resolve(path)
+        view = match.func.view_class(**match.func.view_initkwargs)
+        request = self.factory.get(path)
+        request.user = AnonymousUser()
+        view.setup(request, *match.args, **match.kwargs)
+        validators = view.get_conditional_validators() if hasattr(view, "get_conditional_validators") else None
+        key = repr([deploy, site_updated.isoformat() if site_updated else None, validators])
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def export_page(self, path):
+        # One client per worker thread; each thread also holds its own DB connection
+        client = getattr(self.local, "client", None)
+        if client is None:
+            client = self.local.client = Client(HTTP_HOST=self.host, raise_request_exception=False)
+        try:
+            response = client.get(path, secure=True)
+        finally:
+            connections.close_all()
+
+        if response.status_code == 404:
+            self.remove_page(path)
+            return REMOVED
+        if not is_cacheable_response(response.wsgi_request, response):
+            return f"HTTP {response.status_code} or a per-visitor response"
+
+        target = self.page_file(path)
+        write_atomic(target.with_name(target.name + ".gz"), gzip.compress(response.content, mtime=0))
+        write_atomic(target, response.content)
+        return EXPORTED
+
+    def page_file(self, path):
+        return self.output.joinpath(*path.strip("/").split("/"), "index.html")
+
+    def remove_page(self, path):
+        target = self.page_file(path)
+        for file in (target, target.with_name(target.name + ".gz")):
+            file.unlink(missing_ok=True)
+        if target.parent != self.output:
+            try:
+                target.parent.rmdir()
+            except OSError:
+                pass  # not empty
+
+    def read_manifest(self):
+        try:
+            return json.loads((self.output / MANIFEST_NAME).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self, manifest):
+        write_atomic(self.output / MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode())
+
+
+def deploy_fingerprint():
+    """
+    Hash of everything a deploy can change in every page: the template files,
+    the collected static files' manifest (hashed asset names) and
+    STATIC_VERSION.
+    """
+    digest = hashlib.md5(getattr(settings, "STATIC_VERSION", "").encode())
+    files = [Path(settings.STATIC_ROOT) / "staticfiles.json"] if settings.STATIC_ROOT else []
+    for engine in engines.all():
+        for directory in getattr(engine, "template_dirs", ()):
+            files.extend(sorted(path for path in Path(directory).rglob("*") if path.is_file()))
+    for path in files:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            continue
+        digest.update(str(path).encode())
+        digest.update(hashlib.md5(data).digest())
+    return digest.hexdigest()
+
+
+def write_atomic(target, data):
+    """
+    Writes `data` to a temporary file next to `target` and renames it into
+    place, so the web server never serves a half-written page.
+    """
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -1,3 +1,91 @@
-from django.test import TestCase
+import re
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from events.choices import EventStatus, EventVisibility
+from events.models import Event
+
+# The manifest storage needs collectstatic; tests render templates without it
+TEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=TEST_STORAGES, ALLOWED_HOSTS=["testserver"])
+class ExportStaticSiteTests(TransactionTestCase):
+    """
+    Later exports only re-render pages whose rows or deploy changed.
+    Pages render on worker threads with their own connections, so the rows
+    have to be committed.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.output = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output, ignore_errors=True)
+        self.event = Event.objects.create(
+            title="Open House",
+            start=timezone.now() + timedelta(days=3),
+            status=EventStatus.STATUS_PUBLISHED,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        self.event_file = self.output / "events" / self.event.slug / "index.html"
+
+    def export(self):
+        out = StringIO()
+        call_command("export_static_site", "--output", str(self.output), "--host", "testserver", stdout=out)
+        return out.getvalue()
+
+    def test_incremental_export(self):
+        self.assertIn("Exported 6 of 6 pages (0 unchanged, 0 removed)", self.export())
+        self.assertTrue(self.event_file.exists())
+        self.assertTrue(self.event_file.with_name("index.html.gz").exists())
+        self.assertIn("Exported 0 of 6 pages (6 unchanged, 0 removed)", self.export())
+
+        self.event.address = "12 Main Street"
+        self.event.save()
+        # The event page and the list it appears on
+        self.assertIn("Exported 2 of 6 pages (4 unchanged, 0 removed)", self.export())
+        self.assertIn("12 Main Street", self.event_file.read_text())
+
+    def test_new_deploy_rerenders_everything(self):
+        self.export()
+        with override_settings(STATIC_VERSION="release-2"):
+            self.assertIn("Exported 6 of 6 pages (0 unchanged, 0 removed)", self.export())
+
+    def test_removed_page_deleted(self):
+        self.export()
+        self.event.delete()
+        self.assertIn("Exported 1 of 5 pages (4 unchanged, 1 removed)", self.export())
+        self.assertFalse(self.event_file.exists())
+        self.assertFalse(self.event_file.parent.exists())
+
+    def test_cursor_pages_left_to_django(self):
+        for day in (4, 5):
+            Event.objects.create(
+                title=f"Workshop {day}",
+                start=timezone.now() + timedelta(days=day),
+                status=EventStatus.STATUS_PUBLISHED,
+                visibility=EventVisibility.VIS_PUBLIC,
+            )
+        self.export()
+        first_page = (self.output / "events" / "index.html").read_text()
+        self.assertIn("Open House", first_page)
+        self.assertNotIn("Workshop 5", first_page)
+        manifest = (self.output / ".export-manifest.json").read_text()
+        self.assertNotIn("?", manifest)
+
+        # The exported "Next" link carries a query string, so Django serves it
+        next_url = re.search(r'href="(\?cursor=[^"]+)"', first_page).group(1)
+        response = self.client.get(f"/events/{next_url}", secure=True)
+        self.assertContains(response, "Workshop 5")
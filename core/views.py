@@ -1,28 +1,28 @@
 from django.shortcuts import render
 from django.urls import reverse
 from django.views.generic import ListView, TemplateView
-from extras.mixins import PageMetaMixin
+from extras.mixins import PageCacheMixin, PageMetaMixin, SurrogateKeyMixin
 
 
-class HomePageView(PageMetaMixin, TemplateView):
+class HomePageView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, TemplateView):
     template_name = 'core/home.html'
     is_current = 'home'
     page_title = 'Home'
 
 
-class AboutPageView(PageMetaMixin, TemplateView):
+class AboutPageView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, TemplateView):
     template_name = 'core/about.html'
     is_current = 'about'
     page_title = 'About Us'
 
 
-class ProgramPageView(PageMetaMixin, TemplateView):
+class ProgramPageView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, TemplateView):
     template_name = 'core/program.html'
     is_current = 'program'
     page_title = 'Programs'
 
 
-class SupportPageView(PageMetaMixin, TemplateView):
+class SupportPageView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, TemplateView):
     template_name = 'core/donate.html'
     is_current = 'support'
     page_title = 'Support'
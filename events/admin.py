@@ -3,11 +3,12 @@ from datetime import timedelta
 from django.contrib import admin
 from django.contrib.contenttypes.admin import GenericStackedInline
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
 
 from .choices import Recurrence
-from .models import EventCategory, EventSeries, Event
-from .services import generate_next_90_days
+from .models import EventCategory, EventSeries, Event, SeriesException
+from .services import generate_next_90_days, reschedule_future_events, delete_series, SERIES_SCHEDULE_FIELDS
 from extras.models import ImageAttachment
 
 
@@ -19,6 +20,13 @@ class ImageAttachmentInline(GenericStackedInline):
     fields = ("image", "alt_text", "caption")
 
 
+class SeriesExceptionInline(admin.TabularInline):
+    model = SeriesException
+    extra = 0
+    fields = ("date", "kind", "event")
+    raw_id_fields = ("event",)
+
+
 @admin.register(EventCategory)
 class EventCategoryAdmin(admin.ModelAdmin):
     list_display = ("name", "slug", "created_at", "updated_at")
@@ -29,7 +37,7 @@ class EventCategoryAdmin(admin.ModelAdmin):
 
 @admin.register(EventSeries)
 class EventSeriesAdmin(admin.ModelAdmin):
-    inlines = [ImageAttachmentInline]
+    inlines = [ImageAttachmentInline, SeriesExceptionInline]
     list_display = (
         "title",
         "recurrence",
@@ -50,14 +58,24 @@ class EventSeriesAdmin(admin.ModelAdmin):
     fieldsets = (
         ("Basics", {"fields": ("title", "slug", "description", "content", "category", "is_active")}),
         ("Defaults for generated events", {"fields": ("default_location", "default_duration_minutes")}),
-        ("Schedule", {"fields": ("start_date", "end_date", "start_time", "recurrence", "weekday")}),
+        ("Schedule", {"fields": ("start_date", "end_date", "start_time", "timezone", "recurrence", "weekday", "week_of_month", "rrule")}),
     )
 
 
     def save_model(self, request, obj, form, change):
+        changed = obj.changed_fields()
         super().save_model(request, obj, form, change)
         if not change:
             generate_next_90_days(obj, days=90)
+        elif changed & SERIES_SCHEDULE_FIELDS:
+            reschedule_future_events(obj)
+
+    def delete_model(self, request, obj):
+        delete_series(obj)
+
+    def delete_queryset(self, request, queryset):
+        for series in queryset:
+            delete_series(series)
 
 
 @admin.register(Event)
@@ -76,10 +94,20 @@ class EventAdmin(admin.ModelAdmin):
         "author",
     )
     list_filter = ("status", "visibility", "category", "series", "is_featured", "is_online")
-    search_fields = ("title", "slug", "summary", "location_name", "address")
+    search_fields = ("title", "slug", "summary", "content", "location_name", "address", "category__name")
     readonly_fields = ("created_at", "updated_at")
     ordering = ("-start",)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Full-text index over title, summary, content, location and category (events.search);
+        # the list keeps its date ordering
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # Slugs are not in the index; staff paste them from URLs
+        matches = queryset.search(term).values("pk")
+        return queryset.filter(Q(pk__in=matches) | Q(slug__icontains=term)), False
+
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
 
@@ -0,0 +1,419 @@
+# events/api.py
+"""
+Read-only JSON API (/events/api/v1/) for the partner site and our own scripts.
+
+Rows are read with .values() and serialized straight from those dicts, never
+as model instances. Only published, public rows are ever exposed.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Q
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views import View
+
+from .cache import EVENT_LIST_KEY
+from .choices import EventStatus, EventVisibility, TombstoneKind
+from .models import Event, EventCategory, EventSeries, Tombstone
+from extras.mixins import ConditionalGetMixin, SurrogateKeyMixin
+from extras.pagination import InvalidPageToken, KeysetPaginator
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Members-only and private rows never leave the site through the API
+EXPOSED_VISIBILITIES = (EventVisibility.VIS_PUBLIC,)
+
+CHANGES_TOKEN_SALT = "events.api.changes"
+
+
+def changes_settle_seconds():
+    """
+    Rows younger than this wait for the next delta-sync poll, so a transaction
+    that commits after its updated_at was stamped is not skipped.
+    """
+    return getattr(settings, "EVENTS_CHANGES_SETTLE_SECONDS", 30)
+
+
+def tombstone_days():
+    return getattr(settings, "EVENTS_TOMBSTONE_DAYS", 90)
+
+
+class ApiError(Exception):
+    """
+    A bad request parameter; answered with 400 and {"error": message}.
+    """
+
+
+class Computed:
+    """
+    An API field built from one or more .values() columns.
+    """
+
+    def __init__(self, sources, build):
+        self.sources = tuple(sources)
+        self.build = build
+
+    def __call__(self, row):
+        return self.build(*(row[source] for source in self.sources))
+
+
+def media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def event_url(slug):
+    return reverse("event_detail", args=[slug])
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError as e:
+        raise ApiError("limit must be an integer.") from e
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def field_columns(fields):
+    """
+    The .values() columns behind `fields`.
+    """
+    columns = []
+    for spec in fields.values():
+        columns.extend(spec.sources if isinstance(spec, Computed) else [spec])
+    return columns
+
+
+def serialize(row, fields):
+    return {name: spec(row) if isinstance(spec, Computed) else row[spec] for name, spec in fields.items()}
+
+
+class ApiListView(SurrogateKeyMixin, ConditionalGetMixin, View):
+    """
+    One list endpoint: `?fields=a,b` picks fields (only their columns are
+    selected), `?limit=` sets the page size and `?cursor=` walks the keyset
+    pages linked from "next" / "previous".
+
+    Subclasses set `model`, `fields` (API name -> column path or Computed),
+    `keyset`, and implement get_base_queryset() (exposed rows only) and
+    optionally filter_queryset().
+    """
+    model = None
+    fields = {}
+    keyset = ("pk",)
+    # Columns whose Max() goes into the ETag, besides the row count
+    validator_fields = ("updated_at",)
+    surrogate_keys = (EVENT_LIST_KEY,)
+
+    def get_base_queryset(self):
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset):
+        return queryset
+
+    def get_queryset(self):
+        if not hasattr(self, "_queryset"):
+            self._queryset = self.filter_queryset(self.get_base_queryset())
+        return self._queryset
+
+    def get_fields(self):
+        requested = [name.strip() for name in self.request.GET.get("fields", "").split(",") if name.strip()]
+        if not requested:
+            return self.fields
+        unknown = [name for name in requested if name not in self.fields]
+        if unknown:
+            raise ApiError(f"Unknown fields: {', '.join(unknown)}.")
+        return {name: self.fields[name] for name in requested}
+
+    def get_limit(self):
+        return parse_limit(self.request)
+
+    def get_columns(self, fields):
+        """
+        The .values() columns behind `fields`, plus the keyset columns.
+        """
+        columns = field_columns(fields)
+        for key in self.keyset:
+            name = key.lstrip("-")
+            columns.append(self.model._meta.pk.attname if name == "pk" else name)
+        return list(dict.fromkeys(columns))
+
+    def get_conditional_validators(self):
+        try:
+            queryset = self.get_queryset()
+        except ApiError:
+            return None
+        row = queryset.order_by().aggregate(
+            count=Count("pk"),
+            **{name.replace("__", "_"): Max(name) for name in self.validator_fields},
+        )
+        return None, [sorted(row.items())]
+
+    def get_page_url(self, token):
+        if token is None:
+            return None
+        params = self.request.GET.copy()
+        params["cursor"] = token
+        return self.request.build_absolute_uri(f"?{params.urlencode()}")
+
+    def get(self, request, *args, **kwargs):
+        try:
+            fields = self.get_fields()
+            rows = self.get_queryset().values(*self.get_columns(fields))
+            page = KeysetPaginator(rows, self.get_limit(), self.keyset, count_total=False).page(request.GET.get("cursor"))
+        except (ApiError, InvalidPageToken) as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        return JsonResponse({
+            "results": [serialize(row, fields) for row in page],
+            "next": self.get_page_url(page.next_page_token),
+            "previous": self.get_page_url(page.previous_page_token),
+        })
+
+    # Filters
+    def parse_when(self, name):
+        """
+        The ?name= bound as an aware datetime; a bare date means local midnight.
+        """
+        value = self.request.GET.get(name)
+        if not value:
+            return None
+        message = f"{name} must be an ISO 8601 date or datetime."
+        try:
+            parsed = parse_datetime(value) or parse_date(value)
+        except ValueError as e:
+            raise ApiError(message) from e
+        if parsed is None:
+            raise ApiError(message)
+        if not isinstance(parsed, datetime):
+            parsed = datetime.combine(parsed, time.min)
+        return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+    def filter_visibility(self, queryset):
+        requested = [value for value in self.request.GET.get("visibility", "").split(",") if value]
+        if not requested:
+            return queryset
+        if any(value not in EXPOSED_VISIBILITIES for value in requested):
+            raise ApiError(f"visibility must be one of: {', '.join(EXPOSED_VISIBILITIES)}.")
+        return queryset.filter(visibility__in=requested)
+
+
+class EventApiView(ApiListView):
+    """
+    GET /events/api/v1/events/?from=&to=&category=&series=&visibility=
+
+    Upcoming events by default (`from` is now unless given), ordered by start.
+    """
+    model = Event
+    keyset = ("start", "pk")
+    validator_fields = ("updated_at", "category__updated_at", "series__updated_at", "image__updated_at")
+    fields = {
+        "id": "id",
+        "slug": "slug",
+        "url": Computed(["slug"], event_url),
+        "title": "title",
+        "summary": "summary",
+        "start": "start",
+        "end": "end",
+        "timezone": "timezone",
+        "location_name": "location_name",
+        "address": "address",
+        "is_online": "is_online",
+        "is_featured": "is_featured",
+        "registration_url": "registration_url",
+        "requires_registration": "requires_registration",
+        "registration_deadline": "registration_deadline",
+        "capacity": "capacity",
+        "category": "category__slug",
+        "series": "series__slug",
+        "image": Computed(["image__image"], media_url),
+    }
+
+    def get_base_queryset(self):
+        return Event.objects.filter(status=EventStatus.STATUS_PUBLISHED, visibility__in=EXPOSED_VISIBILITIES)
+
+    def filter_queryset(self, queryset):
+        params = self.request.GET
+        # (status, visibility, start) index
+        queryset = queryset.between(self.parse_when("from") or timezone.now(), self.parse_when("to"))
+        if params.get("category"):
+            queryset = queryset.filter(category__slug=params["category"])
+        if params.get("series"):
+            queryset = queryset.filter(series__slug=params["series"])
+        return self.filter_visibility(queryset)
+
+
+class SeriesApiView(ApiListView):
+    """
+    GET /events/api/v1/series/?category=&visibility=
+
+    Active series, ordered by title, with their next upcoming occurrence.
+    """
+    model = EventSeries
+    keyset = ("title", "pk")
+    validator_fields = ("updated_at", "category__updated_at", "image__updated_at", "next_start")
+    fields = {
+        "id": "id",
+        "slug": "slug",
+        "title": "title",
+        "description": "description",
+        "category": "category__slug",
+        "start_date": "start_date",
+        "end_date": "end_date",
+        "start_time": "start_time",
+        "timezone": "timezone",
+        "recurrence": "recurrence",
+        "weekday": "weekday",
+        "week_of_month": "week_of_month",
+        "rrule": "rrule",
+        "default_location": "default_location",
+        "default_address": "default_address",
+        "default_duration_minutes": "default_duration_minutes",
+        "next_start": "next_start",
+        "next_event": "next_event__slug",
+        "image": Computed(["image__image"], media_url),
+    }
+
+    def get_base_queryset(self):
+        return EventSeries.objects.filter(is_active=True, visibility__in=EXPOSED_VISIBILITIES)
+
+    def filter_queryset(self, queryset):
+        if self.request.GET.get("category"):
+            queryset = queryset.filter(category__slug=self.request.GET["category"])
+        return self.filter_visibility(queryset)
+
+
+class CategoryApiView(ApiListView):
+    """
+    GET /events/api/v1/categories/
+    """
+    model = EventCategory
+    keyset = ("name", "pk")
+    fields = {
+        "id": "id",
+        "slug": "slug",
+        "name": "name",
+    }
+
+    def get_base_queryset(self):
+        return EventCategory.objects.all()
+
+
+# The next-occurrence pointer is refreshed without touching updated_at, so it
+# cannot be synced by delta; consumers derive it from the events they hold
+CHANGES_SERIES_FIELDS = {name: spec for name, spec in SeriesApiView.fields.items() if not name.startswith("next_")}
+
+
+class ChangesApiView(View):
+    """
+    GET /events/api/v1/changes/?cursor=&limit=
+
+    Delta sync. Without a cursor this pages through the whole public catalogue;
+    with the cursor from the previous response it returns only the events and
+    series created or updated since, and under "deleted" the ones that were
+    deleted or are no longer public. Keep polling with the returned cursor
+    while "has_more" is true; apply "events" and "series" before "deleted".
+
+    Events, series and tombstones are each walked along their own
+    (updated_at, id) / (deleted_at, id) index, so a poll costs what changed
+    rather than the catalogue size. A cursor older than the tombstone retention
+    (EVENTS_TOMBSTONE_DAYS) gets 410 Gone: start over without one.
+    """
+
+    def get_streams(self):
+        """
+        name -> (queryset, extra columns, is_public(row), API fields)
+        """
+        return {
+            "events": (
+                Event.objects.all(),
+                ["status", "visibility"],
+                lambda row: row["status"] == EventStatus.STATUS_PUBLISHED and row["visibility"] in EXPOSED_VISIBILITIES,
+                EventApiView.fields,
+            ),
+            "series": (
+                EventSeries.objects.all(),
+                ["is_active", "visibility"],
+                lambda row: row["is_active"] and row["visibility"] in EXPOSED_VISIBILITIES,
+                CHANGES_SERIES_FIELDS,
+            ),
+        }
+
+    def parse_cursor(self, token, settled):
+        """
+        Stream name -> (updated_at or deleted_at, id) to continue after, or None
+        to start from the beginning.
+        """
+        if not token:
+            # A fresh sync needs no deletions from before it started
+            return {"events": None, "series": None, "deleted": (settled, 0)}
+        try:
+            positions = {}
+            for name, position in signing.loads(token, salt=CHANGES_TOKEN_SALT).items():
+                positions[name] = None if position is None else (parse_datetime(position[0]), int(position[1]))
+            if set(positions) != {"events", "series", "deleted"} or positions["deleted"] is None:
+                raise ValueError
+            if any(p is not None and p[0] is None for p in positions.values()):
+                raise ValueError
+        except (signing.BadSignature, AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ApiError("Invalid cursor.") from e
+        return positions
+
+    def make_cursor(self, positions):
+        return signing.dumps(
+            {name: None if p is None else [p[0].isoformat(), p[1]] for name, p in positions.items()},
+            salt=CHANGES_TOKEN_SALT,
+        )
+
+    def read(self, queryset, field, position, settled, limit, columns):
+        """
+        Up to `limit` rows after `position` in (field, id) order and stamped
+        before `settled`. Returns (rows, new position, more rows waiting).
+        """
+        queryset = queryset.filter(**{f"{field}__lt": settled})
+        if position is not None:
+            moment, pk = position
+            queryset = queryset.filter(Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": pk}))
+        rows = list(queryset.order_by(field, "pk").values(*dict.fromkeys([*columns, field, "id"]))[:limit + 1])
+        more, rows = len(rows) > limit, rows[:limit]
+        if rows:
+            position = (rows[-1][field], rows[-1]["id"])
+        return rows, position, more
+
+    def get(self, request, *args, **kwargs):
+        settled = timezone.now() - timedelta(seconds=changes_settle_seconds())
+        incremental = bool(request.GET.get("cursor"))
+        try:
+            limit = parse_limit(request)
+            positions = self.parse_cursor(request.GET.get("cursor"), settled)
+        except ApiError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+        if positions["deleted"][0] < timezone.now() - timedelta(days=tombstone_days()):
+            return JsonResponse({"error": "Cursor expired; sync again without a cursor."}, status=410)
+
+        data = {"deleted": []}
+        has_more = False
+        for name, (queryset, extra, is_public, fields) in self.get_streams().items():
+            columns = [*field_columns(fields), *extra]
+            rows, positions[name], more = self.read(queryset, "updated_at", positions[name], settled, limit, columns)
+            has_more |= more
+            data[name] = [serialize(row, fields) for row in rows if is_public(row)]
+            if incremental:
+                kind = TombstoneKind.KIND_EVENT if name == "events" else TombstoneKind.KIND_SERIES
+                data["deleted"].extend({"type": kind, "id": row["id"]} for row in rows if not is_public(row))
+
+        if incremental:
+            rows, positions["deleted"], more = self.read(
+                Tombstone.objects.all(), "deleted_at", positions["deleted"], settled, limit, ["kind", "object_id"],
+            )
+            has_more |= more
+            data["deleted"].extend({"type": row["kind"], "id": row["object_id"]} for row in rows)
+
+        data["cursor"] = self.make_cursor(positions)
+        data["has_more"] = has_more
+        return JsonResponse(data)
@@ -0,0 +1,109 @@
+# events/cache.py
+from django.conf import settings
+from django.db import transaction
+
+from extras.cache import bump_version, get_version, read_through
+from extras.page_cache import invalidate_pages
+from extras.purge import purge_after_commit
+from .models import Event
+
+EVENT_DETAIL_NAMESPACE = "events:detail"
+EVENT_CALENDAR_NAMESPACE = "events:calendar"
+
+# CDN surrogate key carried by every page that lists events
+EVENT_LIST_KEY = "events"
+
+# Cached in place of events that do not exist, so unknown slugs are not re-queried
+MISSING = "missing"
+
+
+def event_detail_timeout():
+    return getattr(settings, "EVENTS_DETAIL_CACHE_TIMEOUT", 60 * 60)
+
+
+def event_detail_key(slug):
+    return f"events:event:{get_version(EVENT_DETAIL_NAMESPACE)}:{slug}"
+
+
+def load_event(slug):
+    """
+    The event with `slug` and everything its detail page renders (image,
+    category and the series whose content it inherits), or MISSING.
+    """
+    event = (
+        Event.objects
+        .select_related("image", "category", "series")
+        .filter(slug=slug)
+        .first()
+    )
+    return event if event is not None else MISSING
+
+
+def get_event(slug):
+    """
+    The fully loaded event with `slug`, or None. Served from the cache; a miss
+    is filled once while concurrent requests wait for it.
+    """
+    event = read_through(event_detail_key(slug), lambda: load_event(slug), event_detail_timeout())
+    return None if event == MISSING else event
+
+
+def load_event_last_modified(slug):
+    """
+    Latest updated_at across the event with `slug` and the series, category
+    and image its page renders, or MISSING. One narrow query; no content.
+    """
+    row = (
+        Event.objects
+        .filter(slug=slug)
+        .values_list("updated_at", "series__updated_at", "category__updated_at", "image__updated_at")
+        .first()
+    )
+    if row is None:
+        return MISSING
+    return max(value for value in row if value is not None)
+
+
+def get_event_last_modified(slug):
+    """
+    Cached validator for the detail page of `slug`, or None if there is no
+    such event. Invalidated together with the cached events.
+    """
+    key = f"events:event-lm:{get_version(EVENT_DETAIL_NAMESPACE)}:{slug}"
+    last_modified = read_through(key, lambda: load_event_last_modified(slug), event_detail_timeout())
+    return None if last_modified == MISSING else last_modified
+
+
+def calendar_timeout():
+    return getattr(settings, "EVENTS_CALENDAR_CACHE_TIMEOUT", 60 * 60)
+
+
+def calendar_month_key(year, month):
+    return f"events:calendar:{get_version(EVENT_CALENDAR_NAMESPACE)}:{year}-{month:02d}"
+
+
+def invalidate_event_calendar():
+    """
+    Drops every cached calendar month (see events.services.calendar_month).
+    """
+    bump_version(EVENT_CALENDAR_NAMESPACE)
+
+
+def invalidate_event_details():
+    """
+    Drops every cached event detail. Called whenever an event, or anything an
+    event page renders from (series, category, image), changes.
+    """
+    bump_version(EVENT_DETAIL_NAMESPACE)
+
+
+def occurrences_changed(series_id):
+    """
+    Called after occurrences of a series were written in bulk (no signals):
+    drops the cached event details, calendar months and pages, and purges the series' pages
+    and the listings from the CDN once the transaction commits.
+    """
+    transaction.on_commit(invalidate_event_details)
+    transaction.on_commit(invalidate_event_calendar)
+    transaction.on_commit(invalidate_pages)
+    purge_after_commit(f"series:{series_id}", EVENT_LIST_KEY)
@@ -70,4 +70,24 @@ class WeekOfMonth(ChoiceSet):
         (THIRD, "Third"),
         (FOURTH, "Fourth"),
         (LAST, "Last"),
-    ]
\ No newline at end of file
+    ]
+
+
+class SeriesExceptionKind(ChoiceSet):
+    KIND_SKIP = 'skip'
+    KIND_OVERRIDE = 'override'
+
+    KIND_CHOICES = [
+        (KIND_SKIP, 'Skipped'),
+        (KIND_OVERRIDE, 'Overridden'),
+    ]
+
+
+class TombstoneKind(ChoiceSet):
+    KIND_EVENT = 'event'
+    KIND_SERIES = 'series'
+
+    KIND_CHOICES = [
+        (KIND_EVENT, 'Event'),
+        (KIND_SERIES, 'Event series'),
+    ]
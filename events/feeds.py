@@ -0,0 +1,347 @@
+# events/feeds.py
+"""
+iCalendar (RFC 5545) and Atom (RFC 4287) output for the public event feeds.
+
+Everything here is a generator over `.iterator()` querysets, so the views can
+stream feeds of any size with flat memory.
+"""
+import calendar
+import re
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from xml.sax.saxutils import escape, quoteattr
+from zoneinfo import ZoneInfo
+
+from django.db.models import Exists, OuterRef, Prefetch, Q
+from django.utils import dateformat
+
+from .choices import EventVisibility, Recurrence, SeriesExceptionKind
+from .models import Event, EventSeries, SeriesException
+from .utils import nth_weekday_of_month, occurrence_starts
+
+ICAL_DATETIME = "%Y%m%dT%H%M%S"
+ICAL_WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+# Calendar clients poll on their own schedule; suggest one
+REFRESH_INTERVAL = "PT15M"
+
+ATOM_ENTRIES = 50
+
+
+#
+# Feed contents
+#
+
+def calendar_events(since):
+    """
+    Public events written out as their own VEVENTs: one-time events and
+    individually edited series occurrences. Other occurrences are covered by
+    their series' RRULE.
+    """
+    overrides = SeriesException.objects.filter(event=OuterRef("pk"), kind=SeriesExceptionKind.KIND_OVERRIDE)
+    return (
+        Event.objects
+        .public_upcoming(since)
+        .filter(Q(series__isnull=True) | Exists(overrides))
+        .select_related("category")
+        .defer("content")
+    )
+
+
+def calendar_series():
+    """
+    Active public series, each written out as one recurring VEVENT.
+    """
+    return (
+        EventSeries.objects
+        .filter(is_active=True, visibility=EventVisibility.VIS_PUBLIC)
+        .select_related("category")
+        .prefetch_related(Prefetch("exceptions", queryset=SeriesException.objects.only("series_id", "date")))
+        .defer("content")
+    )
+
+
+#
+# iCalendar
+#
+
+def ical_escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ical_fold(line):
+    """
+    Folds a content line into 75-octet pieces without splitting a UTF-8 character.
+    """
+    encoded = line.encode()
+    parts, limit = [], 75
+    while len(encoded) > limit:
+        cut = limit
+        while encoded[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode())
+        encoded, limit = encoded[cut:], 74
+    parts.append(encoded.decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ical_lines(*properties):
+    """
+    Content lines for (name, value) pairs; pairs with an empty value are
+    dropped and values are escaped unless given as `raw(...)`.
+    """
+    return "".join(
+        ical_fold(f"{name}:{value if isinstance(value, raw) else ical_escape(value)}")
+        for name, value in properties
+        if value not in (None, "")
+    )
+
+
+class raw(str):
+    """
+    A property value that is already in iCalendar syntax (dates, rules).
+    """
+
+
+def ical_utc(dt):
+    return raw(dt.astimezone(dt_timezone.utc).strftime(ICAL_DATETIME) + "Z")
+
+
+def ical_offset(offset):
+    minutes = int(offset.total_seconds() // 60)
+    sign = "-" if minutes < 0 else "+"
+    return f"{sign}{abs(minutes) // 60:02d}{abs(minutes) % 60:02d}"
+
+
+def nth_weekday_rule(day):
+    """
+    BYDAY value matching `day` every year, e.g. "2SU" or "-1SU" (last Sunday).
+    """
+    days_in_month = calendar.monthrange(day.year, day.month)[1]
+    n = -1 if day.day + 7 > days_in_month else (day.day - 1) // 7 + 1
+    return f"{n}{ICAL_WEEKDAYS[day.weekday()]}"
+
+
+@lru_cache(maxsize=32)
+def vtimezone(tzname, year):
+    """
+    VTIMEZONE for `tzname` built from the transitions zoneinfo reports in
+    `year`, expressed as yearly nth-weekday rules (how every current DST
+    regime is defined) anchored in 1970 so they cover any event date.
+    """
+    zone = ZoneInfo(tzname)
+    instant = datetime(year, 1, 1, tzinfo=dt_timezone.utc)
+    previous = instant.astimezone(zone)
+    observances = []
+    while instant.year == year:
+        instant += timedelta(hours=1)
+        current = instant.astimezone(zone)
+        if current.utcoffset() != previous.utcoffset():
+            # DTSTART is the wall-clock time of the change, in the offset before it
+            onset = (instant + previous.utcoffset()).replace(tzinfo=None)
+            byday = nth_weekday_rule(onset.date())
+            n = int(byday[:-2])
+            first = nth_weekday_of_month(1970, onset.month, onset.weekday(), 5 if n == -1 else n)
+            observances.append((
+                "DAYLIGHT" if current.dst() else "STANDARD",
+                datetime.combine(first, onset.time()),
+                previous.utcoffset(),
+                current,
+                f"FREQ=YEARLY;BYMONTH={onset.month};BYDAY={byday}",
+            ))
+        previous = current
+
+    if not observances:
+        observances.append(("STANDARD", datetime(1970, 1, 1), previous.utcoffset(), previous, None))
+
+    lines = ical_lines(("BEGIN", "VTIMEZONE"), ("TZID", tzname))
+    for kind, onset, offset_from, current, rule in observances:
+        lines += ical_lines(
+            ("BEGIN", kind),
+            ("DTSTART", raw(onset.strftime(ICAL_DATETIME))),
+            ("TZOFFSETFROM", raw(ical_offset(offset_from))),
+            ("TZOFFSETTO", raw(ical_offset(current.utcoffset()))),
+            ("TZNAME", current.tzname()),
+            ("RRULE", raw(rule) if rule else None),
+            ("END", kind),
+        )
+    return lines + ical_lines(("END", "VTIMEZONE"))
+
+
+def event_vevent(event, url, host):
+    return ical_lines(
+        ("BEGIN", "VEVENT"),
+        ("UID", f"event-{event.pk}@{host}"),
+        ("DTSTAMP", ical_utc(event.updated_at or event.start)),
+        ("DTSTART", ical_utc(event.start)),
+        ("DTEND", ical_utc(event.end) if event.end else None),
+        ("SUMMARY", event.title),
+        ("DESCRIPTION", event.summary),
+        ("LOCATION", ", ".join(filter(None, [event.location_name, event.address]))),
+        ("CATEGORIES", event.category.name if event.category else None),
+        ("URL", raw(url)),
+        ("STATUS", "CONFIRMED"),
+        ("END", "VEVENT"),
+    )
+
+
+def local_until(day, zone):
+    """
+    UNTIL value for a series ending on local date `day` (UTC, as RFC 5545
+    requires when DTSTART carries a TZID).
+    """
+    return ical_utc(datetime.combine(day, time(23, 59, 59), tzinfo=zone))
+
+
+def series_rules(series, zone):
+    """
+    (name, value) recurrence properties for `series`: RRULE (and any RDATE /
+    EXRULE / EXDATE lines of a custom rule), clipped to series.end_date.
+    """
+    if series.rrule:
+        lines = [line.strip() for line in series.rrule.strip().splitlines() if line.strip()]
+    elif series.recurrence == Recurrence.REC_MONTHLY:
+        n = -1 if series.week_of_month == 5 else series.week_of_month
+        lines = [f"FREQ=MONTHLY;BYDAY={n}{ICAL_WEEKDAYS[series.weekday]}"]
+    elif series.recurrence == Recurrence.REC_BIWEEKLY:
+        lines = [f"FREQ=WEEKLY;INTERVAL=2;BYDAY={ICAL_WEEKDAYS[series.weekday]}"]
+    else:
+        lines = [f"FREQ=WEEKLY;BYDAY={ICAL_WEEKDAYS[series.weekday]}"]
+
+    properties = []
+    for line in lines:
+        name, _, value = line.partition(":") if ":" in line else ("RRULE", "", line)
+        name = name.upper()
+        if name in ("RRULE", "EXRULE"):
+            # Custom rules are written in wall-clock time; UNTIL must be UTC
+            value = re.sub(
+                r"UNTIL=(\d{8})(T\d{6})?(?![\dTZ])",
+                lambda m: "UNTIL=" + (
+                    ical_utc(datetime.strptime(m.group(1) + m.group(2), ICAL_DATETIME).replace(tzinfo=zone))
+                    if m.group(2) else local_until(datetime.strptime(m.group(1), "%Y%m%d").date(), zone)
+                ),
+                value,
+            )
+            if name == "RRULE" and series.end_date and "UNTIL=" not in value and "COUNT=" not in value:
+                value += f";UNTIL={local_until(series.end_date, zone)}"
+        elif name in ("RDATE", "EXDATE") and not value.endswith("Z"):
+            name = f"{name};TZID={series.timezone}"
+        properties.append((name, raw(value)))
+    return properties
+
+
+def series_vevent(series, host):
+    """
+    One recurring VEVENT for `series`, or "" when it never occurs. Dates with a
+    SeriesException (skipped or individually edited) become EXDATEs; edited
+    occurrences are written as their own events by calendar_events().
+    """
+    if series.weekday is None and not series.rrule:
+        return ""
+    # DTSTART must itself be an occurrence
+    starts = occurrence_starts(series, series.start_date, series.start_date + timedelta(days=2 * 366))
+    if not starts:
+        return ""
+    zone = ZoneInfo(series.timezone)
+    tzid = f"DTSTART;TZID={series.timezone}"
+
+    exdates = []
+    for exception in series.exceptions.all():
+        exdates.extend(occurrence_starts(series, exception.date, exception.date))
+
+    return ical_lines(
+        ("BEGIN", "VEVENT"),
+        ("UID", f"series-{series.pk}@{host}"),
+        ("DTSTAMP", ical_utc(series.updated_at or starts[0])),
+        (tzid, raw(starts[0].strftime(ICAL_DATETIME))),
+        ("DURATION", raw(f"PT{series.default_duration_minutes}M")),
+        *series_rules(series, zone),
+        *(
+            (f"EXDATE;TZID={series.timezone}", raw(start.strftime(ICAL_DATETIME)))
+            for start in sorted(exdates)
+        ),
+        ("SUMMARY", series.title),
+        ("DESCRIPTION", series.description),
+        ("LOCATION", ", ".join(filter(None, [series.default_location, series.default_address]))),
+        ("CATEGORIES", series.category.name if series.category else None),
+        ("STATUS", "CONFIRMED"),
+        ("END", "VEVENT"),
+    )
+
+
+def calendar_stream(name, events, series, absolute_url, host):
+    """
+    Yields an iCalendar document for `events` and `series` chunk by chunk.
+    `absolute_url(path)` turns an event URL into an absolute one.
+    """
+    yield ical_lines(
+        ("BEGIN", "VCALENDAR"),
+        ("VERSION", "2.0"),
+        ("PRODID", f"-//{host}//Events//EN"),
+        ("CALSCALE", "GREGORIAN"),
+        ("METHOD", "PUBLISH"),
+        ("X-WR-CALNAME", name),
+        ("REFRESH-INTERVAL;VALUE=DURATION", raw(REFRESH_INTERVAL)),
+        ("X-PUBLISHED-TTL", raw(REFRESH_INTERVAL)),
+    )
+
+    year = datetime.now().year
+    timezones = set()
+    for s in series.iterator(chunk_size=100):
+        vevent = series_vevent(s, host)
+        if vevent and s.timezone not in timezones:
+            timezones.add(s.timezone)
+            yield vtimezone(s.timezone, year)
+        yield vevent
+
+    for event in events.iterator(chunk_size=500):
+        yield event_vevent(event, absolute_url(event.get_absolute_url()), host)
+
+    yield ical_lines(("END", "VCALENDAR"))
+
+
+#
+# Atom
+#
+
+def atom_datetime(dt):
+    return dt.astimezone(dt_timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def atom_stream(title, events, updated, feed_url, site_url, absolute_url, host):
+    """
+    Yields an Atom feed of `events` (soonest first) entry by entry.
+    """
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom">\n'
+        f"<title>{escape(title)}</title>\n"
+        f"<id>{escape(feed_url)}</id>\n"
+        f"<link rel=\"self\" href={quoteattr(feed_url)}/>\n"
+        f"<link rel=\"alternate\" href={quoteattr(site_url)}/>\n"
+        f"<updated>{atom_datetime(updated)}</updated>\n"
+        f"<author><name>{escape(host)}</name></author>\n"
+    )
+    for event in events.iterator(chunk_size=ATOM_ENTRIES):
+        url = absolute_url(event.get_absolute_url())
+        when = dateformat.format(event.local_start, "l, F j, Y, g:i A T")
+        summary = f"{when}. {event.summary}" if event.summary else when
+        category = f"<category term={quoteattr(event.category.name)}/>" if event.category else ""
+        yield (
+            "<entry>"
+            f"<title>{escape(event.title)}</title>"
+            f"<id>tag:{escape(host)},{event.created_at or event.start:%Y-%m-%d}:event-{event.pk}</id>"
+            f"<link rel=\"alternate\" href={quoteattr(url)}/>"
+            f"<updated>{atom_datetime(event.updated_at or event.start)}</updated>"
+            f"<summary>{escape(summary)}</summary>"
+            f"{category}"
+            "</entry>\n"
+        )
+    yield "</feed>\n"
@@ -113,6 +113,10 @@ class EventForm(forms.ModelForm):
 
         return slug
 
+    def clean_content(self):
+        # Blank content stays NULL like on generated occurrences, so it reads as unchanged
+        return self.cleaned_data.get("content") or None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -214,6 +218,7 @@ class EventSeriesForm(forms.ModelForm):
             "start_time": forms.TimeInput(
                 attrs={"type": "time", "class": "form-control"}
             ),
+            "timezone": forms.TextInput(attrs={"class": "form-control"}),
 
             "recurrence": forms.Select(attrs={"class": "form-select"}),
 
@@ -223,6 +228,9 @@ class EventSeriesForm(forms.ModelForm):
             "week_of_month": forms.Select(
                 attrs={"class": "form-select"}
             ),
+            "rrule": forms.TextInput(
+                attrs={"class": "form-control", "placeholder": "FREQ=WEEKLY;BYDAY=TU,TH"}
+            ),
 
             # ===================== STATUS =====================
             "is_active": forms.CheckboxInput(attrs={"class": "form-check-input"}),
@@ -0,0 +1,95 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from events.models import EventSeries
+from events.services import generate_next_90_days, generation_lock, horizon_days, virtual_occurrences_enabled
+
+
+def extend_batch(series_ids, days):
+    """
+    Generates the horizon for one batch of series. Returns (slug, created, seconds)
+    per series. Runs in the command process or in a pool worker.
+    """
+    results = []
+    series_qs = (
+        EventSeries.objects
+        .filter(pk__in=series_ids)
+        .select_related("category", "image")
+        .order_by("pk")
+    )
+    for series in series_qs:
+        started = time.perf_counter()
+        with transaction.atomic():
+            created = generate_next_90_days(series, days=days)
+        results.append((series.slug, created, time.perf_counter() - started))
+    return results
+
+
+class Command(BaseCommand):
+    help = "Extends every active event series' occurrences through the rolling horizon."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Horizon in days (default: EVENTS_HORIZON_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=100, help="Series per batch.")
+        parser.add_argument("--workers", type=int, default=0, help="Process pool size; 0 runs in this process.")
+        parser.add_argument("--series", nargs="*", metavar="SLUG", help="Only extend these series.")
+
+    def handle(self, *args, **options):
+        if virtual_occurrences_enabled():
+            self.stdout.write("Virtual occurrences are enabled; nothing to generate.")
+            return
+
+        days = options["days"] or horizon_days()
+        batch_size = max(1, options["batch_size"])
+        workers = options["workers"]
+        if workers > 0 and connection.vendor == "sqlite":
+            self.stderr.write("SQLite allows a single writer; ignoring --workers.")
+            workers = 0
+
+        series_qs = (
+            EventSeries.objects
+            .filter(is_active=True)
+            .exclude(end_date__lt=timezone.localdate())
+            .order_by("pk")
+        )
+        if options["series"]:
+            series_qs = series_qs.filter(slug__in=options["series"])
+        ids = list(series_qs.values_list("pk", flat=True))
+        batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+
+        with generation_lock() as acquired:
+            if not acquired:
+                raise CommandError("Another horizon extension is running; try again later.")
+
+            started = time.perf_counter()
+            if workers > 0:
+                # Workers are spawned rather than forked so they never share this
+                # connection, which holds the lock; each sets Django up on start.
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=django.setup,
+                ) as pool:
+                    results = pool.map(extend_batch, batches, [days] * len(batches))
+                    total = self.report(results)
+            else:
+                total = self.report(extend_batch(batch, days) for batch in batches)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Extended {len(ids)} series through {days} days: {total} occurrences created "
+            f"in {time.perf_counter() - started:.2f}s."
+        ))
+
+    def report(self, batch_results):
+        total = 0
+        for results in batch_results:
+            for slug, created, seconds in results:
+                total += created
+                self.stdout.write(f"{slug}: {created} created in {seconds * 1000:.1f} ms")
+        return total
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events.api import tombstone_days
+from events.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Deletes event/series tombstones older than EVENTS_TOMBSTONE_DAYS. Run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Override EVENTS_TOMBSTONE_DAYS.")
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else tombstone_days()
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} tombstones older than {days} days."))
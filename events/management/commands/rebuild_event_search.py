@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from events.models import Event
+from events.search import index_events, install_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recomputes every event's search document and refills the search index. Safe to re-run."
+
+    def handle(self, *args, **options):
+        install_search_index()
+        updated = index_events(Event.objects.all())
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the event search index ({updated} documents changed)."))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.models import EventSeries
+from events.services import refresh_next_events
+
+
+class Command(BaseCommand):
+    help = "Repairs every event series' next_event / next_start pointer. Run periodically."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Series per UPDATE.")
+        parser.add_argument("--series", nargs="*", metavar="SLUG", help="Only refresh these series.")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+
+        series_qs = EventSeries.objects.order_by("pk")
+        if options["series"]:
+            series_qs = series_qs.filter(slug__in=options["series"])
+        ids = list(series_qs.values_list("pk", flat=True))
+
+        started = time.perf_counter()
+        updated = 0
+        for i in range(0, len(ids), batch_size):
+            updated += refresh_next_events(ids[i:i + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed the next occurrence of {updated} series in {time.perf_counter() - started:.2f}s."
+        ))
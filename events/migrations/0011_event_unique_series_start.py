@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-17 11:17
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_occurrences(apps, schema_editor):
+    # Occurrences used to be created with a racy get_or_create, so a (series, start)
+    # pair may already be stored more than once; keep the oldest row of each
+    Event = apps.get_model("events", "Event")
+    duplicates = (
+        Event.objects
+        .filter(series__isnull=False)
+        .values("series_id", "start")
+        .annotate(rows=Count("pk"), keep=Min("pk"))
+        .filter(rows__gt=1)
+    )
+    for row in list(duplicates):
+        Event.objects.filter(series_id=row["series_id"], start=row["start"]).exclude(pk=row["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+    # The cleanup commits before the constraint is added (PostgreSQL refuses to
+    # ALTER a table with pending deferred FK checks from the deletes)
+    atomic = False
+
+    dependencies = [
+        ('events', '0010_eventseries_content'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_occurrences, migrations.RunPython.noop, atomic=True),
+        migrations.AddConstraint(
+            model_name='event',
+            constraint=models.UniqueConstraint(fields=('series', 'start'), name='event_unique_series_start'),
+        ),
+    ]
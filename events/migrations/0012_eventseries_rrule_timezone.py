@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-17 11:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_unique_series_start'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventseries',
+            name='rrule',
+            field=models.TextField(blank=True, help_text='Optional RFC 5545 rule, e.g. FREQ=WEEKLY;BYDAY=TU,TH. Replaces recurrence/weekday/week of month.'),
+        ),
+        migrations.AddField(
+            model_name='eventseries',
+            name='timezone',
+            field=models.CharField(default='America/Denver', help_text='IANA time zone the start time is given in, e.g. America/Denver', max_length=64),
+        ),
+    ]
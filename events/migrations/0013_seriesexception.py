@@ -0,0 +1,31 @@
+# Generated by Django 6.0 on 2026-10-17 11:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_eventseries_rrule_timezone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeriesException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, null=True)),
+                ('date', models.DateField(help_text='Local date the occurrence was scheduled on')),
+                ('kind', models.CharField(choices=[('skip', 'Skipped'), ('override', 'Overridden')], default='skip', max_length=20)),
+                ('event', models.ForeignKey(blank=True, help_text='The stored occurrence that overrides the scheduled one', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='series_exceptions', to='events.event')),
+                ('series', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exceptions', to='events.eventseries')),
+            ],
+            options={
+                'ordering': ['series', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('series', 'date'), name='seriesexception_unique_series_date')],
+            },
+        ),
+    ]
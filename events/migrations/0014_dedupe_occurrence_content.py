@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-17 12:05
+
+from django.db import migrations
+from django.db.models import F, OuterRef, Subquery
+
+
+def clear_inherited_content(apps, schema_editor):
+    """
+    Occurrences whose content is a byte-identical copy of their series content
+    inherit it on read instead.
+    """
+    Event = apps.get_model('events', 'Event')
+    Event.objects.filter(series__isnull=False, content=F('series__content')).update(content=None)
+
+
+def restore_inherited_content(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventSeries = apps.get_model('events', 'EventSeries')
+    Event.objects.filter(series__isnull=False, content__isnull=True).update(
+        content=Subquery(EventSeries.objects.filter(pk=OuterRef('series_id')).values('content')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0013_seriesexception'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_inherited_content, restore_inherited_content),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-17 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+def populate_next_event(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventSeries = apps.get_model("events", "EventSeries")
+
+    upcoming = (
+        Event.objects
+        .filter(
+            series=OuterRef("pk"),
+            start__gte=timezone.now(),
+            status="published",
+            visibility="public",
+        )
+        .order_by("start")
+    )
+    EventSeries.objects.update(
+        next_event=Subquery(upcoming.values("pk")[:1]),
+        next_start=Subquery(upcoming.values("start")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0014_dedupe_occurrence_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventseries',
+            name='next_event',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.event'),
+        ),
+        migrations.AddField(
+            model_name='eventseries',
+            name='next_start',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='eventseries',
+            index=models.Index(fields=['is_active', 'next_start'], name='events_even_is_acti_7882e7_idx'),
+        ),
+        migrations.RunPython(populate_next_event, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0015_eventseries_next_event'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['start', 'id'], name='events_even_start_74d1f9_idx'),
+        ),
+    ]
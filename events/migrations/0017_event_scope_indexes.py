@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0016_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_even_status_336136_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='event',
+            name='events_even_slug_30eb0f_idx',
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'visibility', 'start'], name='event_status_vis_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('series__isnull', True)), fields=['start'], name='event_standalone_start_idx'),
+        ),
+    ]
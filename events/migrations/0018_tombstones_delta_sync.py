@@ -0,0 +1,44 @@
+# Generated by Django 6.0 on 2026-10-17 14:10
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Now
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Delta sync walks rows by updated_at; rows from before it was tracked have none
+    for name in ("Event", "EventSeries"):
+        model = apps.get_model("events", name)
+        model.objects.filter(updated_at__isnull=True).update(updated_at=Coalesce("created_at", Now()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0017_event_scope_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('event', 'Event'), ('series', 'Event series')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['updated_at', 'id'], name='events_even_updated_ffcd3d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='eventseries',
+            index=models.Index(fields=['updated_at', 'id'], name='events_even_updated_d82fbb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='events_tomb_deleted_c81aaa_idx'),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 6.0 on 2026-10-17 14:40
+
+import html
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+# Frozen copies of events.search as of this migration; later changes there
+# must not rewrite history
+
+POSTGRES_INSTALL = [
+    """
+    ALTER TABLE events_event ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(search_document, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS events_event_search_vector_gin ON events_event USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS events_event_search_vector_gin",
+    "ALTER TABLE events_event DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_INSTALL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS events_event_fts USING fts5(title, search_document, tokenize='porter unicode61')",
+    "DELETE FROM events_event_fts",
+    "INSERT INTO events_event_fts(rowid, title, search_document) SELECT id, title, search_document FROM events_event",
+    """
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts(rowid, title, search_document) VALUES (new.id, new.title, new.search_document);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_update AFTER UPDATE OF title, search_document ON events_event BEGIN
+        UPDATE events_event_fts SET title = new.title, search_document = new.search_document WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        DELETE FROM events_event_fts WHERE rowid = old.id;
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS events_event_fts_insert",
+    "DROP TRIGGER IF EXISTS events_event_fts_update",
+    "DROP TRIGGER IF EXISTS events_event_fts_delete",
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def document_text(summary, content, location_name, address, category_name):
+    content = html.unescape(strip_tags(content or ""))
+    parts = (summary, content, location_name, address, category_name)
+    return " ".join(" ".join(part for part in parts if part).split())
+
+
+def backfill_search_document(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    rows = Event.objects.values_list(
+        "pk", "summary", "content", "series__content", "location_name", "address", "category__name",
+    )
+    events = [
+        Event(pk=pk, search_document=document_text(summary, content or series_content, location, address, category))
+        for pk, summary, content, series_content, location, address, category in rows.iterator()
+    ]
+    Event.objects.bulk_update(events, ["search_document"], batch_size=500)
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+install = run({"postgresql": POSTGRES_INSTALL, "sqlite": SQLITE_INSTALL})
+uninstall = run({"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0018_tombstones_delta_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_document, migrations.RunPython.noop),
+        migrations.RunPython(install, uninstall),
+    ]
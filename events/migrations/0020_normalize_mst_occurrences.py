@@ -0,0 +1,70 @@
+# Generated by Django 6.0 on 2026-10-17 15:20
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+# Occurrences used to be built with make_aware in TIME_ZONE = 'MST', a fixed UTC-7
+MST = dt_timezone(timedelta(hours=-7))
+
+
+def normalize_mst_occurrences(apps, schema_editor):
+    """
+    Moves future occurrences generated at the fixed MST offset onto the series'
+    wall-clock time in its own time zone (an hour earlier in UTC during DST), so
+    regeneration finds them instead of adding a second row an hour away.
+    Rows staff edited (they carry a SeriesException) are left alone.
+    """
+    Event = apps.get_model("events", "Event")
+    EventSeries = apps.get_model("events", "EventSeries")
+    Tombstone = apps.get_model("events", "Tombstone")
+    now = timezone.now()
+    touched = set()
+    rows = (
+        Event.objects
+        .filter(series__isnull=False, start__gte=now, series_exceptions__isnull=True)
+        .select_related("series")
+        .order_by("pk")
+    )
+    for event in list(rows):
+        series = event.series
+        fixed = event.start.astimezone(MST)
+        if fixed.time() != series.start_time:
+            continue
+        start = datetime.combine(fixed.date(), series.start_time, tzinfo=ZoneInfo(series.timezone))
+        if start == event.start:
+            continue
+
+        touched.add(event.series_id)
+        if Event.objects.filter(series_id=event.series_id, start=start).exists():
+            # Already regenerated at the right time; this one is the duplicate
+            Tombstone.objects.create(kind="event", object_id=event.pk)
+            event.delete()
+            continue
+        end = start + (event.end - event.start) if event.end else None
+        Event.objects.filter(pk=event.pk).update(start=start, end=end, updated_at=now)
+
+    # Same as events.services.refresh_next_events
+    upcoming = (
+        Event.objects
+        .filter(series=OuterRef("pk"), status="published", visibility="public", start__gte=now)
+        .order_by("start")
+    )
+    EventSeries.objects.filter(pk__in=touched).update(
+        next_event=Subquery(upcoming.values("pk")[:1]),
+        next_start=Subquery(upcoming.values("start")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0019_event_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_mst_occurrences, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,17 @@
 from ckeditor.fields import RichTextField
+from datetime import datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 
-from .choices import EventStatus, EventVisibility, Recurrence, Weekday, WeekOfMonth
+from .choices import EventStatus, EventVisibility, Recurrence, SeriesExceptionKind, TombstoneKind, Weekday, WeekOfMonth
+from .utils import DEFAULT_TIMEZONE, RESERVED_SLUGS, free_slugs, parse_rrule, slug_base
+from .search import search_events
 from extras.models import TimeStampedModel, ImageAttachment
 
 
@@ -15,6 +20,8 @@ from extras.models import TimeStampedModel, ImageAttachment
 #
 
 class EventCategory(TimeStampedModel):
+    surrogate_key_prefix = "category"
+
     name = models.CharField(max_length=60, unique=True)
     slug = models.SlugField(max_length=60, unique=True, blank=True)
 
@@ -35,6 +42,8 @@ class EventCategory(TimeStampedModel):
 #
 
 class EventSeries(TimeStampedModel):
+    surrogate_key_prefix = "series"
+
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True, blank=True)
     description = models.CharField(max_length=300, blank=True)
@@ -68,6 +77,11 @@ class EventSeries(TimeStampedModel):
     start_date = models.DateField(help_text="First date the series can occur on")
     end_date = models.DateField(blank=True, null=True, help_text="Optional end date")
     start_time = models.TimeField(help_text="Start time for each occurrence")
+    timezone = models.CharField(
+        max_length=64,
+        default=DEFAULT_TIMEZONE,
+        help_text="IANA time zone the start time is given in, e.g. America/Denver",
+    )
 
     recurrence = models.CharField(
         max_length=20,
@@ -89,15 +103,53 @@ class EventSeries(TimeStampedModel):
         null=True,
         help_text="1=first, 2=second, 3=third, 4=fourth, 5=last"
     )
+    rrule = models.TextField(
+        blank=True,
+        help_text="Optional RFC 5545 rule, e.g. FREQ=WEEKLY;BYDAY=TU,TH. Replaces recurrence/weekday/week of month.",
+    )
 
     is_active = models.BooleanField(default=True)
 
+    # Next upcoming public occurrence, maintained by events.services.refresh_next_events
+    next_event = models.ForeignKey(
+        "Event",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="+",
+    )
+    next_start = models.DateTimeField(null=True, blank=True, editable=False)
+
     class Meta:
         ordering = ['title']
+        indexes = [
+            models.Index(fields=["is_active", "next_start"]),
+            # Delta sync (events.api.ChangesApiView)
+            models.Index(fields=["updated_at", "id"]),
+        ]
 
     def __str__(self):
         return self.title
 
+    def clean(self):
+        super().clean()
+        errors = {}
+
+        try:
+            ZoneInfo(self.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            errors["timezone"] = "Unknown time zone."
+
+        if self.rrule and self.start_date and self.start_time:
+            try:
+                parse_rrule(self.rrule, datetime.combine(self.start_date, self.start_time))
+            except (ValueError, TypeError) as e:
+                errors["rrule"] = f"Invalid recurrence rule: {e}"
+
+        if errors:
+            raise ValidationError(errors)
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
@@ -109,7 +161,115 @@ class EventSeries(TimeStampedModel):
 # Event Occurrence
 #
 
+class LocalDate(models.Func):
+    """
+    The calendar date of `start` in each row's own `timezone`. PostgreSQL
+    converts row by row (AT TIME ZONE); backends without a time zone database
+    use DEFAULT_TIMEZONE for every row.
+    """
+    output_field = models.DateField()
+
+    def __init__(self, start="start", tz="timezone", **extra):
+        super().__init__(start, tz, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.get_source_expressions()[0])
+        return connection.ops.datetime_cast_date_sql(sql, tuple(params), DEFAULT_TIMEZONE)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, template="(%(expressions)s)::date", arg_joiner=" AT TIME ZONE ", **extra_context
+        )
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    Named scopes for the hot event queries. Each one is backed by an index in
+    Event.Meta; keep the two in step.
+    """
+
+    def between(self, from_dt=None, to_dt=None):
+        """
+        Events starting in [from_dt, to_dt); either bound may be omitted.
+        """
+        qs = self
+        if from_dt is not None:
+            qs = qs.filter(start__gte=from_dt)
+        if to_dt is not None:
+            qs = qs.filter(start__lt=to_dt)
+        return qs
+
+    def public_upcoming(self, now=None):
+        """
+        Published, public events that have not started yet, soonest first.
+        Index: (status, visibility, start).
+        """
+        return self.public_between(now or timezone.now(), None)
+
+    def standalone_upcoming(self, now=None):
+        """
+        One-time events (no series) that have not started yet, soonest first.
+        Index: partial (start) WHERE series IS NULL.
+        """
+        return self.filter(series__isnull=True).between(now or timezone.now()).order_by("start")
+
+    def public_between(self, from_dt, to_dt):
+        """
+        Published, public events starting in [from_dt, to_dt) (either bound
+        may be None), soonest first.
+        Index: (status, visibility, start).
+        """
+        return (
+            self.filter(status=EventStatus.STATUS_PUBLISHED, visibility=EventVisibility.VIS_PUBLIC)
+            .between(from_dt, to_dt)
+            .order_by("start")
+        )
+
+    def with_local_date(self):
+        """
+        Annotates `local_date`, the day each event falls on where it happens.
+        """
+        return self.annotate(local_date=LocalDate())
+
+    def search(self, text):
+        """
+        Events matching the free-text `text`, best match first, with `rank`.
+        Index: the search vector (PostgreSQL) or FTS5 table (SQLite).
+        """
+        return search_events(self, text)
+
+    def for_series_window(self, series, from_dt=None, to_dt=None):
+        """
+        Occurrences of `series` starting in [from_dt, to_dt).
+        Index: the unique (series, start) constraint.
+        """
+        return self.filter(series=series).between(from_dt, to_dt)
+
+
+class EventManager(models.Manager.from_queryset(EventQuerySet)):
+
+    def allocate_slugs(self, title, count=1, exclude_pk=None):
+        """
+        Returns `count` free slugs for `title` (base, base-2, base-3, ...), fetching
+        every taken slug in the base's sequence with one query. RESERVED_SLUGS
+        are never handed out.
+        """
+        base = slug_base(title)
+        taken = (
+            self.get_queryset()
+            .filter(models.Q(slug=base) | models.Q(slug__startswith=f"{base}-"))
+            .values_list("slug", flat=True)
+        )
+        if exclude_pk is not None:
+            taken = taken.exclude(pk=exclude_pk)
+        return free_slugs(base, set(taken) | RESERVED_SLUGS, count)
+
+
 class Event(TimeStampedModel):
+    SLUG_RETRIES = 5
+    # Maintained by the app rather than edited; changing them does not make an override
+    BOOKKEEPING_FIELDS = {"created_at", "updated_at", "search_document"}
+
     title = models.CharField(max_length=200)
     slug = models.SlugField(max_length=220, unique=True, blank=True)
     summary = models.CharField(max_length=300, blank=True)
@@ -126,7 +286,7 @@ class Event(TimeStampedModel):
     start = models.DateTimeField()
     end = models.DateTimeField(null=True, blank=True)
 
-    timezone = models.CharField(max_length=64, default="America/Denver")
+    timezone = models.CharField(max_length=64, default=DEFAULT_TIMEZONE)
 
     location_name = models.CharField(max_length=200, blank=True)
     address = models.CharField(max_length=300, blank=True)
@@ -181,43 +341,198 @@ class Event(TimeStampedModel):
         blank=True,
         help_text="Last date/time attendees can register"
     )
+    # Plain text indexed for search next to the title; see events.search
+    search_document = models.TextField(blank=True, default="", editable=False)
+
+    objects = EventManager()
 
     class Meta:
         ordering = ["start"]
         indexes = [
-            models.Index(fields=["status", "start"]),
-            models.Index(fields=["slug"]),
+            models.Index(fields=["status", "visibility", "start"], name="event_status_vis_start_idx"),
+            models.Index(fields=["start"], condition=models.Q(series__isnull=True), name="event_standalone_start_idx"),
+            models.Index(fields=["start", "id"]),
+            # Delta sync (events.api.ChangesApiView)
+            models.Index(fields=["updated_at", "id"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["series", "start"], name="event_unique_series_start"),
         ]
 
     def __str__(self) -> str:
         return f"{self.title} ({self.start:%Y-%m-%d})"
 
     def save(self, *args, **kwargs):
-        regenerate_slug = False
-
-        if self.pk:
-            # Existing object — check if title changed
-            old = Event.objects.filter(pk=self.pk).values("title").first()
-            if old and old["title"] != self.title:
-                regenerate_slug = True
+        editing = self.pk is not None and not self._state.adding
+        if editing and not hasattr(self, "_loaded_values"):
+            # Built by hand rather than loaded; compare with the stored row instead
+            stored = (
+                Event.objects
+                .filter(pk=self.pk)
+                .values(*(f.attname for f in self._meta.concrete_fields))
+                .first()
+            )
+            if stored is not None:
+                self._loaded_values = stored
+        if editing and not hasattr(self, "_loaded_values"):
+            # No stored row to compare with: nothing is known to have changed
+            changed = set()
         else:
-            # New object
-            regenerate_slug = True
+            changed = self.changed_fields()
+        original_start = self.get_loaded_value("start", self.start)
 
-        if regenerate_slug:
-            base = slugify(self.title)[:200] or "event"
-            slug = base
-            i = 2
-            while Event.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base}-{i}"
-                i += 1
-            self.slug = slug
+        # New objects always get a slug; existing ones only when the title changed
+        regenerate_slug = not editing or "title" in changed
 
-        super().save(*args, **kwargs)
+        if regenerate_slug:
+            self.slug = Event.objects.allocate_slugs(self.title, exclude_pk=self.pk)[0]
+
+        for attempt in range(self.SLUG_RETRIES):
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                break
+            except IntegrityError:
+                # A concurrent save took our slug between allocation and insert
+                retry = (
+                    regenerate_slug
+                    and attempt < self.SLUG_RETRIES - 1
+                    and Event.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                )
+                if not retry:
+                    raise
+                self.slug = Event.objects.allocate_slugs(self.title, exclude_pk=self.pk)[0]
+
+        if editing and changed - self.BOOKKEEPING_FIELDS and self.series_id:
+            # An individually edited occurrence no longer follows the series schedule
+            self.record_override(original_start)
+
+    def record_override(self, original_start):
+        """
+        Records this occurrence as an override of the series occurrence that was
+        scheduled at `original_start`, unless it is already recorded.
+        """
+        if SeriesException.objects.filter(event=self).exists():
+            return
+        SeriesException.objects.update_or_create(
+            series_id=self.series_id,
+            date=original_start.astimezone(self.local_start.tzinfo).date(),
+            defaults={"kind": SeriesExceptionKind.KIND_OVERRIDE, "event": self},
+        )
 
     @property
     def is_upcoming(self) -> bool:
         return self.start >= timezone.now()
 
+    @property
+    def display_content(self):
+        """
+        The event's own content, or the series content it inherits.
+        """
+        if self.content:
+            return self.content
+        if self.series_id:
+            return self.series.content or ""
+        return ""
+
+    @property
+    def is_virtual(self) -> bool:
+        """
+        True for series occurrences computed on read that have no row yet.
+        """
+        return self.pk is None and self.series_id is not None
+
     def get_absolute_url(self):
-        return reverse("aa_event_detail", kwargs={"slug": self.slug})
\ No newline at end of file
+        if self.is_virtual:
+            return reverse("event_occurrence_detail", kwargs={
+                "slug": self.series.slug,
+                "date": self.local_start.date().isoformat(),
+            })
+        return reverse("event_detail", kwargs={"slug": self.slug})
+
+    def get_manage_url(self):
+        if self.is_virtual:
+            return reverse("event_occurrence_edit", kwargs={
+                "slug": self.series.slug,
+                "date": self.local_start.date().isoformat(),
+            })
+        return reverse("event_manage_detail", kwargs={"slug": self.slug})
+
+    @property
+    def local_start(self):
+        try:
+            return self.start.astimezone(ZoneInfo(self.timezone))
+        except (ZoneInfoNotFoundError, ValueError):
+            return timezone.localtime(self.start)
+
+
+#
+# Series Exceptions
+#
+
+class SeriesException(TimeStampedModel):
+    """
+    A staff decision about one scheduled occurrence of a series (EXDATE style):
+    the occurrence was deleted (skip) or individually edited (override). The
+    generators never recreate or rewrite an occurrence on an exception date.
+    """
+    series = models.ForeignKey(
+        EventSeries,
+        on_delete=models.CASCADE,
+        related_name="exceptions",
+    )
+    date = models.DateField(help_text="Local date the occurrence was scheduled on")
+    kind = models.CharField(
+        max_length=20,
+        choices=SeriesExceptionKind.KIND_CHOICES,
+        default=SeriesExceptionKind.KIND_SKIP,
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="series_exceptions",
+        help_text="The stored occurrence that overrides the scheduled one",
+    )
+
+    class Meta:
+        ordering = ["series", "date"]
+        constraints = [
+            models.UniqueConstraint(fields=["series", "date"], name="seriesexception_unique_series_date"),
+        ]
+
+    def __str__(self):
+        return f"{self.series} {self.date:%Y-%m-%d} ({self.get_kind_display()})"
+
+
+#
+# Tombstones
+#
+
+class Tombstone(models.Model):
+    """
+    Left behind when an Event or EventSeries row is hard-deleted, so delta-sync
+    consumers (events.api.ChangesApiView) learn about deletions. Written by the
+    post_delete signals and by the raw bulk delete paths in events.services;
+    pruned after EVENTS_TOMBSTONE_DAYS by `manage.py prune_event_tombstones`.
+    """
+    kind = models.CharField(max_length=20, choices=TombstoneKind.KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["deleted_at", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
+
+    @classmethod
+    def record(cls, kind, ids):
+        """
+        Records the deletion of the `kind` rows with primary keys `ids`.
+        """
+        now = timezone.now()
+        return cls.objects.bulk_create([cls(kind=kind, object_id=pk, deleted_at=now) for pk in ids])
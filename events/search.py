@@ -0,0 +1,241 @@
+# events/search.py
+"""
+Full-text search over events.
+
+Every event stores a plain-text `search_document` (summary, stripped content,
+location, address and category name) beside its title, and the database
+indexes the pair:
+
+- PostgreSQL: a generated `search_vector` tsvector column (title weighted A,
+  the document B) with a GIN index.
+- SQLite: an FTS5 table, events_event_fts, kept in step by triggers.
+
+Both are installed by migration 0019 and re-checked after every migrate (a
+SQLite table rebuild drops its triggers). Other databases fall back to
+icontains over the same two columns.
+
+The document depends on the category and series as well as the row itself,
+so signals (events.signals) and the bulk write paths in events.services
+refresh it through index_events.
+"""
+import html
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+SEARCH_CONFIG = "english"
+EVENT_TABLE = "events_event"
+FTS_TABLE = "events_event_fts"
+# bm25 column weights for (title, search_document)
+FTS_WEIGHTS = (10.0, 1.0)
+
+POSTGRES_INSTALL = [
+    f"""
+    ALTER TABLE {EVENT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(search_document, '')), 'B')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS {EVENT_TABLE}_search_vector_gin ON {EVENT_TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL = [
+    f"DROP INDEX IF EXISTS {EVENT_TABLE}_search_vector_gin",
+    f"ALTER TABLE {EVENT_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {EVENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, search_document) VALUES (new.id, new.title, new.search_document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF title, search_document ON {EVENT_TABLE} BEGIN
+        UPDATE {FTS_TABLE} SET title = new.title, search_document = new.search_document WHERE rowid = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {EVENT_TABLE} BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def install_search_index(using="default"):
+    """
+    Creates the database side of the search index if it is missing. Safe to
+    run repeatedly.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == "sqlite":
+            if FTS_TABLE not in connection.introspection.table_names(cursor):
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(title, search_document, tokenize='porter unicode61')"
+                )
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE}(rowid, title, search_document) "
+                    f"SELECT id, title, search_document FROM {EVENT_TABLE}"
+                )
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+
+
+def uninstall_search_index(using="default"):
+    connection = connections[using]
+    statements = {"postgresql": POSTGRES_UNINSTALL, "sqlite": SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def rebuild_search_index(using="default"):
+    """
+    Refills the SQLite FTS table from the event rows (PostgreSQL's generated
+    column cannot drift).
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, search_document) "
+            f"SELECT id, title, search_document FROM {EVENT_TABLE}"
+        )
+
+
+#
+# Documents
+#
+
+def document_text(summary, content, location_name, address, category_name):
+    """
+    The search document for one event: its text fields with the HTML of
+    `content` stripped and whitespace collapsed.
+    """
+    content = html.unescape(strip_tags(content or ""))
+    parts = (summary, content, location_name, address, category_name)
+    return " ".join(" ".join(part for part in parts if part).split())
+
+
+def event_document(event):
+    category = event.category.name if event.category_id else ""
+    return document_text(event.summary, event.display_content, event.location_name, event.address, category)
+
+
+def series_document(series):
+    """
+    The search document shared by the generated occurrences of `series`, which
+    copy its description, location and category and inherit its content.
+    """
+    category = series.category.name if series.category_id else ""
+    return document_text(series.description, series.content, series.default_location, series.default_address, category)
+
+
+def index_event(event):
+    """
+    Stores the search document of one saved event if it changed.
+    """
+    document = event_document(event)
+    if document != event.search_document:
+        type(event).objects.filter(pk=event.pk).update(search_document=document)
+        event.search_document = document
+        if hasattr(event, "_loaded_values"):
+            # Written behind save(), so the snapshot must not report it as changed
+            event._update_loaded_values(["search_document"])
+
+
+def index_events(events, batch_size=500):
+    """
+    Recomputes the search documents of the events in queryset `events` with
+    one read, writing back only the rows whose document changed. Returns the
+    number of rows written.
+    """
+    model = events.model
+    rows = events.order_by().values_list(
+        "pk", "summary", "content", "series__content", "location_name", "address", "category__name",
+        "search_document",
+    )
+    changed = []
+    for pk, summary, content, series_content, location_name, address, category, current in rows.iterator(
+        chunk_size=batch_size
+    ):
+        document = document_text(summary, content or series_content, location_name, address, category)
+        if document != current:
+            changed.append(model(pk=pk, search_document=document))
+    model.objects.bulk_update(changed, ["search_document"], batch_size=batch_size)
+    return len(changed)
+
+
+#
+# Queries
+#
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text: every word must match, the last as
+    a prefix so partial words still find something. Words are quoted, so
+    FTS5 syntax in `text` is taken literally.
+    """
+    terms = [f'"{term}"' for term in re.findall(r"\w+", text)]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_events(queryset, text):
+    """
+    `queryset` narrowed to the events matching `text`, annotated with `rank`
+    (higher is better) and ordered best first.
+    """
+    text = (text or "").strip()
+    if not text:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    table = queryset.model._meta.db_table
+
+    if vendor == "postgresql":
+        query = "websearch_to_tsquery(%s::regconfig, %s)"
+        matches = RawSQL(f"{table}.search_vector @@ {query}", [SEARCH_CONFIG, text], output_field=BooleanField())
+        rank = RawSQL(f"ts_rank_cd({table}.search_vector, {query})", [SEARCH_CONFIG, text], output_field=FloatField())
+        queryset = queryset.filter(matches).annotate(rank=rank)
+
+    elif vendor == "sqlite":
+        query = fts_query(text)
+        if not query:
+            return queryset.none()
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query])
+        # bm25 is lower for better matches
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            [query],
+            output_field=FloatField(),
+        )
+        queryset = queryset.filter(pk__in=matches).annotate(rank=rank)
+
+    else:
+        matches = Q()
+        for term in text.split():
+            matches &= Q(title__icontains=term) | Q(search_document__icontains=term)
+        queryset = queryset.filter(matches).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.order_by("-rank", "-start", "pk")
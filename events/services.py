@@ -1,109 +1,283 @@
-from datetime import date, datetime, timedelta
-from django.utils import timezone
+import calendar
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from .choices import Recurrence
-from .models import Event
-from .utils import nth_weekday_of_month
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.urls import reverse
+from django.utils import dateformat, timezone
 
+from .cache import calendar_month_key, calendar_timeout, occurrences_changed
+from .choices import EventStatus, EventVisibility, TombstoneKind
+from .models import Event, EventSeries, SeriesException, Tombstone
+from .search import index_events, series_document
+from extras.cache import read_through
+from extras.models import ImageAttachment
+from .utils import DEFAULT_TIMEZONE, occurrence_starts
 
-def generate_weekly_events(series, from_date, to_date):
-    current = from_date
 
-    while current <= to_date:
-        if current.weekday() == series.weekday:
-            start_dt = timezone.make_aware(
-                datetime.combine(current, series.start_time)
-            )
+def virtual_occurrences_enabled():
+    return getattr(settings, "EVENTS_VIRTUAL_OCCURRENCES", False)
 
-            Event.objects.get_or_create(
-                series=series,
-                start=start_dt,
-                defaults={
-                    "title": series.title,
-                    "summary": series.description,
-                    "content": series.content,
-                    "end": start_dt + timedelta(minutes=series.default_duration_minutes),
-                    "location_name": series.default_location,
-                    "address": series.default_address,
-                    "category": series.category,
-                    "status": "published",
-                    "visibility": series.visibility,
-                    "image": series.image,
-                },
-            )
 
-        current += timedelta(days=1)
+def horizon_days():
+    return getattr(settings, "EVENTS_HORIZON_DAYS", 90)
 
 
-def generate_monthly_events(series, from_date, to_date):
+def build_occurrence(series, start_dt):
     """
-    Generates one event per month using:
-    - series.weekday (0=Mon..6=Sun)
-    - series.week_of_month (1..4, 5=last)
+    Unsaved Event for one occurrence of `series`, filled from the series defaults.
+    Content is left empty; occurrences inherit series.content on read.
     """
-    if series.weekday is None or series.week_of_month is None:
-        return  # nothing to generate
+    return Event(
+        series=series,
+        start=start_dt,
+        title=series.title,
+        summary=series.description,
+        end=start_dt + timedelta(minutes=series.default_duration_minutes),
+        timezone=series.timezone,
+        location_name=series.default_location,
+        address=series.default_address,
+        category=series.category,
+        status=EventStatus.STATUS_PUBLISHED,
+        visibility=series.visibility,
+        image=series.image,
+    )
 
-    year, month = from_date.year, from_date.month
 
-    # loop months until we pass to_date
-    while date(year, month, 1) <= to_date:
-        event_day = nth_weekday_of_month(year, month, series.weekday, series.week_of_month)
+def exception_dates(series, from_date=None, to_date=None):
+    """
+    Local dates of `series` that carry a SeriesException (skipped or overridden).
+    """
+    qs = SeriesException.objects.filter(series=series)
+    if from_date:
+        qs = qs.filter(date__gte=from_date)
+    if to_date:
+        qs = qs.filter(date__lte=to_date)
+    return set(qs.values_list("date", flat=True))
 
-        if event_day and from_date <= event_day <= to_date:
-            start_dt = timezone.make_aware(datetime.combine(event_day, series.start_time))
 
-            Event.objects.get_or_create(
-                series=series,
-                start=start_dt,
-                defaults={
-                    "title": series.title,
-                    "summary": series.description,
-                    "content": series.content,
-                    "end": start_dt + timedelta(minutes=series.default_duration_minutes),
-                    "location_name": series.default_location,
-                    "address": series.default_address,
-                    "category": series.category,
-                    "status": "published",
-                    "visibility": series.visibility,
-                    "image": series.image,
-                },
-            )
+def scheduled_starts(series, from_date, to_date):
+    """
+    Occurrence starts of `series` between from_date and to_date, minus the
+    dates staff skipped or overrode.
+    """
+    starts = occurrence_starts(series, from_date, to_date)
+    if not starts:
+        return []
+    skipped = exception_dates(series, from_date, to_date)
+    return [s for s in starts if s.date() not in skipped]
 
-        # advance month
-        if month == 12:
-            year += 1
-            month = 1
-        else:
-            month += 1
 
+def create_occurrences(series, starts):
+    """
+    Materializes the occurrences of `series` starting at `starts`.
 
-def get_generation_start_date(series):
-    last_event = (
-        series.events
-        .order_by("-start")
-        .first()
-    )
+    Existing (series, start) pairs are fetched in one query, the missing rows are
+    built in memory, their slugs allocated in one query, and they are written
+    with a single bulk_create. The unique constraints make concurrent runs safe:
+    conflicting rows are skipped, and rows that lost their slug to a concurrent
+    writer are retried with freshly allocated slugs.
+    Returns the number of rows that were missing.
+    """
+    starts = sorted(set(starts))
+    if not starts:
+        return 0
+
+    def missing_starts(candidates):
+        existing = set(
+            Event.objects
+            .for_series_window(series, candidates[0])
+            .filter(start__lte=candidates[-1])
+            .values_list("start", flat=True)
+        )
+        return [s for s in candidates if s not in existing]
+
+    missing = missing_starts(starts)
+    created = len(missing)
+    # bulk_create skips the signal that fills the search document
+    document = series_document(series)
+
+    for attempt in range(Event.SLUG_RETRIES):
+        if not missing:
+            break
+        events = [build_occurrence(series, s) for s in missing]
+        for event, slug in zip(events, Event.objects.allocate_slugs(series.title, len(events))):
+            event.slug = slug
+            event.search_document = document
+
+        Event.objects.bulk_create(events, ignore_conflicts=True)
+        missing = missing_starts(missing)
 
-    if last_event:
-        return last_event.start.date() + timedelta(days=1)
+    refresh_next_events([series.pk])
+    occurrences_changed(series.pk)
+    return created - len(missing)
 
-    return series.start_date
+
+def generate_occurrences(series, from_date, to_date):
+    """
+    Materializes every scheduled occurrence of `series` between from_date and
+    to_date that is missing, skipping exception dates.
+    """
+    return create_occurrences(series, scheduled_starts(series, from_date, to_date))
+
+
+def get_generation_window(series, days=90):
+    """
+    The full window to generate: from today (or the series start) through the
+    next `days`. Regenerating it is safe because existing occurrences and
+    exception dates are diffed out.
+    """
+    today = timezone.localdate(timezone=ZoneInfo(series.timezone))
+    return max(series.start_date, today), today + timedelta(days=days)
 
 
 def generate_next_90_days(series, days=90):
     """
-    Generates occurrences from the proper start date through the next `days`.
-    Safe to call multiple times because generators use get_or_create.
+    Generates the missing occurrences of the next `days`.
+    Safe to call multiple times: existing occurrences and exception dates are
+    skipped and the (series, start) constraint rejects duplicates from
+    concurrent runs. Returns the number of occurrences created.
+
+    With virtual occurrences enabled nothing is written; occurrences are
+    computed on read by occurrences_between().
     """
-    from_date = get_generation_start_date(series)
-    to_date = from_date + timedelta(days=days)
+    if virtual_occurrences_enabled():
+        return 0
+
+    from_date, to_date = get_generation_window(series, days)
+
+    return generate_occurrences(series, from_date, to_date)
 
-    if series.recurrence == Recurrence.REC_WEEKLY:
-        generate_weekly_events(series, from_date, to_date)
 
-    elif series.recurrence == Recurrence.REC_MONTHLY:
-        generate_monthly_events(series, from_date, to_date)
+GENERATION_LOCK_ID = 7_340_211  # arbitrary, shared by every node
+
+
+def generation_lock_path():
+    """
+    Lock file for databases without advisory locks. Beside the SQLite file, so
+    every process using that database (web workers, cron jobs) finds the same one.
+    """
+    if connection.vendor == "sqlite" and not connection.is_in_memory_db():
+        return f"{connection.settings_dict['NAME']}.generation.lock"
+    return os.path.join(tempfile.gettempdir(), "events-generation.lock")
+
+
+@contextmanager
+def generation_lock():
+    """
+    Holds a lock that is shared across processes while occurrences are generated.
+    Yields True if the lock was acquired, False if another run holds it.
+
+    PostgreSQL uses a session advisory lock (shared by every node); other
+    databases take an exclusive flock on generation_lock_path(), shared by the
+    processes of one host. Both are released if the holder dies.
+    """
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [GENERATION_LOCK_ID])
+            acquired = cursor.fetchone()[0]
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [GENERATION_LOCK_ID])
+        return
+
+    with open(generation_lock_path(), "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+#
+# Next occurrence pointer
+#
+
+def refresh_next_events(series_ids=None):
+    """
+    Points EventSeries.next_event / next_start at each series' next upcoming
+    published, public occurrence, in a single UPDATE. `series_ids` limits the
+    refresh to those series; None refreshes every series.
+    Returns the number of series updated.
+    """
+    upcoming = Event.objects.public_upcoming().filter(series=OuterRef("pk"))
+    series_qs = EventSeries.objects.all()
+    if series_ids is not None:
+        series_qs = series_qs.filter(pk__in=series_ids)
+    return series_qs.update(
+        next_event=Subquery(upcoming.values("pk")[:1]),
+        next_start=Subquery(upcoming.values("start")[:1]),
+    )
+
+
+def series_with_next_event():
+    """
+    (series, next occurrence) pairs for the active series, ordered by title.
+
+    Reads the maintained next_event pointer in one query. Pointers that have
+    gone stale since the last refresh (their occurrence has started) are
+    refreshed on the spot. With virtual occurrences enabled the next computed
+    occurrence is used when it comes before the stored one.
+    """
+    now = timezone.now()
+    series_qs = (
+        EventSeries.objects
+        .filter(is_active=True)
+        .select_related("next_event__image")
+        .defer("content", "next_event__content")
+        .order_by("title")
+    )
+    if virtual_occurrences_enabled():
+        # Only public series have computed occurrences to show
+        series_qs = series_qs.filter(Q(next_start__isnull=False) | Q(visibility=EventVisibility.VIS_PUBLIC))
+    else:
+        series_qs = series_qs.filter(next_start__isnull=False)
+    series_list = list(series_qs)
+
+    stale = [series.pk for series in series_list if series.next_start and series.next_start < now]
+    if stale:
+        refresh_next_events(stale)
+        fresh = series_qs.in_bulk(stale)
+        series_list = [fresh.get(series.pk, series) for series in series_list]
+
+    pairs = []
+    for series in series_list:
+        next_event = series.next_event if series.next_start and series.next_start >= now else None
+        next_event = next_occurrence(series, next_event)
+        if next_event:
+            pairs.append((series, next_event))
+    return pairs
+
+
+def overridden_event_ids(series):
+    return set(
+        series.exceptions
+        .filter(event__isnull=False)
+        .values_list("event_id", flat=True)
+    )
+
+
+# EventSeries fields copied onto future occurrences by apply_series_defaults_to_future_events
+SERIES_DEFAULT_FIELDS = {"category", "default_location", "default_address", "visibility"}
+
+# EventSeries fields that decide when occurrences happen, handled by reschedule_future_events
+SERIES_SCHEDULE_FIELDS = {
+    "title", "start_date", "end_date", "start_time", "timezone", "recurrence",
+    "weekday", "week_of_month", "rrule", "default_duration_minutes", "is_active",
+}
 
 
 def apply_series_defaults_to_future_events(series, *, sync_image=False):
@@ -112,11 +286,365 @@ def apply_series_defaults_to_future_events(series, *, sync_image=False):
         location_name=series.default_location,
         address=series.default_address,
         visibility=series.visibility,
-        content=series.content,
-
+        updated_at=timezone.now(),
     )
 
     if sync_image:
         update_kwargs["image"] = series.image  # can be set or cleared
 
-    return series.events.filter(start__gte=timezone.now()).update(**update_kwargs)
\ No newline at end of file
+    events = (
+        Event.objects
+        .for_series_window(series, timezone.now())
+        .exclude(pk__in=overridden_event_ids(series))
+    )
+    updated = events.update(**update_kwargs)
+    # The search documents carry the category and location just copied
+    index_events(events)
+    refresh_next_events([series.pk])
+    occurrences_changed(series.pk)
+    return updated
+
+
+def delete_rows(queryset):
+    """
+    Deletes the rows matched by `queryset` with one DELETE statement, without
+    loading them or sending delete signals. Callers handle anything the
+    signals would have done.
+    """
+    return queryset._raw_delete(queryset.db)
+
+
+def delete_event_rows(ids):
+    """
+    Raw-deletes the events with primary keys `ids` (see delete_rows), leaving
+    tombstones behind for delta-sync consumers.
+    """
+    Tombstone.record(TombstoneKind.KIND_EVENT, ids)
+    return delete_rows(Event.objects.filter(pk__in=ids))
+
+
+@transaction.atomic
+def reschedule_future_events(series, days=None):
+    """
+    Brings the future occurrences of `series` in line with its current schedule
+    and title after an edit.
+
+    The stored future rows and the newly scheduled starts are diffed in memory:
+    rows whose start is still scheduled are kept, rows that fell off the schedule
+    are moved onto newly scheduled starts (keeping their pk and slug), and only
+    the remainder is created or deleted. Changes are written with one
+    bulk_update, one bulk_create and one set-based delete. Overridden
+    occurrences are never touched.
+
+    Returns a dict with the number of updated, created and deleted rows.
+    """
+    counts = {"updated": 0, "created": 0, "deleted": 0}
+    if virtual_occurrences_enabled():
+        return counts
+
+    now = timezone.now()
+    overridden = overridden_event_ids(series)
+    future = list(Event.objects.for_series_window(series, now).order_by("start"))
+    taken = {e.start for e in future}
+    existing = [e for e in future if e.pk not in overridden]
+
+    from_date, to_date = get_generation_window(series, days or horizon_days())
+    if existing:
+        zone = ZoneInfo(series.timezone)
+        to_date = max(to_date, existing[-1].start.astimezone(zone).date())
+    if not series.is_active:
+        scheduled = []
+    else:
+        scheduled = [s for s in scheduled_starts(series, from_date, to_date) if s >= now]
+    scheduled_set = set(scheduled)
+
+    stale = [e for e in existing if e.start not in scheduled_set]
+    fresh = [s for s in scheduled if s not in taken]
+
+    duration = timedelta(minutes=series.default_duration_minutes)
+    stale_ids = {e.pk for e in stale}
+    changed = []
+    for event in existing:
+        if event.pk in stale_ids:
+            continue
+        if event.title != series.title or event.end != event.start + duration or event.timezone != series.timezone:
+            changed.append(event)
+
+    # Move rows that fell off the schedule onto the new dates
+    moved, stale = stale[:len(fresh)], stale[len(fresh):]
+    for event, start in zip(moved, fresh):
+        event.start = start
+        changed.append(event)
+    fresh = fresh[len(moved):]
+
+    for event in changed:
+        event.title = series.title
+        event.end = event.start + duration
+        event.timezone = series.timezone
+        event.updated_at = now
+
+    if changed:
+        Event.objects.bulk_update(changed, ["start", "end", "title", "timezone", "updated_at"])
+        counts["updated"] = len(changed)
+    if stale:
+        counts["deleted"] = delete_event_rows([e.pk for e in stale])
+    if fresh:
+        counts["created"] = create_occurrences(series, fresh)
+    else:
+        refresh_next_events([series.pk])
+    occurrences_changed(series.pk)
+
+    return counts
+
+
+#
+# Virtual occurrences
+#
+
+def virtual_occurrences(series, from_dt, to_dt, stored_starts=frozenset(), skipped=None):
+    """
+    Unsaved Events for the occurrences of `series` in [from_dt, to_dt) that
+    have no stored row. `stored_starts` holds the (series_id, start) pairs
+    already stored and `skipped` the series' exception dates (fetched when
+    not given).
+    """
+    zone = ZoneInfo(series.timezone)
+    from_date, to_date = from_dt.astimezone(zone).date(), to_dt.astimezone(zone).date()
+    starts = occurrence_starts(series, from_date, to_date)
+    if skipped is None:
+        skipped = exception_dates(series, from_date, to_date) if starts else set()
+    return [
+        build_occurrence(series, start)
+        for start in starts
+        if from_dt <= start < to_dt
+        and (series.pk, start) not in stored_starts
+        and start.date() not in skipped
+    ]
+
+
+def occurrences_between(from_dt, to_dt, events=None, series=None):
+    """
+    Events starting in [from_dt, to_dt), sorted by start.
+
+    `events` is the queryset of stored rows to include (all events by default).
+    With virtual occurrences enabled the occurrences of `series` (active series
+    by default) are computed on the fly and merged in; stored rows take the
+    place of the occurrence they override.
+    """
+    if events is None:
+        events = Event.objects.all()
+    stored = list(events.between(from_dt, to_dt))
+
+    if not virtual_occurrences_enabled():
+        return sorted(stored, key=lambda e: e.start)
+
+    if series is None:
+        series = EventSeries.objects.filter(is_active=True).select_related("category", "image")
+
+    stored_starts = {
+        (series_id, start)
+        for series_id, start in (
+            Event.objects
+            .filter(series__isnull=False)
+            .between(from_dt, to_dt)
+            .values_list("series_id", "start")
+        )
+    }
+
+    # One query for the exception dates of every series in the window
+    skipped = {}
+    for series_id, day in (
+        SeriesException.objects
+        .filter(date__gte=from_dt.date() - timedelta(days=1), date__lte=to_dt.date() + timedelta(days=1))
+        .values_list("series_id", "date")
+    ):
+        skipped.setdefault(series_id, set()).add(day)
+
+    occurrences = stored
+    for s in series:
+        occurrences.extend(virtual_occurrences(s, from_dt, to_dt, stored_starts, skipped.get(s.pk, set())))
+
+    return sorted(occurrences, key=lambda e: e.start)
+
+
+def upcoming_window():
+    now = timezone.now()
+    return now, now + timedelta(days=horizon_days())
+
+
+def next_occurrence(series, stored_next=None):
+    """
+    The next upcoming occurrence of `series`: the earlier of its next stored
+    row and, with virtual occurrences enabled, its next computed occurrence.
+    Series that are not public have no computed occurrences to show.
+    """
+    if not virtual_occurrences_enabled() or series.visibility != EventVisibility.VIS_PUBLIC:
+        return stored_next
+
+    from_dt, to_dt = upcoming_window()
+    if stored_next is not None:
+        to_dt = min(to_dt, stored_next.start)
+
+    stored_starts = set(
+        Event.objects
+        .for_series_window(series, from_dt, to_dt)
+        .values_list("series_id", "start")
+    )
+    virtual = virtual_occurrences(series, from_dt, to_dt, stored_starts)
+    return virtual[0] if virtual else stored_next
+
+
+def find_occurrence(series, day):
+    """
+    The occurrence of `series` on local date `day`, stored or virtual, or None.
+    """
+    zone = ZoneInfo(series.timezone)
+    starts = occurrence_starts(series, day, day)
+    if not starts:
+        return None
+
+    from_dt = datetime.combine(day, time.min, tzinfo=zone)
+    to_dt = from_dt + timedelta(days=1)
+    stored = Event.objects.for_series_window(series, from_dt, to_dt).order_by("start").first()
+    if stored:
+        return stored
+    if day in exception_dates(series, day, day):
+        return None
+    return build_occurrence(series, starts[0])
+
+
+def materialize_occurrence(series, start_dt):
+    """
+    Stores the occurrence of `series` at `start_dt` (if it is not stored yet)
+    and returns the Event row, so it can be edited, registered for or canceled.
+    The row still follows the series until an edit changes it (Event.save
+    records the override then).
+    """
+    create_occurrences(series, [start_dt])
+    return Event.objects.get(series=series, start=start_dt)
+
+
+
+#
+# Calendar
+#
+
+def calendar_grid(year, month):
+    """
+    The weeks shown for `month`: lists of seven dates, Sunday first.
+    """
+    return calendar.Calendar(firstweekday=6).monthdatescalendar(year, month)
+
+
+def calendar_entry(title, url, start, tzname, category):
+    try:
+        local = start.astimezone(ZoneInfo(tzname))
+    except (ZoneInfoNotFoundError, ValueError):
+        local = timezone.localtime(start)
+    return {
+        "title": title,
+        "url": url,
+        "start": start.isoformat(),
+        "time": dateformat.format(local, "g:i A"),
+        "category": category,
+    }
+
+
+def load_calendar_month(year, month):
+    """
+    {ISO date: [entry, ...]} for the days of the month's grid. Stored events
+    come from one query that buckets published public rows by their local date
+    in SQL (Event.objects.with_local_date); with virtual occurrences enabled,
+    the computed occurrences of public series are merged in.
+    """
+    weeks = calendar_grid(year, month)
+    first, last = weeks[0][0], weeks[-1][-1]
+    # A day of slack either side for events in other time zones; local_date does the exact cut
+    zone = ZoneInfo(DEFAULT_TIMEZONE)
+    from_dt = datetime.combine(first - timedelta(days=1), time.min, tzinfo=zone)
+    to_dt = datetime.combine(last + timedelta(days=2), time.min, tzinfo=zone)
+
+    days = {}
+    rows = (
+        Event.objects
+        .public_between(from_dt, to_dt)
+        .with_local_date()
+        .filter(local_date__gte=first, local_date__lte=last)
+        .order_by("start", "pk")
+        .values_list("local_date", "slug", "title", "start", "timezone", "category__name")
+    )
+    for day, slug, title, start, tzname, category in rows:
+        url = reverse("event_detail", args=[slug])
+        days.setdefault(day.isoformat(), []).append(calendar_entry(title, url, start, tzname, category))
+
+    if virtual_occurrences_enabled():
+        series = (
+            EventSeries.objects
+            .filter(is_active=True, visibility=EventVisibility.VIS_PUBLIC)
+            .select_related("category")
+        )
+        for occurrence in occurrences_between(from_dt, to_dt, events=Event.objects.none(), series=series):
+            day = occurrence.local_start.date()
+            if first <= day <= last:
+                category = occurrence.category.name if occurrence.category else None
+                days.setdefault(day.isoformat(), []).append(calendar_entry(
+                    occurrence.title, occurrence.get_absolute_url(), occurrence.start, occurrence.timezone, category,
+                ))
+        for entries in days.values():
+            entries.sort(key=lambda entry: entry["start"])
+
+    return days
+
+
+def calendar_month(year, month):
+    """
+    Cached load_calendar_month; dropped whenever an event, series, category or
+    image changes (see events.cache.invalidate_event_calendar).
+    """
+    return read_through(calendar_month_key(year, month), lambda: load_calendar_month(year, month), calendar_timeout())
+
+
+#
+# Deletion
+#
+
+def delete_series(series, batch_size=1000):
+    """
+    Deletes `series` and all of its occurrences without loading them as model
+    instances. Occurrences go in batches of `batch_size` with raw set-based
+    deletes (one short transaction per batch), and the images they referenced
+    get a single orphan check at the end.
+
+    Safe to call from a view, the admin or a background job. Returns the number
+    of occurrences deleted.
+    """
+    series_id = series.pk
+    image_ids = {series.image_id} if series.image_id else set()
+    deleted = 0
+
+    # Drop the pointer first; the raw deletes below do not null it
+    EventSeries.objects.filter(pk=series.pk).update(next_event=None, next_start=None)
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Event.objects
+                .for_series_window(series)
+                .order_by()
+                .values_list("pk", "image_id")[:batch_size]
+            )
+            if not batch:
+                break
+
+            ids = [pk for pk, _ in batch]
+            image_ids.update(image_id for _, image_id in batch if image_id)
+            SeriesException.objects.filter(event_id__in=ids).update(event=None)
+            deleted += delete_event_rows(ids)
+
+    with transaction.atomic():
+        delete_rows(SeriesException.objects.filter(series=series))
+        series.delete()
+
+    ImageAttachment.delete_orphans(image_ids)
+    occurrences_changed(series_id)
+    return deleted
@@ -1,7 +1,16 @@
 # signals.py
-from django.db.models.signals import post_delete, pre_delete
+from django.db import connections, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
 from django.dispatch import receiver
-from .models import EventSeries, Event
+from django.utils import timezone
+from .cache import EVENT_LIST_KEY, invalidate_event_calendar, invalidate_event_details
+from extras.page_cache import invalidate_pages
+from extras.purge import purge_after_commit, surrogate_key
+from .choices import SeriesExceptionKind, TombstoneKind
+from .models import EventCategory, EventSeries, Event, SeriesException, Tombstone
+from .search import EVENT_TABLE, index_event, index_events, install_search_index
+from .services import refresh_next_events
 from extras.models import ImageAttachment
 
 
@@ -17,12 +26,110 @@ def series_post_delete(sender, instance, **kwargs):
         img.delete()
 
 
+@receiver(pre_delete, sender=Event)
+def event_pre_delete(sender, instance: Event, origin=None, **kwargs):
+    # Deleting a single occurrence skips that date so generation won't recreate it.
+    # Cascades from deleting the whole series have nothing to record.
+    if not instance.series_id or isinstance(origin, EventSeries) or getattr(origin, "model", None) is EventSeries:
+        return
+
+    # An override keeps the date it was originally scheduled on
+    if SeriesException.objects.filter(event=instance).update(kind=SeriesExceptionKind.KIND_SKIP, event=None):
+        return
+    SeriesException.objects.update_or_create(
+        series_id=instance.series_id,
+        date=instance.local_start.date(),
+        defaults={"kind": SeriesExceptionKind.KIND_SKIP, "event": None},
+    )
+
+
+@receiver(post_save, sender=Event)
+def event_post_save(sender, instance: Event, raw=False, **kwargs):
+    # A saved occurrence may now be (or no longer be) its series' next one
+    if instance.series_id and not raw:
+        refresh_next_events([instance.series_id])
+
+
 @receiver(post_delete, sender=Event)
-def event_post_delete(sender, instance: Event, **kwargs):
+def event_post_delete(sender, instance: Event, origin=None, **kwargs):
     # If event is part of a series, never delete shared series image
     if instance.series_id:
+        if not isinstance(origin, EventSeries) and getattr(origin, "model", None) is not EventSeries:
+            refresh_next_events([instance.series_id])
         return
 
     # Standalone event: delete its image if orphaned
     if instance.image and instance.image.is_orphan():
         instance.image.delete()
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventSeries)
+@receiver([post_save, post_delete], sender=EventCategory)
+@receiver([post_save, post_delete], sender=ImageAttachment)
+def invalidate_cached_event_details(sender, instance, **kwargs):
+    # Event pages render the event, its series, category and image
+    transaction.on_commit(invalidate_event_details)
+    transaction.on_commit(invalidate_event_calendar)
+    transaction.on_commit(invalidate_pages)
+    # Pages are tagged with each of those (see EventView.get_surrogate_keys); listings with "events"
+    purge_after_commit(surrogate_key(instance), EVENT_LIST_KEY)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=EventSeries)
+def record_tombstone(sender, instance, **kwargs):
+    # Delta-sync consumers only learn about deletions from these (raw deletes in services write their own)
+    kind = TombstoneKind.KIND_SERIES if sender is EventSeries else TombstoneKind.KIND_EVENT
+    Tombstone.record(kind, [instance.pk])
+
+
+@receiver(post_save, sender=Event)
+def update_search_document(sender, instance: Event, raw=False, **kwargs):
+    if not raw:
+        index_event(instance)
+
+
+@receiver(post_save, sender=EventSeries)
+def update_inherited_search_documents(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    # Occurrences without content of their own search the series content. The
+    # description, location and address are copied onto occurrences, and
+    # apply_series_defaults_to_future_events reindexes the rows it copies to.
+    if raw or created or (update_fields is not None and "content" not in update_fields):
+        return
+    index_events(instance.events.filter(Q(content__isnull=True) | Q(content="")))
+
+
+@receiver(post_save, sender=EventCategory)
+def update_category_search_documents(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    # Event documents carry the category name
+    if raw or created or (update_fields is not None and "name" not in update_fields):
+        return
+    index_events(instance.events.all())
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_save, sender=EventSeries)
+def touch_rows_showing_slug(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    # The API serializes category and series slugs onto the rows that point at
+    # them; move those rows' updated_at so delta sync sends them again
+    if raw or created or (update_fields is not None and "slug" not in update_fields):
+        return
+    now = timezone.now()
+    instance.events.update(updated_at=now)
+    if sender is EventCategory:
+        instance.series.update(updated_at=now)
+
+
+@receiver(post_migrate)
+def reinstall_search_index(sender, using="default", **kwargs):
+    # SQLite rebuilds a table to alter it, dropping the FTS triggers with it
+    if sender.label != "events":
+        return
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if EVENT_TABLE not in connection.introspection.table_names(cursor):
+            return
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, EVENT_TABLE)}
+    if "search_document" in columns:
+        install_search_index(using)
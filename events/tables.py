@@ -93,7 +93,7 @@ class EventSeriesTable(tables.Table):
 class EventTable(tables.Table):
     title = tables.Column(
         verbose_name="Title",
-        linkify=lambda record: reverse("event_manage_detail", args=[record.slug]),
+        linkify=lambda record: record.get_manage_url(),
     )
 
     start = tables.DateTimeColumn(format="M j, Y g:i A", verbose_name="Start")
@@ -147,6 +147,13 @@ class EventTable(tables.Table):
         return format_html('<span class="{}">{}</span>', cls, record.get_visibility_display())
 
     def render_actions(self, record):
+        if record.is_virtual:
+            # Computed occurrence: editing stores it first
+            return format_html(
+                '<a class="btn btn-sm btn-all-warning" href="{}">Edit</a>',
+                record.get_manage_url(),
+            )
+
         edit_url = reverse('event_manage_edit', args=[record.slug])
         delete_url = reverse('event_manage_delete', args=[record.slug])
         return format_html(
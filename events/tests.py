@@ -1,3 +1,1183 @@
-from django.test import TestCase
+import re
+import shutil
+import tempfile
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from importlib import import_module
+from io import BytesIO, StringIO
+from unittest import mock
+from zoneinfo import ZoneInfo
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from PIL import Image
+
+from .choices import EventStatus, EventVisibility, Recurrence, TombstoneKind
+from .models import Event, EventCategory, EventManager, EventSeries, SeriesException, Tombstone
+from .services import (
+    build_occurrence, create_occurrences, delete_series, find_occurrence, generate_next_90_days, generation_lock,
+    next_occurrence, occurrences_between, refresh_next_events, reschedule_future_events, series_with_next_event,
+)
+from .utils import (
+    DEFAULT_TIMEZONE, Schedule, free_slugs, iter_occurrence_dates, nth_weekday_of_month, occurrence_starts, slug_base,
+)
+from extras.models import ImageAttachment, SiteSettings
+from extras.pagination import TOKEN_SALT, InvalidPageToken, KeysetPaginator
+
+
+def series_today():
+    # "Today" where series are scheduled, which may differ from the server's date
+    return timezone.localdate(timezone=ZoneInfo(DEFAULT_TIMEZONE))
+
+
+# The manifest storage needs collectstatic; tests render templates without it
+TEST_STORAGES = {
+    **settings.STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+class EventQuerySetIndexTests(TestCase):
+    """
+    Each EventQuerySet scope must be answered by an index, not a table scan.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        cls.series = EventSeries.objects.create(
+            title="Monthly Meetup",
+            start_date=date.today(),
+            start_time=time(18),
+        )
+        for i in range(20):
+            Event.objects.create(
+                title=f"Event {i}",
+                start=now + timedelta(days=i - 5),
+                series=cls.series if i % 2 else None,
+                status=EventStatus.STATUS_PUBLISHED,
+                visibility=EventVisibility.VIS_PUBLIC if i % 3 else EventVisibility.VIS_PRIVATE,
+            )
+
+    def assertIndexScan(self, queryset):
+        if connection.vendor == "postgresql":
+            # Tiny test tables make a sequential scan cheapest; rule it out so
+            # the plan shows whether a usable index exists
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+            self.assertIn("Index", plan, plan)
+            self.assertNotIn("Seq Scan", plan, plan)
+        else:
+            plan = queryset.explain()
+            self.assertRegex(plan, r"SEARCH \S*events_event\S* USING (COVERING )?INDEX", plan)
+            self.assertIsNone(re.search(r"SCAN \S*events_event\S*(?! USING)\s*$", plan, re.M), plan)
+
+    def test_public_upcoming_uses_index(self):
+        self.assertIndexScan(Event.objects.public_upcoming())
+
+    def test_standalone_upcoming_uses_index(self):
+        self.assertIndexScan(Event.objects.standalone_upcoming())
+
+    def test_for_series_window_uses_index(self):
+        now = timezone.now()
+        self.assertIndexScan(Event.objects.for_series_window(self.series, now, now + timedelta(days=90)))
+
+    def test_scopes_filter_rows(self):
+        now = timezone.now()
+        public = list(Event.objects.public_upcoming(now))
+        self.assertTrue(public)
+        self.assertTrue(all(e.start >= now and e.visibility == EventVisibility.VIS_PUBLIC for e in public))
+        self.assertEqual(public, sorted(public, key=lambda e: e.start))
+
+        standalone = list(Event.objects.standalone_upcoming(now))
+        self.assertTrue(standalone)
+        self.assertTrue(all(e.series_id is None and e.start >= now for e in standalone))
+
+        window = Event.objects.for_series_window(self.series, now, now + timedelta(days=7))
+        self.assertTrue(all(e.series_id == self.series.pk and now <= e.start < now + timedelta(days=7) for e in window))
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0)
+class PublicEventPageQueryTests(TestCase):
+    """
+    The public event pages run a fixed number of queries however many events
+    they show. Raise these numbers only for a deliberate new query.
+    The full-page cache is off so the views themselves are measured.
+    """
+
+    # Page query, carousel query and the two ETag aggregates
+    LIST_QUERIES = 4
+    # Cache misses for the event and its ETag validator
+    DETAIL_QUERIES = 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = EventCategory.objects.create(name="Workshops")
+        cls.content_type = ContentType.objects.get_for_model(Event)
+
+    def setUp(self):
+        # Site settings come from the cache on every page; keep them out of the count
+        cache.clear()
+        SiteSettings.load()
+
+    def make_series(self, n):
+        now = timezone.now()
+        for i in range(n):
+            image = self.make_image()
+            series = EventSeries.objects.create(
+                title=f"Series {EventSeries.objects.count()}",
+                start_date=date.today(),
+                start_time=time(18),
+                category=self.category,
+                image=image,
+                visibility=EventVisibility.VIS_PUBLIC,
+            )
+            for day in range(1, 4):
+                self.make_event(series=series, start=now + timedelta(days=day), image=image)
+        refresh_next_events()
+
+    def make_image(self):
+        return ImageAttachment.objects.bulk_create([
+            ImageAttachment(content_type=self.content_type, object_id=0, image="media/event-0-test.jpg"),
+        ])[0]
+
+    def make_event(self, **kwargs):
+        kwargs.setdefault("title", f"Event {Event.objects.count()}")
+        kwargs.setdefault("start", timezone.now() + timedelta(days=2))
+        kwargs.setdefault("status", EventStatus.STATUS_PUBLISHED)
+        kwargs.setdefault("visibility", EventVisibility.VIS_PUBLIC)
+        kwargs.setdefault("category", self.category)
+        if "image" not in kwargs:
+            kwargs["image"] = self.make_image()
+        return Event.objects.create(**kwargs)
+
+    def test_event_list_query_count(self):
+        for _ in range(3):
+            self.make_event()
+        self.make_series(2)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            self.assertEqual(self.client.get(reverse("event_list")).status_code, 200)
+
+        for _ in range(5):
+            self.make_event()
+        self.make_series(5)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get(reverse("event_list"))
+        self.assertEqual(len(response.context["recurring_next"]), 7)
+
+    def test_event_detail_query_count(self):
+        self.make_series(1)
+        standalone = self.make_event()
+        occurrence = Event.objects.filter(series__isnull=False).first()
+
+        for event in (standalone, occurrence):
+            with self.assertNumQueries(self.DETAIL_QUERIES):
+                response = self.client.get(event.get_absolute_url())
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, "Workshops")
+
+            # Served from the per-slug cache from then on
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(event.get_absolute_url()).status_code, 200)
+
+    def test_event_detail_conditional_get(self):
+        event = self.make_event()
+        response = self.client.get(event.get_absolute_url())
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(event.get_absolute_url(), headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_event_detail_cache_invalidation(self):
+        event = self.make_event(title="Open House")
+        self.assertEqual(self.client.get(event.get_absolute_url()).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = "Socials"
+            self.category.save()
+        self.assertContains(self.client.get(event.get_absolute_url()), "Socials")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event.delete()
+        self.assertEqual(self.client.get(event.get_absolute_url()).status_code, 404)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class EventFeedTests(TestCase):
+    """
+    Series go out as one RRULE each; skipped and edited dates as EXDATEs.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.series = EventSeries.objects.create(
+            title="Weekly Circle",
+            start_date=date(2026, 1, 5),
+            start_time=time(18),
+            weekday=1,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        SeriesException.objects.create(series=cls.series, date=date(2026, 1, 13))
+
+    def test_series_rrule_and_exdate(self):
+        response = self.client.get(reverse("event_feed_ics"))
+        self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+        body = b"".join(response.streaming_content).decode()
+        self.assertIn("DTSTART;TZID=America/Denver:20260106T180000\r\n", body)
+        self.assertIn("RRULE:FREQ=WEEKLY;BYDAY=TU\r\n", body)
+        self.assertIn("EXDATE;TZID=America/Denver:20260113T180000\r\n", body)
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+
+    def test_feed_conditional_get(self):
+        etag = self.client.get(reverse("series_feed_ics", args=[self.series.slug]))["ETag"]
+        response = self.client.get(reverse("series_feed_ics", args=[self.series.slug]), headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+
+class EventApiTests(TestCase):
+    """
+    The JSON API pages with cursors and never exposes draft or non-public rows.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        for i in range(5):
+            Event.objects.create(
+                title=f"Public {i}",
+                start=now + timedelta(days=i + 1),
+                status=EventStatus.STATUS_PUBLISHED,
+                visibility=EventVisibility.VIS_PUBLIC,
+            )
+        Event.objects.create(title="Draft", start=now + timedelta(days=1), visibility=EventVisibility.VIS_PUBLIC)
+        Event.objects.create(
+            title="Members",
+            start=now + timedelta(days=1),
+            status=EventStatus.STATUS_PUBLISHED,
+            visibility=EventVisibility.VIS_MEMBERS,
+        )
+
+    def test_cursor_pagination_and_fields(self):
+        titles = []
+        url = reverse("api_event_list") + "?limit=2&fields=title,start"
+        while url:
+            with self.assertNumQueries(2):
+                data = self.client.get(url).json()
+            self.assertTrue(all(set(row) == {"title", "start"} for row in data["results"]))
+            titles.extend(row["title"] for row in data["results"])
+            url = data["next"]
+        self.assertEqual(titles, [f"Public {i}" for i in range(5)])
+
+    def test_bad_parameters(self):
+        for query in ("fields=content", "visibility=members", "cursor=nope", "from=soon"):
+            response = self.client.get(f"{reverse('api_event_list')}?{query}")
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("error", response.json())
+
+
+@override_settings(EVENTS_CHANGES_SETTLE_SECONDS=0)
+class ChangesApiTests(TestCase):
+    """
+    Delta sync reports only what changed since the cursor, deletions included.
+    """
+
+    def sync(self, cursor=None):
+        url = reverse("api_changes") + (f"?cursor={cursor}" if cursor else "")
+        return self.client.get(url).json()
+
+    def test_changes_since_cursor(self):
+        kept, dropped = [
+            Event.objects.create(
+                title=title,
+                start=timezone.now() + timedelta(days=1),
+                status=EventStatus.STATUS_PUBLISHED,
+                visibility=EventVisibility.VIS_PUBLIC,
+            )
+            for title in ("Kept", "Dropped")
+        ]
+        data = self.sync()
+        self.assertEqual({row["title"] for row in data["events"]}, {"Kept", "Dropped"})
+
+        data = self.sync(data["cursor"])
+        self.assertEqual((data["events"], data["deleted"]), ([], []))
+
+        kept.title = "Kept and edited"
+        kept.save()
+        dropped_id = dropped.pk
+        dropped.delete()
+        data = self.sync(data["cursor"])
+        self.assertEqual([row["title"] for row in data["events"]], ["Kept and edited"])
+        self.assertEqual(data["deleted"], [{"type": "event", "id": dropped_id}])
+
+    def test_related_slug_change_resends_rows(self):
+        category = EventCategory.objects.create(name="Workshops")
+        series = EventSeries.objects.create(
+            title="Tuesday Club",
+            start_date=date.today(),
+            start_time=time(18),
+            category=category,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        event = Event.objects.create(
+            title="Open House",
+            start=timezone.now() + timedelta(days=1),
+            status=EventStatus.STATUS_PUBLISHED,
+            visibility=EventVisibility.VIS_PUBLIC,
+            category=category,
+            series=series,
+        )
+        cursor = self.sync()["cursor"]
+
+        category.slug = "classes"
+        category.save()
+        data = self.sync(cursor)
+        self.assertEqual([(row["id"], row["category"]) for row in data["events"]], [(event.pk, "classes")])
+        self.assertEqual([(row["id"], row["category"]) for row in data["series"]], [(series.pk, "classes")])
+
+        series.slug = "tuesdays"
+        series.save()
+        data = self.sync(data["cursor"])
+        self.assertEqual([(row["id"], row["series"]) for row in data["events"]], [(event.pk, "tuesdays")])
+
+        # Edits that leave the slug alone do not resend the events
+        category.name = "Classes"
+        category.save()
+        self.assertEqual(self.sync(data["cursor"])["events"], [])
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0)
+class CalendarViewTests(TestCase):
+    """
+    A month renders from one bucketed query, then from the cache alone.
+    """
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.load()
+
+    def test_month_query_count(self):
+        start = timezone.make_aware(datetime(2026, 3, 14, 19))
+        for i in range(3):
+            Event.objects.create(
+                title=f"Night {i}",
+                start=start + timedelta(days=7 * i),
+                status=EventStatus.STATUS_PUBLISHED,
+                visibility=EventVisibility.VIS_PUBLIC,
+            )
+        Event.objects.create(title="Draft", start=start, visibility=EventVisibility.VIS_PUBLIC)
+        url = reverse("event_calendar_month", args=[2026, 3])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertContains(response, "Night 2")
+        self.assertNotContains(response, "Draft")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertEqual(self.client.get(reverse("event_calendar_month", args=[2026, 13])).status_code, 404)
+        self.assertContains(self.client.get(reverse("event_calendar_week", args=[2026, 11])), "Night 0")
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0)
+class EventSearchTests(TestCase):
+    """
+    Search covers the indexed text, ranks title matches first and follows edits.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = EventCategory.objects.create(name="Gardening")
+        cls.in_title = Event.objects.create(
+            title="Pottery night",
+            start=timezone.now() + timedelta(days=1),
+            status=EventStatus.STATUS_PUBLISHED,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        cls.in_content = Event.objects.create(
+            title="Open studio",
+            content="<p>Bring your own <strong>pottery</strong> tools</p>",
+            category=cls.category,
+            start=timezone.now() + timedelta(days=2),
+            status=EventStatus.STATUS_PUBLISHED,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        Event.objects.create(title="Pottery (draft)", start=timezone.now(), visibility=EventVisibility.VIS_PUBLIC)
+
+    def test_ranked_public_results(self):
+        response = self.client.get(reverse("event_search"), {"q": "pottery"})
+        self.assertEqual(list(response.context["results"]), [self.in_title, self.in_content])
+        self.assertEqual(list(Event.objects.search("garden")), [self.in_content])
+        self.assertEqual(list(Event.objects.search('pott" OR')), [])
+
+    def test_index_follows_edits(self):
+        self.category.name = "Ceramics"
+        self.category.save()
+        self.assertEqual(list(Event.objects.search("ceramics")), [self.in_content])
+
+        self.in_title.title = "Weaving night"
+        self.in_title.save()
+        self.assertEqual(list(Event.objects.search("weaving")), [self.in_title])
+        self.assertNotIn(self.in_title, Event.objects.search("pottery"))
+
+    def test_series_content_reindexes_inheriting_rows_only(self):
+        series = EventSeries.objects.create(title="Clay Club", start_date=date(2026, 1, 5), start_time=time(18))
+        inherits, own = (
+            Event.objects.create(title=f"Clay Club {i}", series=series, start=timezone.now() + timedelta(days=i))
+            for i in (3, 4)
+        )
+        own.content = "<p>Glazing</p>"
+        own.save()
+
+        with mock.patch("events.signals.index_events") as index:
+            series.default_location = "Studio B"
+            series.save()
+            self.category.save()
+        index.assert_not_called()
+
+        series.content = "<p>Wheel throwing</p>"
+        series.save()
+        self.assertEqual(list(Event.objects.search("wheel")), [inherits])
+        self.assertEqual(list(Event.objects.search("glazing")), [own])
+
+    def test_admin_search_matches_slugs(self):
+        self.client.force_login(
+            get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        changelist = reverse("admin:events_event_changelist")
+        response = self.client.get(changelist, {"q": self.in_content.slug})
+        self.assertEqual(list(response.context["cl"].result_list), [self.in_content])
+        response = self.client.get(changelist, {"q": "garden"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.in_content])
+
+
+class OccurrenceGenerationTests(TestCase):
+    """
+    Occurrences are written with a constant number of queries and never twice.
+    """
+
+    def make_series(self, **kwargs):
+        kwargs.setdefault("title", "Weekly Meetup")
+        kwargs.setdefault("start_date", series_today())
+        kwargs.setdefault("start_time", time(18))
+        kwargs.setdefault("weekday", series_today().weekday())
+        return EventSeries.objects.create(**kwargs)
+
+    def test_generation_is_idempotent(self):
+        series = self.make_series()
+        created = generate_next_90_days(series)
+        self.assertEqual(created, 13)
+        self.assertEqual(series.events.count(), 13)
+        self.assertEqual(len(set(series.events.values_list("slug", flat=True))), 13)
+
+        self.assertEqual(generate_next_90_days(series), 0)
+        self.assertEqual(series.events.count(), 13)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        counts = []
+        for weeks in (2, 20):
+            series = self.make_series(title=f"Series {weeks}")
+            starts = occurrence_starts(series, series_today(), series_today() + timedelta(weeks=weeks - 1))
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(create_occurrences(series, starts), weeks)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+
+class RecurrenceDateTests(TestCase):
+    """
+    Recurrence dates are stepped in closed form from the series anchor.
+    """
+
+    def test_nth_weekday_of_month(self):
+        # March 2026 starts on a Sunday
+        self.assertEqual(nth_weekday_of_month(2026, 3, 0, 1), date(2026, 3, 2))
+        self.assertEqual(nth_weekday_of_month(2026, 3, 6, 1), date(2026, 3, 1))
+        self.assertEqual(nth_weekday_of_month(2026, 3, 1, 4), date(2026, 3, 24))
+        self.assertEqual(nth_weekday_of_month(2026, 3, 1, 5), date(2026, 3, 31))
+        self.assertEqual(nth_weekday_of_month(2026, 2, 5, 5), date(2026, 2, 28))
+        # Only four Wednesdays in February 2026: the fourth is also the last
+        self.assertEqual(nth_weekday_of_month(2026, 2, 2, 4), date(2026, 2, 25))
+        self.assertEqual(nth_weekday_of_month(2026, 2, 2, 5), date(2026, 2, 25))
+
+    def test_monthly_dates(self):
+        schedule = Schedule(Recurrence.REC_MONTHLY, 1, 2, date(2026, 1, 1), None)
+        self.assertEqual(
+            list(iter_occurrence_dates(schedule, date(2026, 1, 1), date(2026, 4, 30))),
+            [date(2026, 1, 13), date(2026, 2, 10), date(2026, 3, 10), date(2026, 4, 14)],
+        )
+
+    def test_biweekly_parity_follows_start_date(self):
+        # First occurrence is Tuesday 2026-01-06, so the fortnight falls on the 6th and 20th
+        schedule = Schedule(Recurrence.REC_BIWEEKLY, 1, None, date(2026, 1, 5), None)
+        expected = [date(2026, 1, 20), date(2026, 2, 3), date(2026, 2, 17)]
+        for from_date in (date(2026, 1, 7), date(2026, 1, 14), date(2026, 1, 20)):
+            self.assertEqual(list(iter_occurrence_dates(schedule, from_date, date(2026, 2, 20))), expected)
+
+    def test_dates_clipped_to_series_bounds(self):
+        schedule = Schedule(Recurrence.REC_WEEKLY, 4, None, date(2026, 1, 10), date(2026, 1, 31))
+        self.assertEqual(
+            list(iter_occurrence_dates(schedule, date(2026, 1, 1), date(2026, 3, 1))),
+            [date(2026, 1, 16), date(2026, 1, 23), date(2026, 1, 30)],
+        )
+
+
+class SeriesTimeZoneTests(TestCase):
+    """
+    Occurrences keep their wall-clock time in the series' zone across DST.
+    """
+
+    def test_rrule_expansion_across_dst(self):
+        # US daylight saving time starts on 2026-03-08
+        series = EventSeries(
+            title="Tuesday Circle",
+            start_date=date(2026, 3, 1),
+            start_time=time(18),
+            rrule="FREQ=WEEKLY;BYDAY=TU",
+        )
+        starts = occurrence_starts(series, date(2026, 3, 1), date(2026, 3, 14))
+        self.assertEqual([s.date() for s in starts], [date(2026, 3, 3), date(2026, 3, 10)])
+        self.assertTrue(all(s.time() == time(18) for s in starts))
+        self.assertEqual([s.utcoffset() for s in starts], [timedelta(hours=-7), timedelta(hours=-6)])
+
+    def test_rrule_count_and_interval(self):
+        series = EventSeries(
+            title="Fortnightly",
+            start_date=date(2026, 1, 6),
+            start_time=time(9, 30),
+            rrule="RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=TU;COUNT=3",
+            timezone="Europe/London",
+        )
+        starts = occurrence_starts(series, date(2026, 1, 1), date(2026, 12, 31))
+        self.assertEqual([s.date() for s in starts], [date(2026, 1, 6), date(2026, 1, 20), date(2026, 2, 3)])
+        self.assertEqual(str(starts[0].tzinfo), "Europe/London")
+
+    def test_invalid_rule_and_zone_rejected(self):
+        series = EventSeries(title="Bad", start_date=date(2026, 1, 1), start_time=time(9), rrule="FREQ=SOMETIMES")
+        series.timezone = "Mars/Olympus"
+        with self.assertRaises(ValidationError) as raised:
+            series.clean()
+        self.assertEqual(set(raised.exception.message_dict), {"rrule", "timezone"})
+
+    def test_mst_occurrences_normalized(self):
+        normalize = import_module("events.migrations.0020_normalize_mst_occurrences").normalize_mst_occurrences
+        # A future summer date, when Denver is at UTC-6 and the old rows were an hour late
+        day = date(series_today().year + 1, 7, 1)
+        series = EventSeries.objects.create(title="Summer Nights", start_date=day, start_time=time(18))
+        local = datetime.combine(day, time(18), tzinfo=ZoneInfo(DEFAULT_TIMEZONE))
+        mst = datetime.combine(day, time(18), tzinfo=dt_timezone(timedelta(hours=-7)))
+        event = Event.objects.create(title="Summer Nights", series=series, start=mst, end=mst + timedelta(hours=1))
+
+        normalize(django_apps, None)
+        event.refresh_from_db()
+        self.assertEqual(event.start, local)
+        self.assertEqual(event.end, local + timedelta(hours=1))
+        self.assertEqual(series.events.count(), 1)
+
+
+def form_data(form, **changes):
+    """
+    POST data for `form` as rendered, with `changes` applied.
+    """
+    data = {}
+    for field in form:
+        value = field.value()
+        if value is None or value is False:
+            continue
+        data[field.html_name] = "on" if value is True else value
+    data.update(changes)
+    return data
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0, EVENTS_VIRTUAL_OCCURRENCES=True)
+class VirtualOccurrenceTests(TestCase):
+    """
+    Occurrences are computed on read and stored only when staff edit one.
+    """
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.load()
+        self.day = series_today() + timedelta(days=7)
+        self.series = EventSeries.objects.create(
+            title="Weekly Flow",
+            start_date=series_today(),
+            start_time=time(18),
+            weekday=self.day.weekday(),
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+
+    def edit_url(self, day=None):
+        return reverse("event_occurrence_edit", args=[self.series.slug, (day or self.day).isoformat()])
+
+    def test_occurrences_computed_without_rows(self):
+        occurrence = find_occurrence(self.series, self.day)
+        self.assertTrue(occurrence.is_virtual)
+        self.assertEqual(occurrence.start, datetime.combine(self.day, time(18), tzinfo=ZoneInfo(DEFAULT_TIMEZONE)))
+        self.assertIsNone(find_occurrence(self.series, self.day + timedelta(days=1)))
+
+        response = self.client.get(occurrence.get_absolute_url())
+        self.assertContains(response, "Weekly Flow")
+        self.assertFalse(Event.objects.exists())
+
+    def test_exception_dates_skipped(self):
+        SeriesException.objects.create(series=self.series, date=self.day)
+        self.assertIsNone(find_occurrence(self.series, self.day))
+        from_dt = datetime.combine(self.day - timedelta(days=1), time.min, tzinfo=ZoneInfo(DEFAULT_TIMEZONE))
+        to_dt = from_dt + timedelta(days=14)
+        starts = [e.start.date() for e in occurrences_between(from_dt, to_dt, events=Event.objects.none())]
+        self.assertEqual(starts, [self.day + timedelta(days=7)])
+
+    def test_non_public_series_hidden(self):
+        self.series.visibility = EventVisibility.VIS_PRIVATE
+        self.series.save()
+        self.assertIsNone(next_occurrence(self.series))
+        self.assertEqual(series_with_next_event(), [])
+        url = reverse("event_occurrence_detail", args=[self.series.slug, self.day.isoformat()])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_edit_page_does_not_store(self):
+        response = self.client.get(self.edit_url())
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Event.objects.exists())
+
+    def test_unchanged_submission_is_not_an_override(self):
+        form = self.client.get(self.edit_url()).context["form"]
+        response = self.client.post(self.edit_url(), form_data(form))
+        self.assertEqual(response.status_code, 302)
+
+        event = Event.objects.get()
+        self.assertEqual(event.start, find_occurrence(self.series, self.day).start)
+        self.assertFalse(SeriesException.objects.exists())
+        # Stored now, so the link goes to the row's own edit page
+        self.assertRedirects(
+            self.client.get(self.edit_url()), reverse("event_manage_edit", args=[event.slug]),
+            fetch_redirect_response=False,
+        )
+
+    def test_edited_submission_is_an_override(self):
+        form = self.client.get(self.edit_url()).context["form"]
+        self.client.post(self.edit_url(), form_data(form, location_name="Back room"))
+
+        event = Event.objects.get()
+        self.assertEqual(event.location_name, "Back room")
+        exception = SeriesException.objects.get()
+        self.assertEqual((exception.date, exception.event), (self.day, event))
+
+    def test_invalid_submission_stores_nothing(self):
+        form = self.client.get(self.edit_url()).context["form"]
+        response = self.client.post(self.edit_url(), form_data(form, title=""))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["form"].errors)
+        self.assertFalse(Event.objects.exists())
+
+
+class OccurrenceOverrideTests(TestCase):
+    """
+    Saving an occurrence records an override only when a field changed.
+    """
+
+    def setUp(self):
+        self.series = EventSeries.objects.create(
+            title="Monday Club",
+            start_date=date(2026, 1, 5),
+            start_time=time(18),
+            weekday=0,
+        )
+        self.start = datetime(2026, 1, 12, 18, tzinfo=ZoneInfo(DEFAULT_TIMEZONE))
+        create_occurrences(self.series, [self.start])
+        self.event = Event.objects.get()
+
+    def test_unchanged_save_is_not_an_override(self):
+        self.event.save()
+        self.event.search_document = "reindexed"
+        self.event.save()
+        self.assertFalse(SeriesException.objects.exists())
+
+    def test_moved_occurrence_keeps_its_original_date(self):
+        self.event.start += timedelta(days=1)
+        self.event.save()
+        exception = SeriesException.objects.get()
+        self.assertEqual((exception.date, exception.event), (date(2026, 1, 12), self.event))
+
+        # Recorded once however often the row is edited afterwards
+        self.event.title = "Tuesday Club"
+        self.event.save()
+        self.assertEqual(SeriesException.objects.count(), 1)
+
+    def test_unloaded_instance_compared_with_stored_row(self):
+        # bulk_create hands back saved instances that were never loaded
+        first, second = (build_occurrence(self.series, self.start + timedelta(days=d)) for d in (7, 14))
+        first.slug, second.slug = "monday-club-19", "monday-club-26"
+        Event.objects.bulk_create([first, second])
+
+        first.save()
+        self.assertFalse(SeriesException.objects.exists())
+
+        second.location_name = "Library"
+        second.save()
+        self.assertEqual(SeriesException.objects.get().event_id, second.pk)
+
+
+class SeriesHorizonTests(TestCase):
+    """
+    extend_series_horizon tops every active series up to the rolling horizon.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=series_today(),
+            start_time=time(18),
+            weekday=series_today().weekday(),
+        )
+
+    def extend(self, *args):
+        out = StringIO()
+        call_command("extend_series_horizon", *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_extends_only_the_missing_days(self):
+        generate_next_90_days(self.series, days=27)
+        self.assertEqual(self.series.events.count(), 4)
+
+        output = self.extend("--days", "90")
+        self.assertIn("weekly-meetup: 9 created", output)
+        self.assertEqual(self.series.events.count(), 13)
+        self.assertIn("0 occurrences created", self.extend("--days", "90"))
+
+    def test_inactive_and_ended_series_skipped(self):
+        EventSeries.objects.create(
+            title="Paused", start_date=series_today(), start_time=time(9), weekday=0, is_active=False,
+        )
+        EventSeries.objects.create(
+            title="Finished",
+            start_date=series_today() - timedelta(days=60),
+            end_date=series_today() - timedelta(days=1),
+            start_time=time(9),
+            weekday=0,
+        )
+        self.assertIn("Extended 1 series", self.extend("--days", "14", "--batch-size", "1"))
+        self.assertEqual(set(Event.objects.values_list("series__title", flat=True)), {"Weekly Meetup"})
+
+    def test_refuses_to_run_concurrently(self):
+        with generation_lock() as acquired:
+            self.assertTrue(acquired)
+            with self.assertRaises(CommandError):
+                self.extend()
+        self.assertFalse(Event.objects.exists())
+
+    @override_settings(EVENTS_VIRTUAL_OCCURRENCES=True)
+    def test_nothing_generated_with_virtual_occurrences(self):
+        self.assertIn("nothing to generate", self.extend())
+        self.assertFalse(Event.objects.exists())
+
+
+class RescheduleTests(TestCase):
+    """
+    Editing a series diffs its future rows against the new schedule.
+    """
+
+    def setUp(self):
+        self.first = series_today() + timedelta(days=7)
+        self.series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=self.first,
+            start_time=time(18),
+            weekday=self.first.weekday(),
+        )
+        generate_next_90_days(self.series, days=34)
+        self.rows = list(self.series.events.order_by("start"))
+
+    def test_moved_schedule_keeps_rows(self):
+        self.series.weekday = (self.first.weekday() + 1) % 7
+        self.series.start_time = time(19)
+        self.series.save()
+        counts = reschedule_future_events(self.series, days=34)
+
+        self.assertEqual(counts, {"updated": 4, "created": 0, "deleted": 0})
+        moved = list(self.series.events.order_by("start"))
+        self.assertEqual([e.pk for e in moved], [e.pk for e in self.rows])
+        self.assertEqual([e.slug for e in moved], [e.slug for e in self.rows])
+        for event in moved:
+            self.assertEqual(event.local_start.weekday(), self.series.weekday)
+            self.assertEqual(event.local_start.time(), time(19))
+
+    def test_title_change_updates_in_place(self):
+        self.series.title = "Weekly Gathering"
+        self.series.save()
+        counts = reschedule_future_events(self.series, days=34)
+        self.assertEqual(counts, {"updated": 4, "created": 0, "deleted": 0})
+        self.assertEqual(set(self.series.events.values_list("title", flat=True)), {"Weekly Gathering"})
+
+    def test_shortened_series_deletes_the_rest(self):
+        override = self.rows[-1]
+        override.location_name = "Library"
+        override.save()
+
+        self.series.end_date = self.first + timedelta(days=7)
+        self.series.save()
+        counts = reschedule_future_events(self.series, days=34)
+
+        self.assertEqual(counts, {"updated": 0, "created": 0, "deleted": 1})
+        kept = set(self.series.events.values_list("pk", flat=True))
+        self.assertEqual(kept, {self.rows[0].pk, self.rows[1].pk, override.pk})
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [self.rows[2].pk])
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0)
+class SeriesContentTests(TestCase):
+    """
+    Occurrences read the series content instead of storing a copy.
+    """
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.load()
+        self.series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=series_today() + timedelta(days=1),
+            start_time=time(18),
+            weekday=(series_today() + timedelta(days=1)).weekday(),
+            content="<p>Bring a friend.</p>",
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        generate_next_90_days(self.series, days=14)
+        self.event = self.series.events.order_by("start").first()
+
+    def test_occurrences_inherit_series_content(self):
+        self.assertIsNone(self.event.content)
+        self.assertEqual(self.event.display_content, "<p>Bring a friend.</p>")
+
+        self.series.content = "<p>Bring two friends.</p>"
+        self.series.save()
+        response = self.client.get(self.event.get_absolute_url())
+        self.assertContains(response, "Bring two friends.")
+
+    def test_own_content_wins(self):
+        self.event.content = "<p>Potluck this week.</p>"
+        self.event.save()
+        self.assertEqual(self.event.display_content, "<p>Potluck this week.</p>")
+        self.assertEqual(Event(title="Standalone").display_content, "")
+
+    def test_copied_content_cleared_by_migration(self):
+        clear = import_module("events.migrations.0014_dedupe_occurrence_content").clear_inherited_content
+        Event.objects.filter(pk=self.event.pk).update(content=self.series.content)
+        edited = self.series.events.exclude(pk=self.event.pk).first()
+        Event.objects.filter(pk=edited.pk).update(content="<p>Edited.</p>")
+
+        clear(django_apps, None)
+        self.assertEqual(
+            dict(self.series.events.values_list("pk", "content")),
+            {self.event.pk: None, edited.pk: "<p>Edited.</p>"},
+        )
+
+
+class DeleteSeriesTests(TestCase):
+    """
+    Deleting a series removes its occurrences in raw batches and cleans up
+    what the skipped delete signals would have.
+    """
+
+    def make_image(self):
+        content_type = ContentType.objects.get_for_model(Event)
+        return ImageAttachment.objects.bulk_create([
+            ImageAttachment(content_type=content_type, object_id=0, image="media/event-0-test.jpg"),
+        ])[0]
+
+    def test_occurrences_exceptions_and_orphans_removed(self):
+        image, shared = self.make_image(), self.make_image()
+        series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=series_today() + timedelta(days=1),
+            start_time=time(18),
+            weekday=(series_today() + timedelta(days=1)).weekday(),
+            image=image,
+        )
+        generate_next_90_days(series, days=35)
+        occurrences = list(series.events.order_by("start"))
+        occurrences[0].image = shared
+        occurrences[0].save()
+        SeriesException.objects.create(series=series, date=series_today() + timedelta(days=3))
+        standalone = Event.objects.create(title="Open House", start=timezone.now(), image=shared)
+
+        self.assertEqual(delete_series(series, batch_size=2), 5)
+        self.assertEqual(list(Event.objects.all()), [standalone])
+        self.assertFalse(EventSeries.objects.exists())
+        self.assertFalse(SeriesException.objects.exists())
+        self.assertEqual(list(ImageAttachment.objects.all()), [shared])
+        self.assertEqual(
+            set(Tombstone.objects.filter(kind=TombstoneKind.KIND_EVENT).values_list("object_id", flat=True)),
+            {e.pk for e in occurrences},
+        )
+
+
+class EventSlugTests(TestCase):
+    """
+    Slugs come from one query per batch, and a slug lost to a concurrent
+    writer is allocated again.
+    """
+
+    def lose_first_allocation(self, slugs):
+        # The first allocation hands out `slugs` as if another writer took them meanwhile
+        allocate = Event.objects.allocate_slugs
+        stale = iter([slugs])
+
+        def allocate_slugs(title, count=1, exclude_pk=None):
+            return next(stale, None) or allocate(title, count, exclude_pk)
+
+        return mock.patch.object(EventManager, "allocate_slugs", side_effect=allocate_slugs)
+
+    def test_free_slugs(self):
+        self.assertEqual(free_slugs("open-house", {"open-house", "open-house-3"}, 3), [
+            "open-house-2", "open-house-4", "open-house-5",
+        ])
+        self.assertEqual(slug_base("!!!"), "event")
+
+    def test_allocate_slugs_in_one_query(self):
+        event = Event.objects.create(title="Open House", start=timezone.now())
+        Event.objects.create(title="Open House", start=timezone.now())
+        Event.objects.create(title="Open House Party", start=timezone.now())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(Event.objects.allocate_slugs("Open House", 2), ["open-house-3", "open-house-4"])
+        self.assertEqual(Event.objects.allocate_slugs("Open House", exclude_pk=event.pk), ["open-house"])
+
+    def test_reserved_slugs_skipped(self):
+        event = Event.objects.create(title="Calendar", start=timezone.now())
+        self.assertEqual(event.slug, "calendar-2")
+        self.assertEqual(resolve(event.get_absolute_url()).url_name, "event_detail")
+        event = Event.objects.create(title="Search", start=timezone.now())
+        self.assertEqual(event.slug, "search-2")
+
+    def test_save_retries_a_taken_slug(self):
+        Event.objects.create(title="Open House", start=timezone.now())
+        with self.lose_first_allocation(["open-house"]):
+            event = Event.objects.create(title="Open House", start=timezone.now())
+        self.assertEqual(event.slug, "open-house-2")
+
+    def test_bulk_generation_retries_taken_slugs(self):
+        Event.objects.create(title="Weekly Meetup", start=timezone.now())
+        series = EventSeries.objects.create(
+            title="Weekly Meetup", start_date=date(2026, 1, 5), start_time=time(18), weekday=0,
+        )
+        starts = occurrence_starts(series, date(2026, 1, 5), date(2026, 1, 12))
+
+        with self.lose_first_allocation(["weekly-meetup", "weekly-meetup-2"]):
+            self.assertEqual(create_occurrences(series, starts), 2)
+        self.assertEqual(set(series.events.values_list("slug", flat=True)), {"weekly-meetup-2", "weekly-meetup-3"})
+
+
+class ChangedFieldsTests(TestCase):
+    """
+    Saves write only the columns that changed since the row was loaded.
+    """
+
+    def setUp(self):
+        Event.objects.create(title="Open House", start=timezone.now())
+        self.event = Event.objects.get()
+
+    def updates(self, queries):
+        # Leaves out the search document write from the post_save signal
+        return [
+            q["sql"] for q in queries.captured_queries
+            if q["sql"].startswith("UPDATE") and "search_document" not in q["sql"]
+        ]
+
+    def test_changed_fields(self):
+        self.assertEqual(self.event.changed_fields(), set())
+        self.event.location_name = "Library"
+        self.event.category = EventCategory.objects.create(name="Workshops")
+        self.assertEqual(self.event.changed_fields(), {"location_name", "category"})
+        self.event.save()
+        self.assertEqual(self.event.changed_fields(), set())
+        self.assertEqual(self.event.get_loaded_value("location_name"), "Library")
+        self.assertEqual(Event(title="New").changed_fields(), {f.name for f in Event._meta.concrete_fields})
+
+    def test_unchanged_save_writes_nothing(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.event.save()
+        self.assertEqual(self.updates(queries), [])
+
+    def test_update_narrowed_to_changed_columns(self):
+        self.event.location_name = "Library"
+        with CaptureQueriesContext(connection) as queries:
+            self.event.save()
+        update, = self.updates(queries)
+        self.assertIn('"location_name"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"title"', update)
+        self.assertNotIn('"content"', update)
+
+
+@override_settings(STORAGES=TEST_STORAGES)
+class SeriesEditTests(TestCase):
+    """
+    The series edit form syncs future occurrences with what actually changed.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        cache.clear()
+        SiteSettings.load()
+
+        self.series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=series_today() + timedelta(days=1),
+            start_time=time(18),
+            weekday=(series_today() + timedelta(days=1)).weekday(),
+        )
+        generate_next_90_days(self.series, days=14)
+        self.url = reverse("series_edit", args=[self.series.slug])
+
+    def landscape_jpeg(self):
+        buffer = BytesIO()
+        Image.new("RGB", (64, 32), "teal").save(buffer, "JPEG")
+        return SimpleUploadedFile("banner.jpg", buffer.getvalue(), content_type="image/jpeg")
+
+    def test_new_image_copied_to_future_occurrences(self):
+        form = self.client.get(self.url).context["form"]
+        response = self.client.post(self.url, form_data(form, image_file=self.landscape_jpeg()))
+        self.assertEqual(response.status_code, 302)
+
+        self.series.refresh_from_db()
+        self.assertIsNotNone(self.series.image_id)
+        self.assertEqual(set(self.series.events.values_list("image_id", flat=True)), {self.series.image_id})
+
+    def test_unchanged_schedule_not_rescheduled(self):
+        form = self.client.get(self.url).context["form"]
+        with mock.patch("events.views.reschedule_future_events") as reschedule:
+            self.client.post(self.url, form_data(form, default_location="Library"))
+        reschedule.assert_not_called()
+        self.assertEqual(set(self.series.events.values_list("location_name", flat=True)), {"Library"})
+
+
+class NextEventPointerTests(TestCase):
+    """
+    EventSeries.next_event follows the series' next published, public occurrence.
+    """
+
+    def setUp(self):
+        self.series = EventSeries.objects.create(
+            title="Weekly Meetup",
+            start_date=series_today() + timedelta(days=1),
+            start_time=time(18),
+            weekday=(series_today() + timedelta(days=1)).weekday(),
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        generate_next_90_days(self.series, days=21)
+        self.first, self.second, self.third = self.series.events.order_by("start")
+
+    def pointer(self):
+        self.series.refresh_from_db()
+        return self.series.next_event_id, self.series.next_start
+
+    def test_generation_sets_pointer(self):
+        self.assertEqual(self.pointer(), (self.first.pk, self.first.start))
+
+    def test_pointer_follows_saves_and_deletes(self):
+        self.first.status = EventStatus.STATUS_DRAFT
+        self.first.save()
+        self.assertEqual(self.pointer(), (self.second.pk, self.second.start))
+
+        self.second.visibility = EventVisibility.VIS_PRIVATE
+        self.second.save()
+        self.assertEqual(self.pointer(), (self.third.pk, self.third.start))
+
+        self.third.delete()
+        self.assertEqual(self.pointer(), (None, None))
+
+    def test_stale_pointer_refreshed_on_read(self):
+        past = timezone.now() - timedelta(hours=1)
+        Event.objects.filter(pk=self.first.pk).update(start=past)
+        EventSeries.objects.filter(pk=self.series.pk).update(next_start=past)
+
+        (series, next_event), = series_with_next_event()
+        self.assertEqual(next_event, self.second)
+        self.assertEqual(self.pointer(), (self.second.pk, self.second.start))
+
+    def test_repair_command(self):
+        EventSeries.objects.filter(pk=self.series.pk).update(next_event=None, next_start=None)
+        out = StringIO()
+        call_command("refresh_series_next_events", "--batch-size", "1", stdout=out)
+        self.assertIn("Refreshed the next occurrence of 1 series", out.getvalue())
+        self.assertEqual(self.pointer(), (self.first.pk, self.first.start))
+
+
+@override_settings(STORAGES=TEST_STORAGES, PAGE_CACHE_TIMEOUT=0)
+class KeysetPaginationTests(TestCase):
+    """
+    Pages are addressed by signed seek tokens that survive rows going away.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now() + timedelta(days=1)
+        # The second and third share a start across the page break, so the pk has to break the tie
+        cls.events = [
+            Event.objects.create(title=f"Event {i}", start=start + timedelta(hours=hours))
+            for i, hours in enumerate((0, 1, 1, 2, 3))
+        ]
+        cls.events.sort(key=lambda e: (e.start, e.pk))
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.load()
+
+    def paginator(self):
+        return KeysetPaginator(Event.objects.all(), 2, ("start", "pk"))
+
+    def test_pages_forward_and_back(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(first.next_page_token)
+        third = paginator.page(second.next_page_token)
+        self.assertEqual([*first, *second, *third], self.events)
+        self.assertFalse(third.has_next())
+
+        self.assertEqual(list(paginator.page(third.previous_page_token)), list(second))
+        self.assertEqual(list(paginator.page(second.previous_page_token)), list(first))
+        self.assertFalse(paginator.page(second.previous_page_token).has_previous())
+
+    def test_stale_token_continues_after_deleted_row(self):
+        paginator = self.paginator()
+        token = paginator.page().next_page_token
+        self.events[1].delete()
+        self.assertEqual(list(paginator.page(token)), self.events[2:4])
+
+    def test_invalid_tokens_rejected(self):
+        paginator = self.paginator()
+        token = paginator.page().next_page_token
+        signed = [signing.dumps(["n", values], salt=TOKEN_SALT) for values in (["1"], ["", "1"], ["noon", "1"])]
+        for bad in (token[:-2] + "xx", "garbage", *signed):
+            with self.subTest(token=bad), self.assertRaises(InvalidPageToken):
+                paginator.page(bad)
+        # Signed for another ordering
+        with self.assertRaises(InvalidPageToken):
+            KeysetPaginator(Event.objects.all(), 2, ("title", "start", "pk")).page(token)
+
+    def test_nullable_keys_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            KeysetPaginator(Event.objects.all(), 2, ("-created_at", "-pk"))
+
+    def test_view_returns_404_for_tampered_token(self):
+        response = self.client.get(reverse("event_list"))
+        self.assertEqual(len(response.context["single_events"]), 2)
+        next_url = response.context["next_page_url"]
+        self.assertEqual(self.client.get(reverse("event_list") + next_url).status_code, 200)
+        self.assertEqual(self.client.get(reverse("event_list") + next_url[:-3] + "abc").status_code, 404)
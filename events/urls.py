@@ -1,14 +1,35 @@
 from django.urls import path
+from .api import EventApiView, SeriesApiView, CategoryApiView, ChangesApiView
 from .views import (
     EventListView, CategoryListView, CategoryEditView, CategoryDeleteView, CategoryAddView,
 EventManageListView, EventManageDetailView, EventManageAddView, EventManageEditView, EventManageDeleteView,
-SeriesListView, SeriesView, SeriesEditView, SeriesAddView, SeriesDeleteView, EventView
+SeriesListView, SeriesView, SeriesEditView, SeriesAddView, SeriesDeleteView, EventView,
+EventOccurrenceView, EventOccurrenceEditView, EventCalendarFeedView, SeriesCalendarFeedView, EventAtomFeedView,
+CalendarMonthView, CalendarWeekView, calendar_today, EventSearchView,
 )
 
 
 urlpatterns = [
     path('', EventListView.as_view(), name='event_list'),
 
+    path('search/', EventSearchView.as_view(), name='event_search'),
+
+    # Calendar
+    path('calendar/', calendar_today, name='event_calendar'),
+    path('calendar/<int:year>/<int:month>/', CalendarMonthView.as_view(), name='event_calendar_month'),
+    path('calendar/<int:year>/week/<int:week>/', CalendarWeekView.as_view(), name='event_calendar_week'),
+
+    # Feeds
+    path('feed.ics', EventCalendarFeedView.as_view(), name='event_feed_ics'),
+    path('feed.atom', EventAtomFeedView.as_view(), name='event_feed_atom'),
+    path('series/<slug:slug>/feed.ics', SeriesCalendarFeedView.as_view(), name='series_feed_ics'),
+
+    # JSON API
+    path('api/v1/events/', EventApiView.as_view(), name='api_event_list'),
+    path('api/v1/series/', SeriesApiView.as_view(), name='api_series_list'),
+    path('api/v1/categories/', CategoryApiView.as_view(), name='api_category_list'),
+    path('api/v1/changes/', ChangesApiView.as_view(), name='api_changes'),
+
     # Event Management
     path('manage/', EventManageListView.as_view(), name='event_manage_list'),
     path('manage/add/', EventManageAddView.as_view(), name='event_manage_add'),
@@ -23,9 +44,11 @@ urlpatterns = [
     path('manage/series/<slug:slug>/', SeriesView.as_view(), name='series_detail'),
     path('manage/series/<slug:slug>/edit/', SeriesEditView.as_view(), name='series_edit'),
     path('manage/series/<slug:slug>/delete/', SeriesDeleteView.as_view(), name='series_delete'),
+    path('manage/series/<slug:slug>/<str:date>/edit/', EventOccurrenceEditView.as_view(), name='event_occurrence_edit'),
 
 
     path('<slug:slug>/', EventView.as_view(), name='event_detail'),
+    path('series/<slug:slug>/<str:date>/', EventOccurrenceView.as_view(), name='event_occurrence_detail'),
     path('manage/<slug:slug>/', EventManageDetailView.as_view(), name='event_manage_detail'),
 
     # Categories
@@ -1,21 +1,164 @@
 import calendar
-from datetime import date
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from dateutil.rrule import rrulestr
+from django.utils.text import slugify
+
+from .choices import Recurrence
+
+
+DEFAULT_TIMEZONE = "America/Denver"
+
+# The subset of EventSeries fields iter_occurrence_dates reads
+Schedule = namedtuple("Schedule", "recurrence weekday week_of_month start_date end_date")
+
 
 def nth_weekday_of_month(year, month, weekday, n):
     """
     weekday: 0=Mon ... 6=Sun
     n: 1=first, 2=second, 3=third, 4=fourth, 5=last
     """
-    cal = calendar.Calendar()
-    days = [
-        d for d in cal.itermonthdates(year, month)
-        if d.month == month and d.weekday() == weekday
-    ]
-
-    if not days:
-        return None
+    days_in_month = calendar.monthrange(year, month)[1]
 
     if n == 5:
-        return days[-1]
+        last = date(year, month, days_in_month)
+        return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+    day = 1 + (weekday - date(year, month, 1).weekday()) % 7 + 7 * (n - 1)
+    return date(year, month, day) if day <= days_in_month else None
+
+
+def iter_occurrence_dates(series, from_date, to_date):
+    """
+    Lazily yields the dates `series` occurs on between from_date and to_date
+    (inclusive), clipped to the series' start_date/end_date.
+
+    Dates are computed directly: weekly rules step 7 days from the first matching
+    weekday, biweekly rules step 14 days from the first occurrence on or after
+    series.start_date, and monthly rules use nth_weekday_of_month once per month.
+    """
+    if series.weekday is None:
+        return
+
+    from_date = max(from_date, series.start_date)
+    if series.end_date:
+        to_date = min(to_date, series.end_date)
+    if from_date > to_date:
+        return
+
+    if series.recurrence == Recurrence.REC_MONTHLY:
+        if series.week_of_month is None:
+            return
+
+        year, month = from_date.year, from_date.month
+        while date(year, month, 1) <= to_date:
+            day = nth_weekday_of_month(year, month, series.weekday, series.week_of_month)
+            if day and from_date <= day <= to_date:
+                yield day
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return
+
+    if series.recurrence == Recurrence.REC_BIWEEKLY:
+        step = 14
+        # Anchor on the first occurrence so the fortnight parity never depends on from_date
+        anchor = series.start_date + timedelta(days=(series.weekday - series.start_date.weekday()) % 7)
+        skipped = max(0, -(-(from_date - anchor).days // step))
+        current = anchor + timedelta(days=skipped * step)
+    else:
+        step = 7
+        current = from_date + timedelta(days=(series.weekday - from_date.weekday()) % 7)
+
+    while current <= to_date:
+        yield current
+        current += timedelta(days=step)
+
+
+def parse_rrule(rule, dtstart):
+    """
+    Parses an RFC 5545 rule (RRULE/RDATE/EXRULE/EXDATE lines, the "RRULE:" prefix
+    is optional) anchored at the naive wall-clock `dtstart`. Raises ValueError.
+    """
+    return rrulestr(rule.strip(), dtstart=dtstart, forceset=True)
+
 
-    return days[n - 1] if len(days) >= n else None
+def schedule_key(series):
+    """
+    Hashable description of everything that determines when `series` occurs.
+    """
+    if series.rrule:
+        rule = ("rrule", series.rrule.strip())
+    else:
+        rule = (series.recurrence, series.weekday, series.week_of_month)
+    return rule + (series.start_date, series.end_date, series.start_time, series.timezone)
+
+
+@lru_cache(maxsize=512)
+def expand_schedule(key, from_date, to_date):
+    """
+    Aware start datetimes for the schedule described by `key` (see schedule_key)
+    between from_date and to_date. Results are memoized per (schedule, window),
+    so repeated reads of the same series and window share one expansion.
+
+    Occurrences are expanded in wall-clock time and localized afterwards, so an
+    event at 18:00 stays at 18:00 on both sides of a DST change.
+    """
+    *rule, start_date, end_date, start_time, tzname = key
+    zone = ZoneInfo(tzname)
+
+    from_date = max(from_date, start_date)
+    if end_date:
+        to_date = min(to_date, end_date)
+    if from_date > to_date:
+        return ()
+
+    if rule[0] == "rrule":
+        ruleset = parse_rrule(rule[1], datetime.combine(start_date, start_time))
+        window = ruleset.between(
+            datetime.combine(from_date, time.min),
+            datetime.combine(to_date, time.max),
+            inc=True,
+        )
+        # The rule may carry its own BYHOUR/BYMINUTE, so keep each expanded time of day
+        return tuple(dt.replace(tzinfo=zone) for dt in window)
+
+    recurrence, weekday, week_of_month = rule
+    schedule = Schedule(recurrence, weekday, week_of_month, start_date, end_date)
+    return tuple(
+        datetime.combine(day, start_time, tzinfo=zone)
+        for day in iter_occurrence_dates(schedule, from_date, to_date)
+    )
+
+
+def occurrence_starts(series, from_date, to_date):
+    """
+    Aware start datetimes of `series` between from_date and to_date, in the
+    series' own time zone.
+    """
+    return expand_schedule(schedule_key(series), from_date, to_date)
+
+
+# Paths in events/urls.py matched before '<slug:slug>/'; an event slugged like
+# one of them could never be reached
+RESERVED_SLUGS = frozenset({"calendar", "manage", "search"})
+
+
+def slug_base(title):
+    return slugify(title)[:200] or "event"
+
+
+def free_slugs(base, taken, count):
+    """
+    Picks the first `count` slugs in the sequence base, base-2, base-3, ...
+    that are not in `taken`.
+    """
+    slugs = []
+    candidate, i = base, 2
+    while len(slugs) < count:
+        if candidate not in taken:
+            slugs.append(candidate)
+        candidate = f"{base}-{i}"
+        i += 1
+    return slugs
@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Prefetch
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy, reverse
 from django.utils import timezone
@@ -8,68 +13,109 @@ from django.views import View
 from django.views.generic import TemplateView, ListView, UpdateView, DeleteView, CreateView, View, DetailView
 from django_tables2 import SingleTableView
 
+from . import feeds
+from .choices import EventVisibility
+from .cache import EVENT_LIST_KEY, get_event, get_event_last_modified
 from .forms import EventCategoryForm, EventForm, EventSeriesForm
-from .models import Event, EventSeries, EventCategory
-from .services import generate_next_90_days, apply_series_defaults_to_future_events
+from .models import Event, EventSeries, EventCategory, SeriesException
+from .services import (
+    generate_next_90_days, apply_series_defaults_to_future_events, reschedule_future_events, virtual_occurrences_enabled,
+    occurrences_between, upcoming_window, find_occurrence, materialize_occurrence, series_with_next_event,
+    delete_series, calendar_grid, calendar_month, SERIES_DEFAULT_FIELDS, SERIES_SCHEDULE_FIELDS,
+)
 from .tables import EventTable, EventCategoryTable, EventSeriesTable
-from extras.mixins import PageMetaMixin, NextUrlMixin
+from extras.mixins import (
+    PageMetaMixin, NextUrlMixin, KeysetPaginationMixin, PageCacheMixin, ConditionalGetMixin, SurrogateKeyMixin,
+)
 
 
 #
 # Event List Public View
 #
 
-class EventListView(PageMetaMixin, ListView):
+class EventListView(SurrogateKeyMixin, ConditionalGetMixin, PageCacheMixin, PageMetaMixin, KeysetPaginationMixin, ListView):
     model = Event
     template_name = 'events/event_list.html'
     is_current = 'event'
     page_title = 'Community Events'
     context_object_name = 'single_events'
     paginate_by = 2
+    keyset = ("start", "pk")
+    paginate_count = False
+    # Every event, series, category and image change purges this key
+    surrogate_keys = (EVENT_LIST_KEY,)
 
     def get_queryset(self):
-        # One-time events (no series), upcoming
+        # One-time events (no series), upcoming; only what the cards render
         return (
             Event.objects
-            .filter(series__isnull=True, start__gte=timezone.now())
-            .order_by("start")
+            .standalone_upcoming()
+            .select_related("image", "category")
+            .defer("content")
         )
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-
-        upcoming_series_events = (
-            Event.objects
-            .filter(start__gte=timezone.now())
-            .order_by("start")
+    def get_conditional_validators(self):
+        # The page shows upcoming events only, so it can change with time alone:
+        # no Last-Modified, and the ETag covers which rows are upcoming
+        now = timezone.now()
+        events = Event.objects.standalone_upcoming(now).order_by().aggregate(
+            count=Count("pk"),
+            first=Min("start"),
+            updated=Max("updated_at"),
+            category=Max("category__updated_at"),
+            image=Max("image__updated_at"),
         )
-
-        series_qs = (
-            EventSeries.objects
-            .filter(is_active=True)
-            .prefetch_related(
-                Prefetch("events", queryset=upcoming_series_events, to_attr="upcoming_events")
-            )
-            .order_by("title")
+        series = EventSeries.objects.filter(is_active=True).aggregate(
+            updated=Max("updated_at"),
+            pointers=Sum("next_event_id"),
+            first=Min("next_start"),
+            event=Max("next_event__updated_at"),
+            image=Max("next_event__image__updated_at"),
         )
+        parts = [sorted(events.items()), sorted(series.items())]
+        if virtual_occurrences_enabled():
+            parts.append(timezone.localdate(now))
+        return None, parts
 
-        # Build a list of (series, next_event) pairs
-        recurring_next = []
-        for series in series_qs:
-            next_event = series.upcoming_events[0] if series.upcoming_events else None
-            if next_event:
-                recurring_next.append((series, next_event))
-
-        context["recurring_next"] = recurring_next
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # (series, next_event) pairs from the pointer maintained on each series
+        context["recurring_next"] = series_with_next_event()
         return context
 
 
-class EventView(PageMetaMixin, DetailView):
+class EventView(SurrogateKeyMixin, ConditionalGetMixin, PageCacheMixin, PageMetaMixin, DetailView):
     model = Event
     template_name = 'events/event_detail.html'
     context_object_name = 'event'
     is_current = 'events'
 
+    def get_conditional_validators(self):
+        last_modified = get_event_last_modified(self.kwargs["slug"])
+        if last_modified is None:
+            return None
+        return last_modified, ()
+
+    def get_surrogate_keys(self):
+        # The page renders the event, its series, category and image
+        event = get_event(self.kwargs["slug"])
+        if event is None:
+            return super().get_surrogate_keys()
+        return [
+            *super().get_surrogate_keys(),
+            f"event:{event.pk}",
+            f"series:{event.series_id}" if event.series_id else None,
+            f"category:{event.category_id}" if event.category_id else None,
+            f"image:{event.image_id}" if event.image_id else None,
+        ]
+
+    def get_object(self, queryset=None):
+        # Fully loaded from the per-slug cache; see events.cache
+        event = get_event(self.kwargs["slug"])
+        if event is None:
+            raise Http404("No event found matching the query.")
+        return event
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = self.object.title
@@ -79,6 +125,326 @@ class EventView(PageMetaMixin, DetailView):
         ]
         return context
 
+class EventOccurrenceView(EventView):
+    """
+    Public page for one occurrence of a series, addressed by series slug and
+    local date. Stored occurrences redirect to their canonical event page.
+    """
+
+    def get_conditional_validators(self):
+        # Computed occurrences have no row of their own to validate against
+        return None
+
+    def get_surrogate_keys(self):
+        # Saving any event purges EVENT_LIST_KEY, which covers this date being materialized
+        row = (
+            EventSeries.objects
+            .filter(slug=self.kwargs["slug"])
+            .values_list("pk", "category_id", "image_id")
+            .first()
+        )
+        keys = [*super(EventView, self).get_surrogate_keys(), EVENT_LIST_KEY]
+        if row is None:
+            return keys
+        series_id, category_id, image_id = row
+        return [
+            *keys,
+            f"series:{series_id}",
+            f"category:{category_id}" if category_id else None,
+            f"image:{image_id}" if image_id else None,
+        ]
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if self.object.pk:
+            return redirect(self.object.get_absolute_url())
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    def get_object(self, queryset=None):
+        series = get_object_or_404(
+            EventSeries.objects.select_related("image", "category"),
+            slug=self.kwargs["slug"],
+            is_active=True,
+            visibility=EventVisibility.VIS_PUBLIC,
+        )
+        occurrence = find_occurrence(series, parse_occurrence_date(self.kwargs["date"]))
+        if occurrence is None:
+            raise Http404("No occurrence on that date.")
+        return occurrence
+
+
+#
+# Feeds
+#
+
+def feed_past_days():
+    return getattr(settings, "EVENTS_FEED_PAST_DAYS", 30)
+
+
+class EventCalendarFeedView(SurrogateKeyMixin, ConditionalGetMixin, View):
+    """
+    iCalendar feed of every public event: one recurring VEVENT (RRULE/EXDATE)
+    per series plus the one-time and individually edited events, streamed.
+    """
+    calendar_name = "Community Events"
+    filename = "events.ics"
+    surrogate_keys = (EVENT_LIST_KEY,)
+
+    def get_since(self):
+        # Past events drop out of the feed at local midnight
+        today = timezone.localdate()
+        return timezone.make_aware(datetime.combine(today - timedelta(days=feed_past_days()), time.min))
+
+    def get_events(self):
+        return feeds.calendar_events(self.get_since())
+
+    def get_series(self):
+        return feeds.calendar_series()
+
+    def get_conditional_validators(self):
+        series = self.get_series()
+        rows = [
+            self.get_events().order_by().aggregate(
+                count=Count("pk"), updated=Max("updated_at"), category=Max("category__updated_at"),
+            ),
+            series.order_by().aggregate(
+                count=Count("pk"), updated=Max("updated_at"), category=Max("category__updated_at"),
+            ),
+            SeriesException.objects.filter(series__in=series.values("pk")).order_by().aggregate(
+                count=Count("pk"), updated=Max("updated_at"),
+            ),
+        ]
+        # The window moves daily, so the feed last changed no earlier than midnight
+        midnight = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        last_modified = max([midnight, *(row["updated"] for row in rows if row["updated"])])
+        return last_modified, [sorted(row.items()) for row in rows]
+
+    def get(self, request, *args, **kwargs):
+        stream = feeds.calendar_stream(
+            self.calendar_name, self.get_events(), self.get_series(), request.build_absolute_uri, request.get_host(),
+        )
+        response = StreamingHttpResponse(stream, content_type="text/calendar; charset=utf-8")
+        response["Content-Disposition"] = f'inline; filename="{self.filename}"'
+        return response
+
+
+class SeriesCalendarFeedView(EventCalendarFeedView):
+    """
+    iCalendar feed of one public series and its individually edited occurrences.
+    """
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        self.series = (
+            EventSeries.objects
+            .filter(slug=self.kwargs["slug"], is_active=True, visibility=EventVisibility.VIS_PUBLIC)
+            .only("pk", "title", "slug")
+            .first()
+        )
+        if self.series is not None:
+            self.calendar_name = self.series.title
+            self.filename = f"{self.series.slug}.ics"
+
+    def get_surrogate_keys(self):
+        keys = super().get_surrogate_keys()
+        return [*keys, f"series:{self.series.pk}"] if self.series else keys
+
+    def get_events(self):
+        return super().get_events().filter(series=self.series)
+
+    def get_series(self):
+        return super().get_series().filter(pk=self.series.pk)
+
+    def get_conditional_validators(self):
+        if self.series is None:
+            return None
+        return super().get_conditional_validators()
+
+    def get(self, request, *args, **kwargs):
+        if self.series is None:
+            raise Http404("No series found matching the query.")
+        return super().get(request, *args, **kwargs)
+
+
+class EventAtomFeedView(SurrogateKeyMixin, ConditionalGetMixin, View):
+    """
+    Atom feed of the next upcoming public events, soonest first, streamed.
+    """
+    title = "Community Events"
+    surrogate_keys = (EVENT_LIST_KEY,)
+
+    def get_events(self):
+        return Event.objects.public_upcoming().select_related("category").defer("content")[:feeds.ATOM_ENTRIES]
+
+    def get_conditional_validators(self):
+        # Upcoming only, so time alone changes the feed: ETag, no Last-Modified
+        now = timezone.now()
+        events = Event.objects.public_upcoming(now).order_by().aggregate(
+            count=Count("pk"),
+            first=Min("start"),
+            updated=Max("updated_at"),
+            category=Max("category__updated_at"),
+        )
+        self.updated = events["updated"] or now
+        return None, [sorted(events.items())]
+
+    def get(self, request, *args, **kwargs):
+        if not hasattr(self, "updated"):
+            self.get_conditional_validators()
+        stream = feeds.atom_stream(
+            self.title,
+            self.get_events(),
+            self.updated,
+            request.build_absolute_uri(),
+            request.build_absolute_uri(reverse("event_list")),
+            request.build_absolute_uri,
+            request.get_host(),
+        )
+        return StreamingHttpResponse(stream, content_type="application/atom+xml; charset=utf-8")
+
+
+#
+# Search
+#
+
+class EventSearchView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, ListView):
+    """
+    Public full-text search (?q=) over published public events, best match
+    first; see events.search.
+    """
+    template_name = 'events/event_search.html'
+    context_object_name = 'results'
+    is_current = 'event'
+    page_title = 'Search Events'
+    paginate_by = 20
+    surrogate_keys = (EVENT_LIST_KEY,)
+
+    def get_query(self):
+        return self.request.GET.get("q", "").strip()[:200]
+
+    def get_queryset(self):
+        return (
+            Event.objects
+            .public_between(None, None)
+            .search(self.get_query())
+            .select_related("category")
+            .defer("content")
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["query"] = self.get_query()
+        return context
+
+
+#
+# Calendar
+#
+
+def calendar_today(request):
+    today = timezone.localdate()
+    return redirect("event_calendar_month", year=today.year, month=today.month)
+
+
+def calendar_day(day, days):
+    return {"date": day, "events": days.get(day.isoformat(), [])}
+
+
+class CalendarMonthView(SurrogateKeyMixin, PageCacheMixin, PageMetaMixin, TemplateView):
+    """
+    Month grid of public events, Sunday first. The day buckets for the month
+    come from services.calendar_month: one query on a miss, cached after.
+    """
+    template_name = 'events/calendar_month.html'
+    is_current = 'event'
+    surrogate_keys = (EVENT_LIST_KEY,)
+
+    def setup(self, request, *args, **kwargs):
+        super().setup(request, *args, **kwargs)
+        try:
+            self.month = date(self.kwargs["year"], self.kwargs["month"], 1)
+        except ValueError:
+            self.month = None
+
+    def get_page_title(self):
+        return f"Events in {self.month:%B %Y}"
+
+    def get_breadcrumbs(self):
+        return [
+            {"label": "Community Events", "url": reverse("event_list")},
+            {"label": f"{self.month:%B %Y}", "url": None},
+        ]
+
+    def get(self, request, *args, **kwargs):
+        if self.month is None or self.month.year in (date.min.year, date.max.year):
+            raise Http404("No such month.")
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        days = calendar_month(self.month.year, self.month.month)
+        previous = self.month - timedelta(days=1)
+        following = self.month + timedelta(days=31)
+        context.update({
+            "month": self.month,
+            "weeks": [[calendar_day(day, days) for day in week] for week in calendar_grid(self.month.year, self.month.month)],
+            "today": timezone.localdate(),
+            "previous_url": reverse("event_calendar_month", args=[previous.year, previous.month]),
+            "next_url": reverse("event_calendar_month", args=[following.year, following.month]),
+        })
+        return context
+
+
+class CalendarWeekView(CalendarMonthView):
+    """
+    One ISO week (Monday to Sunday), read from the cached month buckets of
+    the one or two months it falls in.
+    """
+    template_name = 'events/calendar_week.html'
+
+    def setup(self, request, *args, **kwargs):
+        super(CalendarMonthView, self).setup(request, *args, **kwargs)
+        try:
+            self.monday = date.fromisocalendar(self.kwargs["year"], self.kwargs["week"], 1)
+        except ValueError:
+            self.month = None
+        else:
+            self.month = self.monday.replace(day=1)
+
+    def get_page_title(self):
+        return f"Events for the week of {self.monday:%B} {self.monday.day}, {self.monday.year}"
+
+    def get_breadcrumbs(self):
+        return [
+            {"label": "Community Events", "url": reverse("event_list")},
+            {"label": f"{self.month:%B %Y}", "url": reverse("event_calendar_month", args=[self.month.year, self.month.month])},
+            {"label": f"Week {self.kwargs['week']}", "url": None},
+        ]
+
+    def get_context_data(self, **kwargs):
+        context = super(CalendarMonthView, self).get_context_data(**kwargs)
+        week = [self.monday + timedelta(days=i) for i in range(7)]
+        months = {(day.year, day.month): calendar_month(day.year, day.month) for day in week}
+        previous = (self.monday - timedelta(days=7)).isocalendar()
+        following = (self.monday + timedelta(days=7)).isocalendar()
+        context.update({
+            "month": self.month,
+            "days": [calendar_day(day, months[(day.year, day.month)]) for day in week],
+            "today": timezone.localdate(),
+            "previous_url": reverse("event_calendar_week", args=[previous.year, previous.week]),
+            "next_url": reverse("event_calendar_week", args=[following.year, following.week]),
+        })
+        return context
+
+
+def parse_occurrence_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise Http404("Invalid occurrence date.")
+
+
 #
 # Categories
 #
@@ -179,13 +545,14 @@ class CategoryDeleteView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, Delet
 # Event Management
 #
 
-class EventManageListView(PageMetaMixin, SingleTableView):
+class EventManageListView(PageMetaMixin, KeysetPaginationMixin, SingleTableView):
     model = Event
     table_class = EventTable
     template_name = "events/event_manage_list.html"
     is_current = "events"
     page_title = "Manage Events"
     paginate_by = 25
+    keyset = ("start", "pk")
 
     def get_queryset(self):
         qs = (
@@ -197,6 +564,22 @@ class EventManageListView(PageMetaMixin, SingleTableView):
         # Change ordering if you prefer newest created first instead
         return qs.order_by("start")
 
+    def keyset_enabled(self):
+        # Virtual occurrences are merged into the table in memory and paged by the table itself
+        return not virtual_occurrences_enabled()
+
+    def get_table_data(self):
+        if not virtual_occurrences_enabled():
+            return super().get_table_data()
+
+        # Stored rows plus the computed occurrences of the upcoming window
+        from_dt, to_dt = upcoming_window()
+        qs = self.get_queryset()
+        return sorted(
+            list(qs.exclude(start__gte=from_dt, start__lt=to_dt)) + occurrences_between(from_dt, to_dt, events=qs),
+            key=lambda e: e.start,
+        )
+
 
 class EventManageDetailView(PageMetaMixin, DetailView):
     model = Event
@@ -261,6 +644,52 @@ class EventManageEditView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, Upda
         return context
 
 
+
+class EventOccurrenceEditView(EventManageEditView):
+    """
+    Edit form for one series occurrence, addressed by series slug and local
+    date. Stored occurrences redirect to their own edit page. A computed one is
+    only stored when the form is submitted, so merely following the link (or a
+    prefetcher doing so) writes nothing, and it becomes an override only if the
+    submission changed something.
+    """
+
+    def get_object(self, queryset=None):
+        series = get_object_or_404(EventSeries.objects.select_related("image", "category"), slug=self.kwargs["slug"])
+        occurrence = find_occurrence(series, parse_occurrence_date(self.kwargs["date"]))
+        if occurrence is None:
+            raise Http404("No occurrence on that date.")
+        return occurrence
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        if self.object.pk:
+            return redirect("event_manage_edit", slug=self.object.slug)
+        return self.render_to_response(self.get_context_data())
+
+    def post(self, request, *args, **kwargs):
+        occurrence = self.get_object()
+        if occurrence.pk:
+            return redirect("event_manage_edit", slug=occurrence.slug)
+
+        with transaction.atomic():
+            self.object = materialize_occurrence(occurrence.series, occurrence.start)
+            form = self.get_form()
+            if form.is_valid():
+                return self.form_valid(form)
+            # A rejected submission leaves the occurrence computed
+            transaction.set_rollback(True)
+        self.object = occurrence
+        return self.form_invalid(form)
+
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        if "data" in kwargs and self.object.pk and not kwargs["data"].get("slug"):
+            # The form was rendered before the occurrence had a slug of its own
+            kwargs["data"] = kwargs["data"].copy()
+            kwargs["data"]["slug"] = self.object.slug
+        return kwargs
+
 class EventManageDeleteView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, DeleteView):
     model = Event
     template_name = "events/event_manage_confirm_delete.html"
@@ -284,11 +713,12 @@ class EventManageDeleteView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, De
 # Event Series
 #
 
-class SeriesListView(PageMetaMixin, SingleTableView):
+class SeriesListView(PageMetaMixin, KeysetPaginationMixin, SingleTableView):
     model = EventSeries
     table_class = EventSeriesTable
     template_name = "events/event_series_list.html"
     paginate_by = 25
+    keyset = ("title", "pk")
     is_current = 'events'
     page_title = 'Manage Event Series'
 
@@ -297,13 +727,24 @@ class SeriesListView(PageMetaMixin, SingleTableView):
         return qs.order_by("title")
 
 
-class SeriesView(PageMetaMixin, DetailView):
+class SeriesView(ConditionalGetMixin, PageMetaMixin, DetailView):
     model = EventSeries
     template_name = "events/series_detail.html"
     context_object_name = "series"
     is_current = 'events'
     page_title = 'Edit Event Series'
 
+    def get_conditional_validators(self):
+        row = (
+            EventSeries.objects
+            .filter(slug=self.kwargs["slug"])
+            .values_list("updated_at", "category__updated_at", "image__updated_at")
+            .first()
+        )
+        if row is None:
+            return None
+        return max(value for value in row if value is not None), ()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = self.object.title
@@ -334,8 +775,11 @@ class SeriesAddView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, CreateView
 
     def form_valid(self, form):
         response = super().form_valid(form)
-        generate_next_90_days(self.object, days=90)
-        messages.success(self.request, "Series created and events generated for the next 90 days.")
+        if virtual_occurrences_enabled():
+            messages.success(self.request, "Series created.")
+        else:
+            generate_next_90_days(self.object, days=90)
+            messages.success(self.request, "Series created and events generated for the next 90 days.")
         return response
 
 
@@ -358,10 +802,16 @@ class SeriesEditView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, UpdateVie
         return context
 
     def form_valid(self, form):
+        # The form has already applied its data to self.object; compare with the loaded row.
+        # The image is only set inside form.save(), so it is compared afterwards.
+        changed = self.object.changed_fields()
         old_image_id = self.object.image_id
         response = super().form_valid(form)
         sync_image = old_image_id != self.object.image_id
-        apply_series_defaults_to_future_events(self.object, sync_image=sync_image)
+        if sync_image or changed & SERIES_DEFAULT_FIELDS:
+            apply_series_defaults_to_future_events(self.object, sync_image=sync_image)
+        if changed & SERIES_SCHEDULE_FIELDS:
+            reschedule_future_events(self.object)
         messages.success(self.request, "Series updated and future events were synced.")
 
         return response
@@ -376,6 +826,13 @@ class SeriesDeleteView(SuccessMessageMixin, NextUrlMixin, PageMetaMixin, DeleteV
     default_success_url_name = "series_list"
     success_message = 'Event series was deleted successfully.'
 
+    def form_valid(self, form):
+        # Batched raw deletes instead of the collector loading every occurrence
+        success_url = self.get_success_url()
+        delete_series(self.object)
+        messages.success(self.request, self.get_success_message(form.cleaned_data))
+        return redirect(success_url)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['page_title'] = self.page_title
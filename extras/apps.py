@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ExtrasConfig(AppConfig):
     name = 'extras'
+
+    def ready(self):
+        from . import checks
@@ -0,0 +1,64 @@
+# extras/cache.py
+import time
+
+from django.core.cache import cache
+
+LOCK_TIMEOUT = 10    # seconds a rebuild may hold its lock
+LOCK_WAIT = 2        # seconds other requests wait for that rebuild
+LOCK_POLL = 0.05
+
+
+def get_version(name):
+    """
+    Current version of the cache namespace `name`. Keys built with it are
+    invalidated all at once by bump_version(name).
+    """
+    key = f"version:{name}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_version(name):
+    """
+    Invalidates every key built with the current version of `name`.
+    """
+    key = f"version:{name}"
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+        return cache.incr(key)
+
+
+def read_through(key, loader, timeout):
+    """
+    Returns the cached value for `key`, calling loader() to fill it on a miss.
+
+    Only one process rebuilds a missing key at a time: it takes a short lock
+    with an atomic cache.add, while the others poll for its result for up to
+    LOCK_WAIT seconds before loading for themselves. loader() must not return
+    None (None means "not cached").
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock = f"{key}:lock"
+    if cache.add(lock, 1, LOCK_TIMEOUT):
+        try:
+            value = loader()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return loader()
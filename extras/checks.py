@@ -0,0 +1,28 @@
+# extras/checks.py
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Backends that keep entries inside one process
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    The page cache, cache versions and calendar buckets are invalidated by
+    whichever process handles the write, so every worker must read the same
+    cache. A process-local backend would keep serving stale pages elsewhere.
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Error(
+            f"The default cache ({backend}) is not shared between processes.",
+            hint="Set CACHE_URL to a Redis server, or CACHE_DIR for a file-based cache.",
+            id="extras.E001",
+        )
+    ]
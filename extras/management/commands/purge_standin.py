@@ -0,0 +1,57 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+def make_server(host, port, on_purge):
+    """
+    HTTP server accepting HTTPPurgeClient requests; calls on_purge(tags) for
+    each one. Port 0 picks a free port (server.server_port).
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                tags = json.loads(self.rfile.read(length))["tags"]
+            except (ValueError, KeyError, TypeError):
+                self.send_response(400)
+                self.end_headers()
+                return
+            on_purge(tags)
+            body = json.dumps({"success": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs a stand-in CDN purge endpoint that logs the surrogate keys it is sent. "
+        "Point PURGE_URL at it with PURGE_CLIENT=extras.purge.HTTPPurgeClient."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8787)
+
+    def handle(self, *args, **options):
+        def log_purge(tags):
+            self.stdout.write(self.style.SUCCESS(f"Purged {len(tags)} keys: ") + " ".join(tags))
+
+        server = make_server(options["host"], options["port"], log_purge)
+        self.stdout.write(f"Purge stand-in listening on http://{options['host']}:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
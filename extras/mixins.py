@@ -1,6 +1,21 @@
+import copy
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from django.urls import reverse
 from django.utils.http import url_has_allowed_host_and_scheme
 
+from . import page_cache
+from .cache import get_version
+from .models import SiteSettings
+from .pagination import InvalidPageToken, KeysetPaginator
+from .purge import SITE_SETTINGS_KEY
+
 
 class NextUrlMixin:
     """
@@ -81,3 +96,225 @@ class PageMetaMixin:
         ctx["is_current"] = self.get_is_current()
         ctx["breadcrumbs"] = self.get_breadcrumbs()
         return ctx
+
+
+class KeysetPaginationMixin:
+    """
+    Seek pagination for ListView and django-tables2 SingleTableView: pages are
+    addressed by an opaque ?cursor= token instead of ?page=N, so deep pages
+    cost the same as the first one.
+
+    Usage:
+    - Add to CBV inheritance (before ListView / SingleTableView)
+    - Set `keyset` to the ordering, ending in a unique key, e.g. ("start", "pk")
+    - Set `paginate_count = False` to skip the COUNT(*) on every page view
+
+    Tables are rendered without their own pagination or column sorting, and the
+    context gains `page_obj`, `next_page_url` and `previous_page_url` for
+    "inc/keyset_pager.html".
+    """
+
+    keyset = None  # e.g. ("start", "pk")
+    paginate_count = True
+    page_token_param = "cursor"
+
+    def keyset_enabled(self):
+        return self.keyset is not None
+
+    def get_keyset_page(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size, self.keyset, count_total=self.paginate_count)
+        try:
+            return paginator.page(self.request.GET.get(self.page_token_param))
+        except InvalidPageToken as e:
+            raise Http404(str(e))
+
+    def get_page_url(self, token):
+        if token is None:
+            return None
+        params = self.request.GET.copy()
+        params[self.page_token_param] = token
+        params.pop("page", None)
+        return f"?{params.urlencode()}"
+
+    # ListView
+    def paginate_queryset(self, queryset, page_size):
+        if not self.keyset_enabled():
+            return super().paginate_queryset(queryset, page_size)
+        self.keyset_page = self.get_keyset_page(queryset, page_size)
+        return self.keyset_page.paginator, self.keyset_page, self.keyset_page.object_list, self.keyset_page.has_other_pages()
+
+    # SingleTableView
+    def get_table_data(self):
+        if not self.keyset_enabled():
+            return super().get_table_data()
+        # ListView.get_context_data has usually paginated object_list already
+        if getattr(self, "keyset_page", None) is None:
+            self.keyset_page = self.get_keyset_page(self.get_queryset(), self.get_paginate_by(None))
+        return self.keyset_page.object_list
+
+    def get_table_pagination(self, table):
+        if self.keyset_enabled():
+            return False
+        return super().get_table_pagination(table)
+
+    def get_table_kwargs(self):
+        kwargs = super().get_table_kwargs()
+        if self.keyset_enabled():
+            kwargs["orderable"] = False
+        return kwargs
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = getattr(self, "keyset_page", None)
+        if page is not None:
+            context["page_obj"] = page
+            context["next_page_url"] = self.get_page_url(page.next_page_token)
+            context["previous_page_url"] = self.get_page_url(page.previous_page_token)
+        return context
+
+
+class PageCacheMixin:
+    """
+    Full-page cache for anonymous visitors (see extras.page_cache).
+
+    Pages are keyed on host, path and query string and stored with the content
+    version they were rendered at, in identity, gzip and (when installed)
+    brotli encodings. A page past PAGE_CACHE_TIMEOUT, or rendered before the
+    last version bump, is still served while one background worker re-renders
+    it. Logged-in users, non-GET requests and requests with pending messages
+    bypass the cache entirely.
+
+    Usage:
+    - Add to CBV inheritance (first, so it wraps the whole view)
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if not page_cache.is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = page_cache.page_cache_key(request)
+        version = get_version(page_cache.PAGE_CACHE_NAMESPACE)
+        entry = cache.get(key)
+
+        if entry is not None:
+            if page_cache.is_fresh(entry, version):
+                return page_cache.entry_response(request, entry, "hit")
+            page_cache.revalidate(key, self.background_renderer(request, args, kwargs), version)
+            return page_cache.entry_response(request, entry, "stale")
+
+        response = self.render_page(request, *args, **kwargs)
+        if page_cache.is_cacheable_response(request, response):
+            page_cache.store(key, response, version)
+        return response
+
+    def render_page(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, "render") and not response.is_rendered:
+            response.render()
+        return response
+
+    def background_renderer(self, request, args, kwargs):
+        """
+        Callable that renders this page again on a copy of the view and
+        request, so the background thread shares no state with this one.
+        """
+        background_request = copy.copy(request)
+        background_request.method = "GET"
+        background_request.META = dict(request.META)
+
+        def render():
+            view = copy.copy(self)
+            view.setup(background_request, *args, **kwargs)
+            response = view.render_page(background_request, *args, **kwargs)
+            if page_cache.is_cacheable_response(background_request, response):
+                return response
+            return None
+
+        return render
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support driven by TimeStampedModel.updated_at.
+
+    Views implement get_conditional_validators() with a cheap query (or a
+    cached lookup) returning `(last_modified, parts)`: the latest updated_at
+    the page depends on (or None when time alone can change the page, e.g.
+    "upcoming" listings) and any other values that change it. The ETag hashes
+    those together with the path, the viewer and the site settings version.
+    Matching If-None-Match / If-Modified-Since requests get a 304 before the
+    view loads anything else or renders its template.
+
+    Usage:
+    - Add to CBV inheritance, before PageCacheMixin
+    - Implement get_conditional_validators(); returning None skips validation
+    """
+
+    def get_conditional_validators(self):
+        return None
+
+    def get_etag(self, last_modified, parts):
+        user = self.request.user
+        key = repr([
+            self.request.get_full_path(),
+            user.pk if user.is_authenticated else None,
+            SiteSettings.version(),
+            last_modified.isoformat() if last_modified else None,
+            *parts,
+        ])
+        return '"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+    def dispatch(self, request, *args, **kwargs):
+        # A 304 would swallow pending messages
+        if request.method not in ("GET", "HEAD") or len(get_messages(request)):
+            return super().dispatch(request, *args, **kwargs)
+
+        validators = self.get_conditional_validators()
+        if validators is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        last_modified, parts = validators
+        etag = self.get_etag(last_modified, parts)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            # A stale page-cache copy must not be labelled with the current validators
+            if response.status_code == 200 and response.get("X-Page-Cache") != "stale":
+                response.headers.setdefault("ETag", etag)
+                if timestamp is not None:
+                    response.headers.setdefault("Last-Modified", http_date(timestamp))
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+
+class SurrogateKeyMixin:
+    """
+    Tags responses with the surrogate keys (CDN cache tags) of the objects
+    they render, so a save can purge exactly those pages from the edge
+    (see extras.purge). Every page is tagged "site-settings" as well.
+
+    Anonymous responses also get Surrogate-Control for EDGE_CACHE_TIMEOUT
+    seconds; the CDN strips it, browsers keep revalidating via ETag.
+
+    Usage:
+    - Add to CBV inheritance (first, so it tags cached and 304 responses too)
+    - Set `surrogate_keys` or override get_surrogate_keys()
+    """
+
+    surrogate_keys = ()
+
+    def get_surrogate_keys(self):
+        return [SITE_SETTINGS_KEY, *self.surrogate_keys]
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            keys = list(dict.fromkeys(key for key in self.get_surrogate_keys() if key))
+            response["Surrogate-Key"] = " ".join(keys)
+            response["Cache-Tag"] = ",".join(keys)
+            timeout = getattr(settings, "EDGE_CACHE_TIMEOUT", 0)
+            if timeout and not request.user.is_authenticated:
+                response["Surrogate-Control"] = f"max-age={timeout}"
+        return response
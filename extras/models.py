@@ -9,6 +9,9 @@ from django.db import models
 from django.utils import timezone
 
 from .utils import image_upload, ALLOWED_IMAGE_EXTENSIONS, validate_landscape_image, process_image_to_jpeg
+from .cache import bump_version, get_version
+from .page_cache import invalidate_pages
+from .purge import SITE_SETTINGS_KEY, purge_after_commit
 
 
 ALLOWED_IMAGE_EXTENSIONS = ["jpg", "jpeg", "png", "webp"]
@@ -32,8 +35,86 @@ class TimeStampedModel(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_loaded_values()
+        return instance
+
+    def _snapshot_loaded_values(self):
+        # Deferred fields are not in __dict__ and are left out of the snapshot
+        self._loaded_values = {
+            f.attname: self.__dict__[f.attname]
+            for f in self._meta.concrete_fields
+            if f.attname in self.__dict__
+        }
+
+    def get_loaded_value(self, attname, default=None):
+        """
+        The value `attname` had when the row was loaded (or last saved).
+        """
+        return getattr(self, "_loaded_values", {}).get(attname, default)
+
+    def changed_fields(self):
+        """
+        Names of the concrete fields whose value differs from the loaded row.
+        Every field counts as changed on instances that were never loaded or saved.
+        """
+        loaded = getattr(self, "_loaded_values", None)
+        changed = set()
+        for f in self._meta.concrete_fields:
+            if loaded is None:
+                changed.add(f.name)
+            elif f.attname in self.__dict__ and (
+                f.attname not in loaded or loaded[f.attname] != self.__dict__[f.attname]
+            ):
+                changed.add(f.name)
+        return changed
+
+    def save(self, *args, **kwargs):
+        """
+        Narrows UPDATEs to the columns that actually changed (plus updated_at)
+        when the caller did not pass update_fields. Saving an unchanged row
+        writes nothing.
+        """
+        narrow = (
+            not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and not self._state.adding
+            and hasattr(self, "_loaded_values")
+        )
+        if narrow:
+            changed = self.changed_fields()
+            if self._meta.pk.name not in changed:
+                kwargs["update_fields"] = changed | {"updated_at"} if changed else []
+
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not hasattr(self, "_loaded_values"):
+            self._snapshot_loaded_values()
+        else:
+            self._update_loaded_values(update_fields)
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if fields is None or not hasattr(self, "_loaded_values"):
+            self._snapshot_loaded_values()
+        else:
+            self._update_loaded_values(fields)
+
+    def _update_loaded_values(self, fields):
+        fields = set(fields)
+        for f in self._meta.concrete_fields:
+            if (f.name in fields or f.attname in fields) and f.attname in self.__dict__:
+                self._loaded_values[f.attname] = self.__dict__[f.attname]
+
 
 # --- Site-wide settings (singleton) ---
+SITE_SETTINGS_NAMESPACE = "site-settings"
+
+
 class SiteSettings(models.Model):
     site_name = models.CharField(max_length=120, default="Allied Angels")
     tagline = models.CharField(max_length=200, blank=True)
@@ -59,6 +140,9 @@ class SiteSettings(models.Model):
     #logo_dark  = models.ImageField(upload_to="branding/", blank=True, null=True)
     #favicon    = models.ImageField(upload_to="branding/", blank=True, null=True)
 
+    # Watermark for static exports (see core's export_static_site command)
+    updated_at = models.DateTimeField(auto_now=True, blank=True, null=True)
+
     class Meta:
         verbose_name = "Site settings"
         verbose_name_plural = "Site settings"
@@ -79,16 +163,29 @@ class SiteSettings(models.Model):
             cache.set(key, obj, 60)  # cache for 60s; bump if you like
         return obj
 
+    @classmethod
+    def version(cls):
+        """
+        Changes on every save; part of every page's ETag (see ConditionalGetMixin).
+        """
+        return get_version(SITE_SETTINGS_NAMESPACE)
+
     def save(self, *args, **kwargs):
         self.pk = 1  # force singleton
         super().save(*args, **kwargs)
         cache.delete("site_settings_singleton")
+        # Every page renders site settings (footer, contact details)
+        bump_version(SITE_SETTINGS_NAMESPACE)
+        invalidate_pages()
+        purge_after_commit(SITE_SETTINGS_KEY)
 
 
 class ImageAttachment(TimeStampedModel):
     """
     Reusable image attached to ANY model via GenericForeignKey.
     """
+    surrogate_key_prefix = "image"
+
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField()
     parent = GenericForeignKey("content_type", "object_id")
@@ -159,3 +256,16 @@ class ImageAttachment(TimeStampedModel):
         True if nothing references this ImageAttachment anymore.
         """
         return (not self.event.exists()) and (not self.event_series.exists())
+
+    @classmethod
+    def delete_orphans(cls, ids):
+        """
+        Deletes (files included) the attachments among `ids` that nothing references,
+        with one query to find them. Returns how many were deleted.
+        """
+        orphans = cls.objects.filter(pk__in=ids, event__isnull=True, event_series__isnull=True)
+        count = 0
+        for img in orphans:
+            img.delete()
+            count += 1
+        return count
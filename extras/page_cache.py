@@ -0,0 +1,144 @@
+# extras/page_cache.py
+import gzip
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .cache import bump_version
+
+try:
+    import brotli
+except ImportError:  # optional; gzip and identity variants are always stored
+    brotli = None
+
+PAGE_CACHE_NAMESPACE = "pages"
+
+# Headers worth replaying from the rendered response
+STORED_HEADERS = ("Content-Type", "Content-Language", "X-Robots-Tag")
+
+
+def page_cache_timeout():
+    """
+    Seconds a cached page is served as fresh; 0 turns the page cache off.
+    """
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 5 * 60)
+
+
+def page_cache_stale_timeout():
+    """
+    Seconds past freshness (or past a version bump) a page may still be served
+    while it is re-rendered in the background.
+    """
+    return getattr(settings, "PAGE_CACHE_STALE_TIMEOUT", 60 * 60)
+
+
+def invalidate_pages():
+    """
+    Marks every cached page stale. The next anonymous request for a page gets
+    the stale copy and triggers one background re-render.
+    """
+    bump_version(PAGE_CACHE_NAMESPACE)
+
+
+def is_cacheable_request(request):
+    """
+    Only anonymous GET/HEAD requests with no pending flash messages are cached.
+    """
+    if not page_cache_timeout() or request.method not in ("GET", "HEAD"):
+        return False
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return False
+    return not len(get_messages(request))
+
+
+def is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header("Content-Encoding")
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and "private" not in response.get("Cache-Control", "")
+    )
+
+
+def page_cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f"page:{request.get_host()}:{path}"
+
+
+def make_entry(response, version):
+    """
+    Cache entry for a rendered page: the body in every encoding we serve, plus
+    the version and time it was rendered at.
+    """
+    content = response.content
+    return {
+        "version": version,
+        "created": time.time(),
+        "headers": {h: response[h] for h in STORED_HEADERS if response.has_header(h)},
+        "identity": content,
+        "gzip": gzip.compress(content, compresslevel=6, mtime=0),
+        "br": brotli.compress(content, quality=5) if brotli else None,
+    }
+
+
+def store(key, response, version):
+    cache.set(key, make_entry(response, version), page_cache_timeout() + page_cache_stale_timeout())
+
+
+def is_fresh(entry, version):
+    return entry["version"] == version and time.time() - entry["created"] < page_cache_timeout()
+
+
+def accepted_encoding(request, entry):
+    accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if entry["br"] is not None and "br" in accept:
+        return "br"
+    if "gzip" in accept:
+        return "gzip"
+    return "identity"
+
+
+def entry_response(request, entry, state):
+    encoding = accepted_encoding(request, entry)
+    body = entry[encoding]
+    response = HttpResponse(b"" if request.method == "HEAD" else body)
+    for header, value in entry["headers"].items():
+        response[header] = value
+    if encoding != "identity":
+        response["Content-Encoding"] = encoding
+    response["Content-Length"] = str(len(body))
+    response["X-Page-Cache"] = state
+    patch_vary_headers(response, ("Accept-Encoding", "Cookie"))
+    return response
+
+
+def revalidate(key, render, version):
+    """
+    Re-renders a stale page in a background thread. A short cache lock makes
+    sure only one worker (across processes) re-renders a given page.
+    render() returns the new response, or None if it must not be cached.
+    """
+    lock = f"{key}:refresh"
+    if not cache.add(lock, 1, 60):
+        return
+
+    def run():
+        try:
+            response = render()
+            if response is not None:
+                store(key, response, version)
+        finally:
+            cache.delete(lock)
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True).start()
@@ -0,0 +1,150 @@
+# extras/pagination.py
+from collections.abc import Sequence
+
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+
+TOKEN_SALT = "extras.pagination"
+
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class InvalidPageToken(InvalidPage):
+    pass
+
+
+class KeysetPage(Sequence):
+    """
+    One page of a KeysetPaginator. Quacks enough like django.core.paginator.Page
+    for ListView and templates (object_list, has_next, has_previous, ...).
+    """
+
+    def __init__(self, object_list, paginator, *, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self.object_list)} rows>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_page_token(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.make_token(self.object_list[-1], NEXT)
+
+    @property
+    def previous_page_token(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.make_token(self.object_list[0], PREVIOUS)
+
+
+class KeysetPaginator:
+    """
+    Seek ("keyset") paginator: pages are addressed by an opaque, signed token
+    holding the sort key of the row a page starts after, so every page is one
+    indexed range query no matter how deep it is.
+
+    `keys` is the ordering, e.g. ("start", "pk") or ("-created_at", "-pk"); the
+    last key must be unique so rows never tie. Key fields must not be
+    nullable: a range condition cannot seek past NULLs. `.values()` querysets
+    work too as long as they select the key fields. The total count is an
+    extra COUNT(*) and is skipped with count_total=False (paginator.count is
+    then None).
+    """
+
+    def __init__(self, queryset, per_page, keys, *, count_total=True):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.keys = tuple(keys)
+        self.count_total = count_total
+        nullable = [field.name for field, _ in self._fields() if field.null]
+        if nullable:
+            raise ImproperlyConfigured(f"Keyset pagination keys cannot be nullable: {', '.join(nullable)}.")
+
+    @property
+    def count(self):
+        if not self.count_total:
+            return None
+        if not hasattr(self, "_count"):
+            self._count = self.queryset.count()
+        return self._count
+
+    def _fields(self):
+        opts = self.queryset.model._meta
+        return [
+            (opts.pk if key.lstrip("-") == "pk" else opts.get_field(key.lstrip("-")), key.startswith("-"))
+            for key in self.keys
+        ]
+
+    def make_token(self, obj, direction):
+        if isinstance(obj, dict):
+            # A row from .values(); the keys must be among its fields ("id" for "pk")
+            values = [str(obj[field.attname]) for field, _ in self._fields()]
+        else:
+            values = [field.value_to_string(obj) for field, _ in self._fields()]
+        return signing.dumps([direction, values], salt=TOKEN_SALT)
+
+    def parse_token(self, token):
+        try:
+            direction, values = signing.loads(token, salt=TOKEN_SALT)
+            fields = self._fields()
+            if direction not in (NEXT, PREVIOUS) or len(values) != len(fields):
+                raise ValueError
+            return direction, [field.to_python(value) for (field, _), value in zip(fields, values)]
+        except (signing.BadSignature, ValidationError, ValueError, TypeError) as e:
+            raise InvalidPageToken("Invalid page token.") from e
+
+    def _seek(self, values, forward):
+        """
+        Q matching the rows after (forward) or before `values` in key order.
+        """
+        condition = None
+        for (_, descending), key, value in reversed(list(zip(self._fields(), self.keys, values))):
+            name = key.lstrip("-")
+            beyond = Q(**{f"{name}__{'lt' if descending == forward else 'gt'}": value})
+            condition = beyond if condition is None else beyond | (Q(**{name: value}) & condition)
+        return condition
+
+    def page(self, token=None):
+        """
+        The page addressed by `token`, or the first page when it is empty.
+        Raises InvalidPageToken for tokens that were tampered with or belong
+        to another ordering.
+        """
+        ordering = list(self.keys)
+        if not token:
+            rows = list(self.queryset.order_by(*ordering)[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], self, has_next=len(rows) > self.per_page, has_previous=False)
+
+        direction, values = self.parse_token(token)
+        if direction == NEXT:
+            qs = self.queryset.filter(self._seek(values, forward=True)).order_by(*ordering)
+            rows = list(qs[:self.per_page + 1])
+            return KeysetPage(rows[:self.per_page], self, has_next=len(rows) > self.per_page, has_previous=True)
+
+        reverse = [key[1:] if key.startswith("-") else f"-{key}" for key in ordering]
+        qs = self.queryset.filter(self._seek(values, forward=False)).order_by(*reverse)
+        rows = list(qs[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        return KeysetPage(rows[:self.per_page][::-1], self, has_next=True, has_previous=has_previous)
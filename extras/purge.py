@@ -0,0 +1,135 @@
+# extras/purge.py
+import atexit
+import json
+import logging
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+SITE_SETTINGS_KEY = "site-settings"
+
+
+def surrogate_key(obj):
+    """
+    Surrogate key for one model instance, e.g. "event:42" or "series:7".
+    Models may set `surrogate_key_prefix`; the model name is used otherwise.
+    """
+    prefix = getattr(obj, "surrogate_key_prefix", obj._meta.model_name)
+    return f"{prefix}:{obj.pk}"
+
+
+class NullPurgeClient:
+    """
+    Default client: purges nothing. Used when no CDN is configured.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+
+    def purge(self, keys):
+        logger.debug("Purge skipped (no CDN configured): %s", " ".join(sorted(keys)))
+
+
+class HTTPPurgeClient(NullPurgeClient):
+    """
+    POSTs {"tags": [...]} to PURGE_URL, PURGE_BATCH_SIZE keys per request,
+    with PURGE_TOKEN as a bearer token. This is the shape Cloudflare's
+    purge-by-tag API takes, and what the purge_standin command accepts.
+    """
+
+    def purge(self, keys):
+        keys = sorted(keys)
+        url = self.options.get("url") or getattr(settings, "PURGE_URL", "")
+        batch_size = self.options.get("batch_size") or getattr(settings, "PURGE_BATCH_SIZE", 30)
+        token = self.options.get("token", getattr(settings, "PURGE_TOKEN", ""))
+
+        for i in range(0, len(keys), batch_size):
+            body = json.dumps({"tags": keys[i:i + batch_size]}).encode()
+            request = urllib.request.Request(url, data=body, method="POST")
+            request.add_header("Content-Type", "application/json")
+            if token:
+                request.add_header("Authorization", f"Bearer {token}")
+            try:
+                with urllib.request.urlopen(request, timeout=10) as response:
+                    response.read()
+            except OSError:
+                # The edge copies expire on their own; never fail the write over a purge
+                logger.exception("CDN purge failed for %d keys", len(keys[i:i + batch_size]))
+
+
+def get_purge_client():
+    client_class = import_string(getattr(settings, "PURGE_CLIENT", "extras.purge.NullPurgeClient"))
+    return client_class(**getattr(settings, "PURGE_OPTIONS", {}))
+
+
+class PurgeQueue:
+    """
+    Collects keys from every commit in this process and sends them in one
+    purge once writes have been quiet for PURGE_DEBOUNCE_SECONDS, so a burst
+    of saves (an import, a series reschedule) costs one round of requests.
+    Steady writes cannot hold keys back longer than PURGE_MAX_WAIT_SECONDS
+    after the first one was queued. Keys still waiting when the process exits
+    are flushed then, so management commands and worker restarts do not drop
+    them with the daemon timer.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = set()
+        self.timer = None
+        self.first_queued = None
+
+    def add(self, keys):
+        delay = getattr(settings, "PURGE_DEBOUNCE_SECONDS", 2)
+        max_wait = getattr(settings, "PURGE_MAX_WAIT_SECONDS", 30)
+        with self.lock:
+            self.keys.update(keys)
+            now = time.monotonic()
+            if self.first_queued is None:
+                self.first_queued = now
+            remaining = self.first_queued + max_wait - now
+            if delay <= 0 or remaining <= 0:
+                keys = self.take_locked()
+            else:
+                if self.timer is not None:
+                    self.timer.cancel()
+                self.timer = threading.Timer(min(delay, remaining), self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+                keys = None
+        # The purge is a network round trip; other writers must not wait on it
+        if keys:
+            get_purge_client().purge(keys)
+
+    def flush(self):
+        with self.lock:
+            keys = self.take_locked()
+        if keys:
+            get_purge_client().purge(keys)
+
+    def take_locked(self):
+        if self.timer is not None:
+            self.timer.cancel()
+        keys, self.keys = self.keys, set()
+        self.timer = self.first_queued = None
+        return keys
+
+
+purge_queue = PurgeQueue()
+atexit.register(purge_queue.flush)
+
+
+def purge_after_commit(*keys):
+    """
+    Purges `keys` from the CDN once the current transaction commits
+    (immediately outside one).
+    """
+    keys = {key for key in keys if key}
+    if keys:
+        transaction.on_commit(lambda: purge_queue.add(keys))
@@ -1,3 +1,114 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from .checks import check_shared_cache
+from .management.commands.purge_standin import make_server
+from .purge import HTTPPurgeClient, PurgeQueue, purge_after_commit
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_process_local_cache_rejected(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ["extras.E001"])
+
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/var/tmp/alliedangels-cache",
+    }})
+    def test_shared_cache_accepted(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class PurgeQueueTests(TestCase):
+    """
+    Surrogate keys are purged after commit, debounced into one request round.
+    """
+
+    def setUp(self):
+        patcher = mock.patch("extras.purge.get_purge_client")
+        self.client_factory = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.purge = self.client_factory.return_value.purge
+        # Other tests leave keys waiting in the shared queue
+        patcher = mock.patch("extras.purge.purge_queue", PurgeQueue())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @override_settings(PURGE_DEBOUNCE_SECONDS=0)
+    def test_purged_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_after_commit("event:1", None, "series:2")
+            self.purge.assert_not_called()
+        self.purge.assert_called_once_with({"event:1", "series:2"})
+
+    @override_settings(PURGE_DEBOUNCE_SECONDS=60)
+    def test_burst_debounced_into_one_purge(self):
+        queue = PurgeQueue()
+        queue.add({"event:1"})
+        timer = queue.timer
+        queue.add({"event:2", "event:1"})
+        # The second key restarted the wait
+        self.assertTrue(timer.finished.is_set())
+        self.purge.assert_not_called()
+
+        # What the exit hook does for a process that ends before the timer fires
+        queue.flush()
+        self.purge.assert_called_once_with({"event:1", "event:2"})
+        self.assertIsNone(queue.timer)
+        queue.flush()
+        self.assertEqual(self.purge.call_count, 1)
+
+    @override_settings(PURGE_DEBOUNCE_SECONDS=60, PURGE_MAX_WAIT_SECONDS=30)
+    def test_steady_writes_flushed_after_max_wait(self):
+        queue = PurgeQueue()
+        with mock.patch("extras.purge.time.monotonic", return_value=100):
+            queue.add({"event:1"})
+        # The timer never runs past the cap, even with a longer debounce
+        self.assertEqual(queue.timer.interval, 30)
+        with mock.patch("extras.purge.time.monotonic", return_value=120):
+            queue.add({"event:2"})
+        self.assertEqual(queue.timer.interval, 10)
+        self.purge.assert_not_called()
+
+        with mock.patch("extras.purge.time.monotonic", return_value=130):
+            queue.add({"event:3"})
+        self.purge.assert_called_once_with({"event:1", "event:2", "event:3"})
+        self.assertIsNone(queue.timer)
+        self.assertIsNone(queue.first_queued)
+
+    @override_settings(PURGE_DEBOUNCE_SECONDS=0)
+    def test_purge_sent_outside_lock(self):
+        queue = PurgeQueue()
+        self.purge.side_effect = lambda keys: self.assertFalse(queue.lock.locked())
+        queue.add({"event:1"})
+        self.purge.assert_called_once()
+
+
+class HTTPPurgeClientTests(SimpleTestCase):
+    """
+    The HTTP client speaks the purge-by-tag shape the stand-in accepts.
+    """
+
+    def setUp(self):
+        self.received = []
+        self.server = make_server("127.0.0.1", 0, self.received.append)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/purge"
+
+    def test_keys_sent_in_batches(self):
+        client = HTTPPurgeClient(url=self.url, batch_size=2, token="secret")
+        client.purge({"event:3", "event:1", "series:2", "image:4", "event:2"})
+        self.assertEqual(self.received, [
+            ["event:1", "event:2"], ["event:3", "image:4"], ["series:2"],
+        ])
+
+    def test_unreachable_endpoint_does_not_raise(self):
+        client = HTTPPurgeClient(url="http://127.0.0.1:1/purge")
+        with self.assertLogs("extras.purge", "ERROR"):
+            client.purge({"event:1"})
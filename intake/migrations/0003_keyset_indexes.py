@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0002_alter_interesttag_group'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interestsubmission',
+            index=models.Index(fields=['created_at', 'id'], name='intake_inte_created_fc7673_idx'),
+        ),
+    ]
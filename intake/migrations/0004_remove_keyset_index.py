@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-17 16:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('intake', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='interestsubmission',
+            name='intake_inte_created_fc7673_idx',
+        ),
+    ]
@@ -13,7 +13,7 @@ from django.views.generic import CreateView, TemplateView, FormView, View, Detai
 from .forms import InterestForm
 from .models import InterestSubmission
 from .tables import InterestSubmissionTable
-from extras.mixins import PageMetaMixin
+from extras.mixins import PageMetaMixin, KeysetPaginationMixin
 
 
 class ConnectView(PageMetaMixin, FormView):
@@ -101,20 +101,21 @@ class ConnectThanksView(PageMetaMixin, TemplateView):
 
 
 @method_decorator(staff_member_required, name='dispatch')
-class InterestSubmissionListView(PageMetaMixin, SingleTableView):
+class InterestSubmissionListView(PageMetaMixin, KeysetPaginationMixin, SingleTableView):
     model = InterestSubmission
     table_class = InterestSubmissionTable
     template_name = 'intake/submission_list.html'
     is_current = 'connect'
     page_title = 'Connect Inbox'
     paginate_by = 25
+    # Newest first; created_at is nullable, and ids follow submission order
+    keyset = ("-pk",)
 
     def get_queryset(self):
-        # Newest first
         return (
             InterestSubmission.objects
             .all()
-            .order_by('-created_at')
+            .order_by('-pk')
             .prefetch_related('interests')
         )
 